@@ -0,0 +1,66 @@
+import json
+import timeit
+import tracemalloc
+from collections.abc import Callable, Mapping, Sequence
+
+
+def ops_per_sec(
+    fn: Callable[[], object], *, number: int = 10_000, repeat: int = 5
+) -> float:
+    # best of `repeat` runs: the least disturbed one is the closest to real cost
+    best = min(timeit.repeat(fn, number=number, repeat=repeat))
+    return number / best
+
+
+def alloc_bytes_per_op(fn: Callable[[], object], *, number: int = 200) -> float:
+    # bytes allocated at peak while running one op (tracemalloc), averaged:
+    # transient allocations count even if they are freed before returning
+    fn()  # warm up caches so that they are not attributed to the op
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return total / number
+
+
+def save_results(path: str, results: Mapping[str, float]) -> None:
+    with open(path, "w") as f:
+        json.dump(dict(results), f, indent=2, sort_keys=True)
+
+
+def compare_results(
+    path: str, results: Mapping[str, float], *, threshold: float
+) -> list[str]:
+    # names of benchmarks whose ops/s dropped by more than `threshold`
+    # (a fraction) compared to the baseline stored at `path`
+    with open(path) as f:
+        baseline = json.load(f)
+
+    return [
+        name
+        for name, ops in results.items()
+        if name in baseline and ops < baseline[name] * (1 - threshold)
+    ]
+
+
+def print_table(header: Sequence[str], rows: Sequence[Sequence[object]]) -> None:
+    widths = [
+        max(len(str(header[i])), *(len(_fmt(r[i])) for r in rows))
+        for i in range(len(header))
+    ]
+    print("  ".join(str(h).rjust(w) for h, w in zip(header, widths, strict=True)))
+    for row in rows:
+        print("  ".join(_fmt(v).rjust(w) for v, w in zip(row, widths, strict=True)))
+
+
+def _fmt(value: object) -> str:
+    if isinstance(value, float):
+        return f"{value:,.0f}"
+    return str(value)
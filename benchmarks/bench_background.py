@@ -0,0 +1,53 @@
+"""Context.set() cost on the request path with a slow adapter called inline
+vs through ThreadDispatchAdapter / AsyncioDispatchAdapter."""
+
+import asyncio
+import time
+from typing import Any
+
+from _bench import ops_per_sec, print_table
+
+from ktx.adapters.background import AsyncioDispatchAdapter, ThreadDispatchAdapter
+from ktx.ctx import Context
+
+KEYS = [f"key{i}" for i in range(16)]
+
+
+class SlowAdapter:
+    def set(self, key: str, value: Any) -> None:
+        time.sleep(0.0001)
+
+
+def set_keys(ctx: Context) -> None:
+    for key in KEYS:
+        ctx.set(key, "value")
+
+
+async def bench_asyncio() -> float:
+    dispatcher = AsyncioDispatchAdapter(SlowAdapter())
+    ctx = Context("id", adapters=[dispatcher])
+    result = ops_per_sec(lambda: set_keys(ctx), number=1000)
+    await dispatcher.close()
+    return result
+
+
+def main() -> None:
+    inline_ctx = Context("id", adapters=[SlowAdapter()])
+
+    thread_dispatcher = ThreadDispatchAdapter(SlowAdapter())
+    thread_ctx = Context("id", adapters=[thread_dispatcher])
+    thread_result = ops_per_sec(lambda: set_keys(thread_ctx), number=1000)
+    thread_dispatcher.close()
+
+    print_table(
+        ("adapter", f"{len(KEYS)} x set() ops/s", "dropped"),
+        [
+            ("inline", ops_per_sec(lambda: set_keys(inline_ctx), number=20), 0),
+            ("thread", thread_result, thread_dispatcher.dropped),
+            ("asyncio", asyncio.run(bench_asyncio()), 0),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Encode/decode throughput of ktx.codec for typical and large contexts."""
+
+from _bench import ops_per_sec, print_table
+
+from ktx.codec import decode_ctx, decode_ctx_text, encode_ctx, encode_ctx_text
+from ktx.ctx import Context
+from ktx.user import ContextUser
+
+SIZES = {"typical": 10, "large": 100}
+
+
+def bench(name: str, keys: int) -> tuple[object, ...]:
+    ctx = Context(
+        "0123456789abcdef0123456789abcdef",
+        data={f"key{i}": f"value-{i}" if i % 2 else i for i in range(keys)},
+    )
+    user = ContextUser(id=42, username="user", email="user@example.com")
+    encoded = encode_ctx(ctx, user, max_size=None)
+    text = encode_ctx_text(ctx, user, max_size=None)
+
+    return (
+        name,
+        len(encoded),
+        ops_per_sec(lambda: encode_ctx(ctx, user, max_size=None)),
+        ops_per_sec(lambda: decode_ctx(encoded, max_size=None)),
+        ops_per_sec(lambda: encode_ctx_text(ctx, user, max_size=None)),
+        ops_per_sec(lambda: decode_ctx_text(text, max_size=None)),
+    )
+
+
+def main() -> None:
+    print_table(
+        (
+            "context",
+            "bytes",
+            "encode ops/s",
+            "decode ops/s",
+            "encode text ops/s",
+            "decode text ops/s",
+        ),
+        [bench(name, keys) for name, keys in SIZES.items()],
+    )
+
+
+if __name__ == "__main__":
+    main()
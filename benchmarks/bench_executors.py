@@ -0,0 +1,66 @@
+"""Submit overhead of ktx-aware executors vs wrapping every call in
+contextvars.copy_context().run with a bound context."""
+
+import contextvars
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from _bench import print_table
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.ctx import Context
+from ktx.executors import KtxProcessPoolExecutor, KtxThreadPoolExecutor
+from ktx.user import ContextUser
+
+TASKS = 20_000
+
+
+def noop() -> None:
+    pass
+
+
+def submit_copy_context(pool: Executor) -> None:
+    pool.submit(contextvars.copy_context().run, noop)
+
+
+def submit_plain(pool: Executor) -> None:
+    pool.submit(noop)
+
+
+def bench(pool: Executor, submit: Callable[[Executor], None], tasks: int) -> float:
+    wait([pool.submit(noop)])  # start workers
+    start = time.perf_counter()
+    for _ in range(tasks):
+        submit(pool)
+    wait([pool.submit(noop)])
+    return tasks / (time.perf_counter() - start)
+
+
+def main() -> None:
+    ctx = Context("id", data={f"key{i}": f"value{i}" for i in range(30)})
+    # unrelated context variables make copy_context() more expensive
+    extra_vars = [contextvars.ContextVar(f"var{i}") for i in range(20)]
+    for var in extra_vars:
+        var.set("value")
+
+    rows = []
+    with ctx_bind(ctx), ctx_user_bind(ContextUser(id=42)):
+        with ThreadPoolExecutor(4) as pool:
+            rows.append(
+                ("thread copy_context", bench(pool, submit_copy_context, TASKS))
+            )
+        with KtxThreadPoolExecutor(4) as ktx_pool:
+            rows.append(("thread ktx", bench(ktx_pool, submit_plain, TASKS)))
+        with ProcessPoolExecutor(2) as ppool:
+            rows.append(
+                ("process plain (no ctx)", bench(ppool, submit_plain, TASKS // 10))
+            )
+        with KtxProcessPoolExecutor(2) as ktx_ppool:
+            rows.append(("process ktx", bench(ktx_ppool, submit_plain, TASKS // 10)))
+
+    print_table(("executor", "tasks/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Cost of recording set() history.
+
+Context.set() of a plain factory (history disabled: no adapter is
+configured, so not a single extra instruction runs) against contexts with
+a per-context SetHistory, with and without call-site capture, and memory
+held by a history after 10 and 100,000 writes.
+"""
+
+import tracemalloc
+
+from _bench import alloc_bytes_per_op, ops_per_sec, print_table
+
+from ktx.ctx import ContextFactory
+from ktx.history import DEFAULT_SIZE, SetHistoryContextFactory
+
+NUMBER = 200_000
+
+
+def history_memory(writes: int) -> int:
+    factory = SetHistoryContextFactory()
+    tracemalloc.start()
+    ctx = factory.create("id")
+    for i in range(writes):
+        ctx.set("key", i)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main() -> None:
+    factories = {
+        "disabled (plain ContextFactory)": ContextFactory(),
+        "SetHistory": SetHistoryContextFactory(),
+        "SetHistory, call_site=True": SetHistoryContextFactory(call_site=True),
+    }
+    rows = []
+    for name, factory in factories.items():
+        ctx = factory.create("id")
+        rows.append(
+            (
+                name,
+                ops_per_sec(lambda ctx=ctx: ctx.set("key", 1), number=NUMBER),
+                alloc_bytes_per_op(lambda ctx=ctx: ctx.set("key", 1)),
+            )
+        )
+    print_table(("Context.set()", "ops/s", "bytes alloc/op"), rows)
+
+    print()
+    print_table(
+        (f"context with history of {DEFAULT_SIZE}", "bytes held"),
+        [(f"after {n:,} writes", history_memory(n)) for n in (10, 100_000)],
+    )
+
+
+if __name__ == "__main__":
+    main()
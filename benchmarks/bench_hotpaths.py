@@ -0,0 +1,150 @@
+"""Microbenchmarks of ktx hot paths: ops/s and bytes allocated per op.
+
+    python benchmarks/bench_hotpaths.py [--save PATH] [--compare PATH]
+
+--compare exits with status 1 if any benchmark is slower than the stored
+baseline by more than --threshold (a fraction, 0.15 by default).
+"""
+
+import argparse
+import sys
+from collections.abc import Callable
+from contextlib import ExitStack
+from typing import Any
+
+from _bench import (
+    alloc_bytes_per_op,
+    compare_results,
+    ops_per_sec,
+    print_table,
+    save_results,
+)
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.ctx import Context, ContextFactory
+from ktx.log import ktx_add_log, ktx_add_user_log
+from ktx.user import ContextUser
+
+KEYS = 30
+
+# name -> builder(stack) -> op; the builder may bind contexts on the stack
+Case = Callable[[ExitStack], Callable[[], object]]
+
+
+class NoopAdapter:
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+def _data() -> dict[str, str]:
+    return {f"key{i}": f"value{i}" for i in range(KEYS)}
+
+
+def create(stack: ExitStack) -> Callable[[], object]:
+    return ContextFactory(inherit_data=False).create
+
+
+def create_inherited(depth: int) -> Case:
+    def builder(stack: ExitStack) -> Callable[[], object]:
+        factory = ContextFactory()
+        stack.enter_context(ctx_bind(Context("id", data=_data())))
+        for _ in range(depth - 1):
+            stack.enter_context(ctx_bind(factory.create()))
+        return factory.create
+
+    return builder
+
+
+def bind_unbind(stack: ExitStack) -> Callable[[], object]:
+    ctx = Context("id")
+
+    def op() -> None:
+        with ctx_bind(ctx):
+            pass
+
+    return op
+
+
+def get(stack: ExitStack) -> Callable[[], object]:
+    ctx = Context("id", data=_data())
+    return lambda: ctx.get("key10")
+
+
+def get_data(stack: ExitStack) -> Callable[[], object]:
+    return Context("id", data=_data()).get_data
+
+
+def set_with_adapters(adapters: int) -> Case:
+    def builder(stack: ExitStack) -> Callable[[], object]:
+        ctx = Context("id", adapters=[NoopAdapter() for _ in range(adapters)])
+        return lambda: ctx.set("key", "value")
+
+    return builder
+
+
+def add_log(cache: bool) -> Case:
+    def builder(stack: ExitStack) -> Callable[[], object]:
+        stack.enter_context(ctx_bind(Context("id", data=_data())))
+        return lambda: ktx_add_log({"event": "e"}, cache=cache)
+
+    return builder
+
+
+def add_user_log(stack: ExitStack) -> Callable[[], object]:
+    user = ContextUser(id=42, username="user", email="user@example.com")
+    stack.enter_context(ctx_user_bind(user))
+    return lambda: ktx_add_user_log({"event": "e"})
+
+
+CASES: dict[str, Case] = {
+    "create": create,
+    "create_inherited_depth1": create_inherited(1),
+    "create_inherited_depth4": create_inherited(4),
+    "create_inherited_depth16": create_inherited(16),
+    "bind_unbind": bind_unbind,
+    "get": get,
+    "get_data": get_data,
+    "set_0_adapters": set_with_adapters(0),
+    "set_1_adapter": set_with_adapters(1),
+    "set_4_adapters": set_with_adapters(4),
+    "ktx_add_log": add_log(cache=False),
+    "ktx_add_log_cached": add_log(cache=True),
+    "ktx_add_user_log": add_user_log,
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save", metavar="PATH", help="store results as baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with baseline")
+    parser.add_argument("--threshold", type=float, default=0.15)
+    parser.add_argument("-k", dest="only", help="run benchmarks containing this")
+    args = parser.parse_args()
+
+    results = {}
+    rows = []
+    for name, builder in CASES.items():
+        if args.only and args.only not in name:
+            continue
+
+        with ExitStack() as stack:
+            op = builder(stack)
+            results[name] = ops = ops_per_sec(op, number=50_000)
+            rows.append((name, ops, alloc_bytes_per_op(op)))
+
+    print_table(("benchmark", "ops/s", "alloc B/op"), rows)
+
+    if args.save:
+        save_results(args.save, results)
+
+    if args.compare:
+        regressions = compare_results(args.compare, results, threshold=args.threshold)
+        if regressions:
+            print(f"\nregressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
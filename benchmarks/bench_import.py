@@ -0,0 +1,90 @@
+"""Import time of ktx modules, measured with `python -X importtime`.
+
+    python benchmarks/bench_import.py [--save PATH] [--compare PATH]
+
+Every import runs in a fresh interpreter; reported is the best time over
+--runs runs spent in the modules it loads besides those loaded by the bare
+interpreter, and the number of such modules. --compare exits with
+status 1 if any import is slower than the stored baseline by more than
+--threshold (a fraction, 0.25 by default).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from _bench import print_table, save_results
+
+IMPORTS = (
+    "import ktx",
+    "from ktx import ctx_bind",
+    "import ktx.ctx",
+    "import ktx.log",
+    "import ktx.middleware",
+    "import ktx.instrument",
+)
+
+
+def import_time_us(statement: str) -> tuple[int, int]:
+    # (µs spent in modules loaded by `statement`, number of those modules);
+    # modules already loaded by the bare interpreter do not count
+    loaded = _self_times(statement)
+    new = loaded.keys() - _self_times("pass").keys()
+    return sum(loaded[m] for m in new), len(new)
+
+
+def _self_times(statement: str) -> dict[str, int]:
+    # "import time: self [us] | cumulative | imported package" lines
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--save", metavar="PATH", help="store results as baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with baseline")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = {}
+    rows = []
+    for statement in IMPORTS:
+        runs = [import_time_us(statement) for _ in range(args.runs)]
+        results[statement] = best = min(us for us, _ in runs)
+        rows.append((statement, best, runs[0][1]))
+
+    print_table(("statement", "µs (best)", "modules loaded"), rows)
+
+    if args.save:
+        save_results(args.save, results)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = [
+            statement
+            for statement, us in results.items()
+            if statement in baseline and us > baseline[statement] * (1 + args.threshold)
+        ]
+        if regressions:
+            print(f"\nregressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""ContextFactory.create() cost with inherit_data=True by depth and key count.
+
+"shared" is the copy-on-write inheritance used by ContextFactory,
+"eager" copies parent data the way ContextFactory used to.
+"""
+
+from contextlib import ExitStack
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind, get_current_ctx
+from ktx.ctx import Context, ContextFactory
+
+KEYS = (10, 50, 200)
+DEPTHS = (1, 4, 16)
+
+
+def eager_create() -> Context:
+    return Context("id", data=get_current_ctx().get_data())
+
+
+def main() -> None:
+    factory = ContextFactory(ktx_id_maker=lambda: "id")
+    rows = []
+    for keys in KEYS:
+        for depth in DEPTHS:
+            with ExitStack() as stack:
+                root = stack.enter_context(ctx_bind(factory.create()))
+                for i in range(keys):
+                    root.set(f"key{i}", i)
+                for _ in range(depth - 1):
+                    stack.enter_context(ctx_bind(factory.create()))
+
+                rows.append(
+                    (
+                        keys,
+                        depth,
+                        ops_per_sec(factory.create),
+                        ops_per_sec(eager_create),
+                    )
+                )
+
+    print_table(("keys", "depth", "shared ops/s", "eager ops/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cost of ktx.instrument: disabled (the default) vs enabled.
+
+Also measures the disabled check on its own (one module attribute load and
+comparison per hook), which is all instrumentation adds when it is off.
+"""
+
+from collections.abc import Callable
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind, instrument
+from ktx.ctx import ContextFactory
+from ktx.instrument import disable_instrumentation, enable_instrumentation
+
+factory = ContextFactory(inherit_data=False)
+ctx = factory.create()
+
+
+def create() -> None:
+    factory.create()
+
+
+def bind() -> None:
+    with ctx_bind(ctx):
+        pass
+
+
+def set_key() -> None:
+    ctx.set("key", "value")
+
+
+def request() -> None:
+    with ctx_bind(factory.create()) as c:
+        c.set("a", 1)
+        c.set("b", "two")
+        c.set("c", 3.0)
+
+
+CASES: dict[str, Callable[[], None]] = {
+    "create": create,
+    "bind+unbind": bind,
+    "set": set_key,
+    "request (create, bind, 3 sets)": request,
+}
+
+
+def main() -> None:
+    def check() -> None:
+        if instrument.active is not None:
+            pass
+
+    def empty() -> None:
+        pass
+
+    rows: list[tuple[object, ...]] = []
+    for name, fn in CASES.items():
+        disable_instrumentation()
+        disabled = ops_per_sec(fn, number=100_000)
+        enable_instrumentation()
+        enabled = ops_per_sec(fn, number=100_000)
+        disable_instrumentation()
+        rows.append(
+            (
+                name,
+                disabled,
+                enabled,
+                f"{(1e9 / enabled - 1e9 / disabled):.0f} ns",
+            )
+        )
+
+    print_table(("operation", "disabled ops/s", "enabled ops/s", "added"), rows)
+
+    check_ns = 1e9 / ops_per_sec(check, number=1_000_000)
+    empty_ns = 1e9 / ops_per_sec(empty, number=1_000_000)
+    print(f"\ndisabled check: {check_ns - empty_ns:.1f} ns per hook")
+
+
+if __name__ == "__main__":
+    main()
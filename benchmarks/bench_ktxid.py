@@ -0,0 +1,27 @@
+"""Throughput of ktx_id makers, alone and through ContextFactory.create()."""
+
+from _bench import ops_per_sec, print_table
+
+from ktx.ctx import ContextFactory
+from ktx.ktxid import ktxid_counter, ktxid_random, ktxid_uuid4, ktxid_uuid7
+
+MAKERS = [ktxid_uuid4, ktxid_random, ktxid_uuid7, ktxid_counter]
+
+
+def main() -> None:
+    rows = []
+    for maker in MAKERS:
+        factory = ContextFactory(ktx_id_maker=maker, inherit_data=False)
+        rows.append(
+            (
+                maker.__name__,
+                ops_per_sec(maker, number=100_000),
+                ops_per_sec(factory.create, number=100_000),
+            )
+        )
+
+    print_table(("maker", "ids/s", "create ops/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Lazy context values: cost of a request that sets an expensive value.
+
+The value (feature flags serialized to JSON) is set eagerly or as Lazy, and
+the request either never reads it or logs it once. Reading an evaluated
+Lazy value is compared with reading a plain one.
+"""
+
+import json
+from functools import partial
+
+from _bench import ops_per_sec, print_table
+
+from ktx.ctx import Context
+from ktx.lazy import Lazy
+from ktx.log import ktx_add_log
+
+FLAGS = {f"flag{i}": i % 3 == 0 for i in range(200)}
+
+
+def serialize_flags() -> str:
+    return json.dumps(FLAGS, sort_keys=True)
+
+
+def request(lazy: bool, log: bool) -> None:
+    ctx = Context("id", data={"path": "/api/items"})
+    ctx.set("flags", Lazy(serialize_flags) if lazy else serialize_flags())
+    if log:
+        ktx_add_log({"event": "done"}, ctx)
+
+
+def main() -> None:
+    rows = []
+    for log in (False, True):
+        eager = ops_per_sec(partial(request, False, log))
+        lazy = ops_per_sec(partial(request, True, log))
+        rows.append(("logged once" if log else "never read", eager, lazy))
+
+    print_table(("request", "eager ops/s", "lazy ops/s"), rows)
+
+    plain = Context("id", data={"key": "value"})
+    evaluated = Context("id", data={"key": Lazy(lambda: "value")})
+    evaluated.get("key")
+    print()
+    print_table(
+        ("get", "ops/s"),
+        [
+            ("plain value", ops_per_sec(lambda: plain.get("key"), number=100_000)),
+            (
+                "evaluated Lazy",
+                ops_per_sec(lambda: evaluated.get("key"), number=100_000),
+            ),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
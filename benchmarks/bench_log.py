@@ -0,0 +1,30 @@
+"""ktx_add_log per-event cost: rendering on every event vs cached fields."""
+
+from _bench import ops_per_sec, print_table
+
+from ktx.ctx import Context
+from ktx.log import ktx_add_log
+
+KEYS = (10, 50, 200)
+
+
+def bench(keys: int) -> tuple[int, float, float]:
+    ctx = Context("id")
+    for i in range(keys):
+        ctx.set(f"key{i}", f"value{i}")
+
+    return (
+        keys,
+        ops_per_sec(lambda: ktx_add_log({"event": "e"}, ctx)),
+        ops_per_sec(lambda: ktx_add_log({"event": "e"}, ctx, cache=True)),
+    )
+
+
+def main() -> None:
+    rows = [bench(keys) for keys in KEYS]
+
+    print_table(("keys", "render ops/s", "cached ops/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Log volume and cost of KtxLogProcessor with and without delta=True.
+
+A request binds a context with 20 keys and logs 20 events rendered to
+JSON; every 5th event follows a set() of one key. Reported are JSON bytes
+per request and processed events per second.
+"""
+
+import functools
+import json
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind
+from ktx.ctx import Context
+from ktx.log import KtxLogProcessor
+
+KEYS = 20
+EVENTS = 20
+
+
+def request(processor: KtxLogProcessor) -> int:
+    size = 0
+    ctx = Context(
+        "0123456789abcdef", data={f"key{i}": f"value{i}" for i in range(KEYS)}
+    )
+    with ctx_bind(ctx):
+        for i in range(EVENTS):
+            if i and i % 5 == 0:
+                ctx.set("step", i)
+            event = processor(None, "info", {"event": "handled", "i": i})
+            size += len(json.dumps(event))
+    return size
+
+
+def main() -> None:
+    rows = []
+    for name, processor in (
+        ("full context", KtxLogProcessor()),
+        ("delta=True", KtxLogProcessor(delta=True)),
+    ):
+        rows.append(
+            (
+                name,
+                request(processor),
+                ops_per_sec(functools.partial(request, processor), number=2_000)
+                * EVENTS,
+            )
+        )
+
+    print_table(("processor", "JSON bytes/request", "events/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
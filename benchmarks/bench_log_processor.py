@@ -0,0 +1,62 @@
+"""Per-event cost of KtxLogProcessor compared with the ktx_add_log and
+ktx_add_user_log functions and with a bare dict update of the same fields.
+"""
+
+from typing import Any
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.ctx import Context
+from ktx.log import KtxLogProcessor, ktx_add_log, ktx_add_user_log
+from ktx.user import ContextUser
+
+KEYS = (10, 50)
+
+
+def functions(logger: Any, method_name: str, event_dict: Any) -> Any:
+    return ktx_add_user_log(ktx_add_log(event_dict))
+
+
+def functions_cached(logger: Any, method_name: str, event_dict: Any) -> Any:
+    return ktx_add_user_log(ktx_add_log(event_dict, cache=True))
+
+
+def bench(keys: int) -> tuple[object, ...]:
+    ctx = Context("id", data={f"key{i}": f"value{i}" for i in range(keys)})
+    user = ContextUser(id=42, username="user", email="user@example.com")
+    processor = KtxLogProcessor()
+    allowlist = KtxLogProcessor(include=[f"key{i}" for i in range(5)])
+
+    with ctx_bind(ctx), ctx_user_bind(user):
+        fields = processor(None, "info", {})
+
+        def dict_update() -> None:
+            {"event": "e"}.update(fields)
+
+        return (
+            keys,
+            ops_per_sec(dict_update),
+            ops_per_sec(lambda: functions(None, "info", {"event": "e"})),
+            ops_per_sec(lambda: functions_cached(None, "info", {"event": "e"})),
+            ops_per_sec(lambda: processor(None, "info", {"event": "e"})),
+            ops_per_sec(lambda: allowlist(None, "info", {"event": "e"})),
+        )
+
+
+def main() -> None:
+    print_table(
+        (
+            "keys",
+            "dict update ops/s",
+            "functions ops/s",
+            "functions cached ops/s",
+            "processor ops/s",
+            "processor 5 keys ops/s",
+        ),
+        [bench(keys) for keys in KEYS],
+    )
+
+
+if __name__ == "__main__":
+    main()
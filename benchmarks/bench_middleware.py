@@ -0,0 +1,153 @@
+"""Per-request overhead of the ASGI and WSGI middleware.
+
+The application only sends a response. Requests carry 15 headers with the
+request id last; "hand-written" is a typical in-house middleware that builds
+a dict of all headers and sets keys one by one under ctx_bind and
+ctx_user_bind. ASGI calls are driven without an event loop (nothing
+suspends), so the numbers exclude scheduling costs.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.ctx import ContextFactory
+from ktx.middleware import KtxAsgiMiddleware, KtxWsgiMiddleware
+from ktx.user import ContextUserFactory
+
+NUMBER = 50_000
+
+COLUMNS = ("requests/s", "overhead ns/request")
+
+HEADERS = [(f"x-header-{i}".encode(), b"value") for i in range(14)] + [
+    (b"x-request-id", b"0123456789abcdef0123456789abcdef")
+]
+
+SCOPE = {
+    "type": "http",
+    "method": "GET",
+    "path": "/api/items",
+    "headers": HEADERS,
+    "client": ("127.0.0.1", 51000),
+}
+
+ENVIRON = {
+    "REQUEST_METHOD": "GET",
+    "PATH_INFO": "/api/items",
+    "REMOTE_ADDR": "127.0.0.1",
+    **{
+        "HTTP_" + name.decode().upper().replace("-", "_"): value.decode()
+        for name, value in HEADERS
+    },
+}
+
+ctx_factory = ContextFactory()
+user_factory = ContextUserFactory()
+
+
+async def receive() -> dict[str, Any]:
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message: Any) -> None:
+    pass
+
+
+async def asgi_app(scope: Any, receive: Any, send: Any) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def wsgi_app(environ: Any, start_response: Any) -> list[bytes]:
+    start_response("200 OK", [])
+    return [b"ok"]
+
+
+def start_response(status: str, headers: Any) -> None:
+    pass
+
+
+def hand_written_asgi(app: Any) -> Any:
+    async def middleware(scope: Any, receive: Any, send: Any) -> None:
+        headers = {k.decode().lower(): v.decode() for k, v in scope["headers"]}
+        ctx = ctx_factory.create(headers.get("x-request-id"))
+        with ctx_bind(ctx), ctx_user_bind(user_factory.create()) as user:
+            ctx.set("method", scope["method"])
+            ctx.set("path", scope["path"])
+            user.set_ip_address(scope["client"][0])
+            await app(scope, receive, send)
+
+    return middleware
+
+
+def hand_written_wsgi(app: Any) -> Any:
+    def middleware(environ: Any, start_response: Any) -> Any:
+        headers = {
+            k[5:].replace("_", "-").lower(): v
+            for k, v in environ.items()
+            if k.startswith("HTTP_")
+        }
+        ctx = ctx_factory.create(headers.get("x-request-id"))
+        with ctx_bind(ctx), ctx_user_bind(user_factory.create()) as user:
+            ctx.set("method", environ["REQUEST_METHOD"])
+            ctx.set("path", environ["PATH_INFO"])
+            user.set_ip_address(environ["REMOTE_ADDR"])
+            return app(environ, start_response)
+
+    return middleware
+
+
+def asgi_request(app: Any) -> Callable[[], None]:
+    def run() -> None:
+        try:
+            app(SCOPE, receive, send).send(None)
+        except StopIteration:
+            pass
+
+    return run
+
+
+def wsgi_request(app: Any) -> Callable[[], None]:
+    def run() -> None:
+        app(ENVIRON, start_response)
+
+    return run
+
+
+def rows(variants: dict[str, Callable[[], None]]) -> list[tuple[str, float, float]]:
+    results = {name: ops_per_sec(fn, number=NUMBER) for name, fn in variants.items()}
+    bare = 1e9 / results["no middleware"]
+    return [
+        (name, ops, 1e9 / ops - bare if name != "no middleware" else 0.0)
+        for name, ops in results.items()
+    ]
+
+
+def main() -> None:
+    print_table(
+        ("ASGI", *COLUMNS),
+        rows(
+            {
+                "no middleware": asgi_request(asgi_app),
+                "hand-written": asgi_request(hand_written_asgi(asgi_app)),
+                "KtxAsgiMiddleware": asgi_request(KtxAsgiMiddleware(asgi_app)),
+            }
+        ),
+    )
+    print()
+    print_table(
+        ("WSGI", *COLUMNS),
+        rows(
+            {
+                "no middleware": wsgi_request(wsgi_app),
+                "hand-written": wsgi_request(hand_written_wsgi(wsgi_app)),
+                "KtxWsgiMiddleware": wsgi_request(KtxWsgiMiddleware(wsgi_app)),
+            }
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
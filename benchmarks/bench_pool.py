@@ -0,0 +1,102 @@
+"""Pooled vs regular factories: allocations and gen-0 collections per request.
+
+Every request creates a context and a user, binds them with @scoped, sets a
+few keys and user fields and reads get_data(); pooled factories get the
+instances back when the call returns.
+
+Objects that die before the next allocation do not count towards gen-0
+collections, so collections are also measured with a window of requests in
+flight (as in a server handling many requests concurrently): a batch of
+contexts and users is created and filled, then all of them are released.
+"""
+
+import gc
+from collections.abc import Callable
+from typing import Any
+
+from _bench import alloc_bytes_per_op, ops_per_sec, print_table
+
+from ktx import get_current_ctx, get_current_ctx_user, scoped
+from ktx.ctx import ContextFactory
+from ktx.pool import PooledContextFactory, PooledContextUserFactory
+from ktx.user import ContextUserFactory
+
+REQUESTS = 100_000
+IN_FLIGHT = 1_000
+
+
+def handle() -> None:
+    ctx = get_current_ctx()
+    ctx.set_many({"method": "GET", "path": "/api/items", "client": "127.0.0.1"})
+    ctx.set("status", 200)
+    get_current_ctx_user().set_many({"id": 42, "username": "user"})
+    ctx.get_data()
+
+
+def gen0_collections(run: Callable[[], None], requests: int) -> int:
+    gc.collect()
+    before = gc.get_stats()[0]["collections"]
+    for _ in range(REQUESTS // requests):
+        run()
+    return gc.get_stats()[0]["collections"] - before
+
+
+def in_flight(ctx_factory: Any, user_factory: Any) -> Callable[[], None]:
+    release_ctx = getattr(ctx_factory, "release", None)
+    release_user = getattr(user_factory, "release", None)
+
+    def run() -> None:
+        batch = []
+        for i in range(IN_FLIGHT):
+            ctx = ctx_factory.create()
+            ctx.set_many({"method": "GET", "path": "/api/items", "request": i})
+            user = user_factory.create()
+            user.set_id(i)
+            batch.append((ctx, user))
+
+        if release_ctx is not None:
+            for ctx, user in batch:
+                release_ctx(ctx)
+                release_user(user)
+
+    return run
+
+
+def main() -> None:
+    factories = {
+        "regular": (ContextFactory(), ContextUserFactory()),
+        "pooled": (
+            PooledContextFactory(max_size=IN_FLIGHT),
+            PooledContextUserFactory(max_size=IN_FLIGHT),
+        ),
+    }
+
+    rows = []
+    for name, (ctx_factory, user_factory) in factories.items():
+        request = scoped(ctx_factory, user_factory)(handle)
+        batch = in_flight(ctx_factory, user_factory)
+        batch()  # fill the pool
+        rows.append(
+            (
+                name,
+                ops_per_sec(request, number=50_000),
+                alloc_bytes_per_op(request),
+                gen0_collections(request, 1),
+                gen0_collections(batch, IN_FLIGHT),
+            )
+        )
+
+    print_table(
+        (
+            "factories",
+            "requests/s",
+            "bytes alloc/request",
+            f"gen0 GCs/{REQUESTS:,}",
+            f"gen0 GCs/{REQUESTS:,}, {IN_FLIGHT:,} in flight",
+        ),
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Memory and access speed of @context_schema contexts.
+
+Compares three ways to hold the same 8 request fields:
+- Context with the fields as data keys,
+- a Context subclass with plain attributes merged in get_data() by hand
+  (like MyContext in the README),
+- a SchemaContext declared with @context_schema.
+"""
+
+import sys
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from _bench import alloc_bytes_per_op, ops_per_sec, print_table
+
+from ktx.ctx import Context
+from ktx.log import ktx_add_log
+from ktx.schema import SchemaContext, context_schema
+
+FIELDS = {
+    "method": "GET",
+    "path": "/api/items",
+    "route": "items",
+    "client": "127.0.0.1",
+    "user_agent": "curl/8.0",
+    "request_id": "abc",
+    "tenant": "t1",
+    "region": "eu",
+}
+
+
+class ManualContext(Context):
+    def __init__(self, ktx_id: str, **fields: Any):
+        super().__init__(ktx_id)
+        self.method = fields["method"]
+        self.path = fields["path"]
+        self.route = fields["route"]
+        self.client = fields["client"]
+        self.user_agent = fields["user_agent"]
+        self.request_id = fields["request_id"]
+        self.tenant = fields["tenant"]
+        self.region = fields["region"]
+
+    def get_data(self) -> Mapping[str, Any]:
+        return {
+            **super().get_data(),
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "client": self.client,
+            "user_agent": self.user_agent,
+            "request_id": self.request_id,
+            "tenant": self.tenant,
+            "region": self.region,
+        }
+
+
+@context_schema
+class RequestContext(SchemaContext):
+    method: str = ""
+    path: str = ""
+    route: str = ""
+    client: str = ""
+    user_agent: str = ""
+    request_id: str = ""
+    tenant: str = ""
+    region: str = ""
+
+
+MAKERS: dict[str, Callable[[], Any]] = {
+    "Context (dict)": lambda: Context("id", data=FIELDS),
+    "manual subclass": lambda: ManualContext("id", **FIELDS),
+    "@context_schema": lambda: RequestContext("id", data=FIELDS),
+}
+
+
+def retained_bytes(make: Callable[[], Any]) -> int:
+    # memory held by a context with its data, without the shared values
+    ctx = make()
+    size = sys.getsizeof(ctx)
+    for attr in ("_data", "__dict__"):
+        value = getattr(ctx, attr, None)
+        if value:
+            size += sys.getsizeof(value)
+    return size
+
+
+def bench(name: str, make: Callable[[], Any]) -> tuple[object, ...]:
+    ctx = make()
+
+    def set_get_data() -> None:
+        ctx.set("path", "/api/other")
+        ctx.get_data()
+
+    return (
+        name,
+        retained_bytes(make),
+        alloc_bytes_per_op(make),
+        ops_per_sec(make),
+        ops_per_sec(lambda: ctx.get("path"), number=100_000),
+        ops_per_sec(set_get_data),
+        ops_per_sec(lambda: ktx_add_log({}, ctx)),
+    )
+
+
+def main() -> None:
+    print_table(
+        (
+            "context",
+            "bytes held",
+            "bytes alloc/create",
+            "create ops/s",
+            "get ops/s",
+            "set+get_data ops/s",
+            "log ops/s",
+        ),
+        [bench(name, make) for name, make in MAKERS.items()],
+    )
+
+    schema_ctx = RequestContext("id", data=FIELDS)
+    print(
+        f"\ntyped attribute read: "
+        f"{ops_per_sec(lambda: schema_ctx.path, number=100_000):,.0f} ops/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
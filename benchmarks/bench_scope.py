@@ -0,0 +1,76 @@
+"""Binding and reading the context and the user: separate binds vs one scope.
+
+Compares ctx_bind + ctx_user_bind with scope_bind and the @scoped
+decorator per handler call, and two getter calls with get_current_scope().
+"""
+
+from _bench import ops_per_sec, print_table
+
+from ktx import (
+    ctx_bind,
+    ctx_user_bind,
+    get_current_ctx_or_none,
+    get_current_ctx_user_or_none,
+    get_current_scope,
+    scope_bind,
+    scoped,
+)
+from ktx.ctx import ContextFactory
+from ktx.user import ContextUserFactory
+
+ctx_factory = ContextFactory(inherit_data=False)
+user_factory = ContextUserFactory()
+
+
+def handle() -> None:
+    pass
+
+
+def separate() -> None:
+    with ctx_bind(ctx_factory.create()), ctx_user_bind(user_factory.create()):
+        handle()
+
+
+def scope() -> None:
+    with scope_bind(ctx_factory.create(), user_factory.create()):
+        handle()
+
+
+decorated = scoped(ctx_factory, user_factory)(handle)
+
+
+def unbound() -> None:
+    ctx_factory.create()
+    user_factory.create()
+    handle()
+
+
+def read_separate() -> None:
+    get_current_ctx_or_none()
+    get_current_ctx_user_or_none()
+
+
+def main() -> None:
+    print_table(
+        ("handler call", "ops/s"),
+        [
+            ("create only, no bind", ops_per_sec(unbound, number=50_000)),
+            ("ctx_bind + ctx_user_bind", ops_per_sec(separate, number=50_000)),
+            ("scope_bind", ops_per_sec(scope, number=50_000)),
+            ("@scoped", ops_per_sec(decorated, number=50_000)),
+        ],
+    )
+
+    print()
+    with scope_bind(ctx_factory.create(), user_factory.create()):
+        print_table(
+            ("read ctx and user", "ops/s"),
+            [
+                ("two getters", ops_per_sec(read_separate, number=200_000)),
+                ("get_current_scope", ops_per_sec(get_current_scope, number=200_000)),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
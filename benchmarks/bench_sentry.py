@@ -0,0 +1,51 @@
+"""Sentry enrichment overhead: push adapters on every set() vs the pull-based
+KtxSentryIntegration that reads the context only when an event is built."""
+
+from _bench import ops_per_sec, print_table
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.adapters.sentry import (
+    SentryDataAdapter,
+    SentryUserAdapter,
+    ktx_sentry_enrich_event,
+)
+from ktx.ctx import Context
+from ktx.user import ContextUser
+
+KEYS = (10, 50)
+
+
+def main() -> None:
+    push_ctx = Context("id", adapters=[SentryDataAdapter()])
+    pull_ctx = Context("id")
+    push_user = ContextUser(adapters=[SentryUserAdapter()])
+    pull_user = ContextUser()
+
+    print_table(
+        ("operation", "push ops/s", "pull ops/s"),
+        [
+            (
+                "Context.set",
+                ops_per_sec(lambda: push_ctx.set("key", "value")),
+                ops_per_sec(lambda: pull_ctx.set("key", "value")),
+            ),
+            (
+                "ContextUser.set_id",
+                ops_per_sec(lambda: push_user.set_id(42)),
+                ops_per_sec(lambda: pull_user.set_id(42)),
+            ),
+        ],
+    )
+    print()
+
+    rows = []
+    for keys in KEYS:
+        ctx = Context("id", data={f"key{i}": i for i in range(keys)})
+        with ctx_bind(ctx), ctx_user_bind(ContextUser(id=42, email="a@b.c")):
+            rows.append((keys, ops_per_sec(lambda: ktx_sentry_enrich_event({}))))
+
+    print_table(("keys", "pull cost per event ops/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
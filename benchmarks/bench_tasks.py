@@ -0,0 +1,106 @@
+"""Memory of per-task contexts: lazy task factory vs eager child contexts.
+
+10,000 tasks are spawned under a parent context with 50 keys and kept alive
+at the same time; memory held per task is measured with tracemalloc while
+they wait (the first row is the task itself, with the parent's context
+shared as without ktx.tasks). Eager variants give every task its own
+context at start: ContextFactory.create() + ctx_bind (copy-on-write data)
+and a context with a copy of the parent's data. With the lazy task factory
+tasks only get their own context on their first write. Writing tasks copy
+the shared data on their first write in both cases.
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from _bench import print_table
+
+from ktx import ctx_bind, get_current_ctx
+from ktx.ctx import Context, ContextFactory
+from ktx.tasks import install_task_factory
+
+TASKS = 10_000
+KEYS = 50
+
+ctx_factory = ContextFactory()
+
+Task = Callable[[asyncio.Event], Coroutine[Any, Any, None]]
+
+
+async def shared(release: asyncio.Event) -> None:
+    get_current_ctx().get("key0")
+    await release.wait()
+
+
+async def eager_create(release: asyncio.Event) -> None:
+    with ctx_bind(ctx_factory.create()) as ctx:
+        ctx.get("key0")
+        await release.wait()
+
+
+async def eager_copy(release: asyncio.Event) -> None:
+    parent = get_current_ctx()
+    with ctx_bind(Context(ctx_factory.create().ktx_id(), data=parent.get_data())):
+        await release.wait()
+
+
+async def eager_create_write(release: asyncio.Event) -> None:
+    with ctx_bind(ctx_factory.create()) as ctx:
+        ctx.set("task", 1)
+        await release.wait()
+
+
+async def write(release: asyncio.Event) -> None:
+    get_current_ctx().set("task", 1)
+    await release.wait()
+
+
+async def measure(task: Task, lazy: bool, trace: bool) -> float:
+    # bytes held per task with trace=True, otherwise ns to spawn and start
+    if lazy:
+        install_task_factory()
+
+    release = asyncio.Event()
+    with ctx_bind(Context("parent", data={f"key{i}": i for i in range(KEYS)})):
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        tasks = [asyncio.create_task(task(release)) for _ in range(TASKS)]
+        await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+        if trace:
+            held = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    return held / TASKS if trace else elapsed / TASKS * 1e9
+
+
+def main() -> None:
+    variants: list[tuple[str, Task, bool]] = [
+        ("read only: shared parent context", shared, False),
+        ("read only: eager create() + ctx_bind", eager_create, False),
+        ("read only: eager copy of parent data", eager_copy, False),
+        ("read only: lazy task factory", shared, True),
+        ("one write: eager create() + ctx_bind", eager_create_write, False),
+        ("one write: lazy task factory", write, True),
+    ]
+    rows = [
+        (
+            name,
+            asyncio.run(measure(task, lazy, trace=True)),
+            asyncio.run(measure(task, lazy, trace=False)),
+        )
+        for name, task, lazy in variants
+    ]
+
+    print_table(("tasks", "bytes/task", "ns/task to spawn and start"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Read/write throughput of one context shared by 1..N threads.
+
+Every thread runs the same mix on a shared context with 20 keys: 9 reads
+(get() and get_data()) per write (set()). ThreadSafeContext is compared
+with a Context behind one lock taken by readers and writers alike.
+
+Threads only run in parallel on a free-threaded build (python3.13t);
+with the GIL total throughput cannot grow with the number of threads and
+the table shows the cost of the synchronization alone.
+
+    python benchmarks/bench_threadsafe.py --threads 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from _bench import print_table
+
+from ktx.ctx import Context
+from ktx.threadsafe import ThreadSafeContext
+
+OPS = 100_000
+DATA = {f"key{i}": i for i in range(20)}
+
+
+class LockedContext:
+    # the alternative: every access under one lock
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ctx = Context("id", data=DATA)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            return self._ctx.get(key)
+
+    def get_data(self) -> Any:
+        with self._lock:
+            return self._ctx.get_data()
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._ctx.set(key, value)
+
+
+def worker(ctx: Any, n: int, barrier: threading.Barrier) -> None:
+    get = ctx.get
+    get_data = ctx.get_data
+    key = f"thread{n}"
+    barrier.wait()
+    for i in range(OPS // 10):
+        for _ in range(4):
+            get("key1")
+            get_data()
+        get("key2")
+        ctx.set(key, i)
+
+
+def run(make: Callable[[], Any], threads: int) -> float:
+    ctx = make()
+    barrier = threading.Barrier(threads + 1)
+    pool = [
+        threading.Thread(target=worker, args=(ctx, n, barrier)) for n in range(threads)
+    ]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return threads * OPS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=min(os.cpu_count() or 1, 8))
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}, {os.cpu_count()} CPUs\n")
+
+    rows = []
+    counts = sorted({1, 2, 4, args.threads} & set(range(1, args.threads + 1)))
+    for threads in counts:
+        rows.append(
+            (
+                threads,
+                run(lambda: ThreadSafeContext("id", data=DATA), threads),
+                run(LockedContext, threads),
+            )
+        )
+
+    print_table(("threads", "ThreadSafeContext ops/s", "global lock ops/s"), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""In-process asyncio load harness: per-request cost of ktx in a service.
+
+Every simulated request binds a Context and a ContextUser, sets keys, spawns
+child tasks inheriting the context through asyncio.create_task and logs
+through ktx_add_log. The same workload runs with ktx disabled (the same
+event dicts are built but ktx is not called), and the difference is
+reported as the added latency.
+
+    python benchmarks/load_asyncio.py --requests 20000 --concurrency 200 \\
+        --fanout 4 --logs 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+from _bench import print_table
+
+from ktx import ctx_bind, ctx_user_bind, get_current_ctx
+from ktx.ctx import ContextFactory
+from ktx.log import ktx_add_log, ktx_add_user_log
+from ktx.user import ContextUserFactory
+
+ctx_factory = ContextFactory()
+user_factory = ContextUserFactory()
+
+
+async def child(task_no: int, logs: int, enabled: bool) -> None:
+    if enabled:
+        get_current_ctx().set(f"child{task_no}", "started")
+
+    for i in range(logs):
+        event: dict[str, Any] = {"event": "child", "task": task_no, "i": i}
+        if enabled:
+            ktx_add_user_log(ktx_add_log(event, cache=True))
+        await asyncio.sleep(0)
+
+
+async def handle(request_no: int, fanout: int, logs: int, enabled: bool) -> None:
+    if not enabled:
+        await asyncio.gather(*(child(i, logs, False) for i in range(fanout)))
+        return
+
+    with ctx_bind(ctx_factory.create()) as ctx:
+        with ctx_user_bind(user_factory.create()) as user:
+            ctx.set_many(
+                {
+                    "request_no": request_no,
+                    "method": "GET",
+                    "path": "/api/items",
+                    "client": "127.0.0.1",
+                }
+            )
+            user.set_many({"id": request_no, "username": f"user{request_no}"})
+
+            tasks = [asyncio.create_task(child(i, logs, True)) for i in range(fanout)]
+            await asyncio.gather(*tasks)
+
+
+async def run(args: argparse.Namespace, enabled: bool) -> tuple[list[float], float]:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(request_no: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await handle(request_no, args.fanout, args.logs, enabled)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.requests)))
+    return latencies, time.perf_counter() - start
+
+
+def peak_memory(args: argparse.Namespace, enabled: bool) -> int:
+    tracemalloc.start()
+    try:
+        asyncio.run(run(args, enabled))
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--logs", type=int, default=5, help="log lines per child")
+    args = parser.parse_args()
+
+    rows = []
+    p50 = {}
+    p99 = {}
+    for enabled in (False, True):
+        latencies, elapsed = asyncio.run(run(args, enabled))
+        quantiles = statistics.quantiles(latencies, n=100)
+        p50[enabled] = quantiles[49] * 1e6
+        p99[enabled] = quantiles[98] * 1e6
+        rows.append(
+            (
+                "enabled" if enabled else "disabled",
+                args.requests / elapsed,
+                p50[enabled],
+                p99[enabled],
+                peak_memory(args, enabled) / 1024,
+            )
+        )
+
+    print_table(("ktx", "req/s", "p50 us", "p99 us", "peak KiB"), rows)
+    print(
+        f"\nadded latency: p50 {p50[True] - p50[False]:,.0f} us, "
+        f"p99 {p99[True] - p99[False]:,.0f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,61 @@
-from .bind import ctx_bind, ctx_user_bind
-from .vars import (
-    get_current_ctx,
-    get_current_ctx_or_none,
-    get_current_ctx_user,
-    get_current_ctx_user_or_none,
-)
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .bind import ctx_bind, ctx_user_bind, scope_bind, scoped
+    from .vars import (
+        get_current_ctx,
+        get_current_ctx_or_none,
+        get_current_ctx_user,
+        get_current_ctx_user_or_none,
+        get_current_scope,
+    )
 
 __all__ = [
     "get_current_ctx",
     "get_current_ctx_or_none",
     "get_current_ctx_user",
     "get_current_ctx_user_or_none",
+    "get_current_scope",
     "ctx_bind",
     "ctx_user_bind",
+    "scope_bind",
+    "scoped",
 ]
+
+# Names are imported from their modules on first access, so that importing
+# ktx (e.g. from a shared logging config) loads nothing until it is used
+_LAZY = {
+    "get_current_ctx": "vars",
+    "get_current_ctx_or_none": "vars",
+    "get_current_ctx_user": "vars",
+    "get_current_ctx_user_or_none": "vars",
+    "get_current_scope": "vars",
+    "ctx_bind": "bind",
+    "ctx_user_bind": "bind",
+    "scope_bind": "bind",
+    "scoped": "bind",
+}
+
+
+def __getattr__(name: str) -> Any:
+    from importlib import import_module
+
+    module = _LAZY.get(name)
+    if module is None:
+        # submodules, e.g. ktx.abc, used to be loaded by importing ktx;
+        # importing one sets it as an attribute of the package
+        try:
+            return import_module(f".{name}", __name__)
+        except ModuleNotFoundError as e:
+            if e.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    # cached, later lookups do not reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,17 @@
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .abc import AbstractContextDataAdapter
+
+
+def adapters_set_many(
+    adapters: Sequence[AbstractContextDataAdapter],
+    data: Mapping[str, Any],
+) -> None:
+    for adapter in adapters:
+        set_many = getattr(adapter, "set_many", None)
+        if set_many is not None:
+            set_many(data)
+        else:
+            for key, value in data.items():
+                adapter.set(key, value)
@@ -1,5 +1,14 @@
-import importlib.util
 import sys
+from typing import Any
 
 PY311 = sys.version_info >= (3, 11)
-has_sentry = importlib.util.find_spec("sentry_sdk") is not None
+
+
+def __getattr__(name: str) -> Any:
+    # optional integrations are looked up on first use, not on import
+    if name == "has_sentry":
+        import importlib.util
+
+        value = globals()[name] = importlib.util.find_spec("sentry_sdk") is not None
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
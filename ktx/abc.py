@@ -18,6 +18,11 @@ class AbstractContextDataAdapter(Protocol):
     def set(self, key: str, value: Any) -> None: ...
 
 
+@runtime_checkable
+class AbstractContextDataBulkAdapter(AbstractContextDataAdapter, Protocol):
+    def set_many(self, data: Mapping[str, Any]) -> None: ...
+
+
 @runtime_checkable
 class AbstractContextUser(Protocol):
     def get_id(self) -> Any:
@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from collections.abc import Mapping
+from typing import Any, Literal
+
+from ktx._dispatch import adapters_set_many
+from ktx.abc import AbstractContextDataAdapter, AbstractContextDataBulkAdapter
+
+logger = logging.getLogger(__name__)
+
+# what to do with a new key when `maxsize` keys are already pending:
+# "drop" discards it (and counts it), "block" applies backpressure to the caller
+OverflowPolicy = Literal["drop", "block"]
+
+
+class _DispatchAdapter(AbstractContextDataBulkAdapter):
+    # Updates are kept in a dict until the worker picks them up, so repeated
+    # writes of the same key are coalesced and only the last value is sent.
+    # Note that the wrapped adapter is called outside of the caller's
+    # contextvars context, so it must not rely on it (e.g. Sentry scopes).
+
+    def __init__(
+        self,
+        adapter: AbstractContextDataAdapter,
+        *,
+        maxsize: int = 1024,
+        overflow: OverflowPolicy = "drop",
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+
+        self._adapter = adapter
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._pending: dict[str, Any] = {}
+        self._dispatched = 0
+        self._coalesced = 0
+        self._dropped = 0
+        self._errors = 0
+
+    @property
+    def dispatched(self) -> int:
+        return self._dispatched
+
+    @property
+    def coalesced(self) -> int:
+        return self._coalesced
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def errors(self) -> int:
+        return self._errors
+
+    def _send(self, batch: Mapping[str, Any]) -> None:
+        try:
+            adapters_set_many([self._adapter], batch)
+        except Exception:
+            self._errors += 1
+            logger.exception("adapter %r failed", self._adapter)
+
+        self._dispatched += len(batch)
+
+
+class ThreadDispatchAdapter(_DispatchAdapter):
+    # A forked child gets its own worker; updates the parent had queued are
+    # left to the parent's worker.
+
+    def __init__(
+        self,
+        adapter: AbstractContextDataAdapter,
+        *,
+        maxsize: int = 1024,
+        overflow: OverflowPolicy = "drop",
+    ):
+        super().__init__(adapter, maxsize=maxsize, overflow=overflow)
+        self._closed = False
+        self._start()
+        _thread_adapters.add(self)
+
+    def _start(self) -> None:
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._run, name="ktx-adapter-dispatch", daemon=True
+        )
+        self._thread.start()
+
+    def _reinit_after_fork(self) -> None:
+        # the parent's worker does not exist in the child and its lock may
+        # have been held at fork time
+        self._pending = {}
+        if self._closed:
+            self._cond = threading.Condition()
+            self._busy = False
+            self._stopped = True
+        else:
+            self._start()
+
+    def set(self, key: str, value: Any) -> None:
+        with self._cond:
+            self._put(key, value)
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        with self._cond:
+            for key, value in data.items():
+                self._put(key, value)
+
+    def _put(self, key: str, value: Any) -> None:
+        if self._closed:
+            # the worker is gone or about to stop, nothing would send it
+            self._dropped += 1
+            return
+
+        pending = self._pending
+        if key in pending:
+            self._coalesced += 1
+        else:
+            while len(pending) >= self._maxsize:
+                if self._overflow == "drop" or self._closed:
+                    self._dropped += 1
+                    return
+
+                self._cond.wait()
+                pending = self._pending
+
+        pending[key] = value
+        self._cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # waits until everything queued so far has been passed to the adapter,
+        # returns right away once the worker has stopped
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._stopped or (not self._pending and not self._busy),
+                timeout,
+            )
+
+    def close(self, timeout: float | None = None) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    self._stopped = True
+                    self._cond.notify_all()
+                    return
+
+                batch = self._pending
+                self._pending = {}
+                self._busy = True
+                self._cond.notify_all()
+
+            self._send(batch)
+
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+_thread_adapters: "weakref.WeakSet[ThreadDispatchAdapter]" = weakref.WeakSet()
+
+
+def _reinit_after_fork() -> None:
+    for adapter in list(_thread_adapters):
+        adapter._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reinit_after_fork)
+
+
+class AsyncioDispatchAdapter(_DispatchAdapter):
+    # Must be used from the event loop's thread. The adapter is called by a
+    # worker task between other tasks' steps instead of inside set(); with
+    # overflow="block" a full queue is drained inline by the caller as
+    # set() can not wait for the worker.
+
+    def __init__(
+        self,
+        adapter: AbstractContextDataAdapter,
+        *,
+        maxsize: int = 1024,
+        overflow: OverflowPolicy = "drop",
+    ):
+        super().__init__(adapter, maxsize=maxsize, overflow=overflow)
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def set(self, key: str, value: Any) -> None:
+        self._put(key, value)
+        self._wake()
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        for key, value in data.items():
+            self._put(key, value)
+        self._wake()
+
+    def _put(self, key: str, value: Any) -> None:
+        pending = self._pending
+        if key in pending:
+            self._coalesced += 1
+        elif len(pending) >= self._maxsize:
+            if self._overflow == "drop":
+                self._dropped += 1
+                return
+
+            self.flush()
+            pending = self._pending
+
+        pending[key] = value
+
+    def _wake(self) -> None:
+        wakeup = self._wakeup
+        if wakeup is None or self._task is None or self._task.done():
+            wakeup = self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run(wakeup))
+
+        wakeup.set()
+
+    def flush(self) -> None:
+        # passes pending updates to the adapter right away
+        if self._pending:
+            batch = self._pending
+            self._pending = {}
+            self._send(batch)
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        self._wakeup = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+        self.flush()
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            await wakeup.wait()
+            wakeup.clear()
+            self.flush()
@@ -1,15 +1,20 @@
+from collections.abc import Mapping
 from typing import Any
 
 from ktx._meta import has_sentry
-from ktx.abc import AbstractContextDataAdapter
+from ktx.abc import AbstractContextDataBulkAdapter
+from ktx.vars import get_current_ctx_or_none, get_current_ctx_user_or_none
 
 if not has_sentry:
     raise ImportError("Sentry integration is not available.")  # pragma: no cover
 
-from sentry_sdk import get_isolation_scope, set_extra, set_user
+from sentry_sdk import get_client, get_isolation_scope, set_extra
+from sentry_sdk.integrations import Integration
+from sentry_sdk.scope import add_global_event_processor
+from sentry_sdk.types import Event, Hint
 
 
-class SentryDataAdapter(AbstractContextDataAdapter):
+class SentryDataAdapter(AbstractContextDataBulkAdapter):
     def __init__(self, *, ignore_prefix: str | None = "_"):
         self._ignore_prefix = ignore_prefix
 
@@ -19,14 +24,95 @@ class SentryDataAdapter(AbstractContextDataAdapter):
 
         set_extra(key, value)
 
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        scope = get_isolation_scope()
+        ignore_prefix = self._ignore_prefix
+        for key, value in data.items():
+            if ignore_prefix and key.startswith(ignore_prefix):
+                continue
 
-class SentryUserAdapter(AbstractContextDataAdapter):
+            scope.set_extra(key, value)
+
+
+class SentryUserAdapter(AbstractContextDataBulkAdapter):
     def set(self, key: str, value: Any) -> None:
-        self._sentry_set_user_key(key, value)
+        self._sentry_set_user_keys({key: value})
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        # ContextUser.set_many() gets here once per batch, so the scope's
+        # user is rewritten once instead of once per field
+        self._sentry_set_user_keys(data)
 
     @staticmethod
-    def _sentry_set_user_key(key: str, value: Any) -> None:
-        user = get_isolation_scope()._user or {}
+    def _sentry_set_user_keys(data: Mapping[str, Any]) -> None:
+        scope = get_isolation_scope()
+        # sentry_sdk has no public getter for the scope's user
+        user = dict(scope._user or {})
+
+        user.update(data)
+        scope.set_user(user)
+
+
+class KtxSentryIntegration(Integration):
+    # Pull-based alternative to SentryDataAdapter/SentryUserAdapter: nothing
+    # is sent to Sentry on set(), the current Context and ContextUser are read
+    # only when an event is being built.
+    identifier = "ktx"
+
+    def __init__(self, *, ignore_prefix: str | None = "_", user: bool = True):
+        self.ignore_prefix = ignore_prefix
+        self.user = user
+
+    @staticmethod
+    def setup_once() -> None:
+        add_global_event_processor(_ktx_event_processor)
+
+
+def _ktx_event_processor(event: Event, hint: Hint) -> Event:
+    integration = get_client().get_integration(KtxSentryIntegration)
+    if integration is None:
+        return event
+
+    return ktx_sentry_enrich_event(
+        event,
+        ignore_prefix=integration.ignore_prefix,
+        user=integration.user,
+    )
+
+
+def ktx_sentry_enrich_event(
+    event: Event,
+    *,
+    ignore_prefix: str | None = "_",
+    user: bool = True,
+) -> Event:
+    # values set explicitly on the Sentry scope take precedence over ktx ones
+    ctx = get_current_ctx_or_none()
+    if ctx is not None:
+        extra = {
+            k: v
+            for k, v in ctx.get_data().items()
+            if not (ignore_prefix and k.startswith(ignore_prefix))
+        }
+        if extra:
+            extra.update(event.get("extra") or {})
+            event["extra"] = extra
+
+    if user:
+        ctx_user = get_current_ctx_user_or_none()
+        if ctx_user is not None:
+            user_data = {
+                k: v
+                for k, v in (
+                    ("id", ctx_user.get_id()),
+                    ("username", ctx_user.get_username()),
+                    ("email", ctx_user.get_email()),
+                    ("ip_address", ctx_user.get_ip_address()),
+                )
+                if v is not None
+            }
+            if user_data:
+                user_data.update(event.get("user") or {})
+                event["user"] = user_data
 
-        user[key] = value
-        set_user(user)
+    return event
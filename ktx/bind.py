@@ -1,24 +1,45 @@
+import functools
+from collections.abc import Awaitable, Callable
 from contextvars import Token
-from typing import Generic, TypeVar
-
-from .abc import AbstractBind, AbstractContext, AbstractContextUser
+from typing import Any, Generic, ParamSpec, TypeVar
+
+from . import instrument
+from .abc import (
+    AbstractBind,
+    AbstractContext,
+    AbstractContextFactory,
+    AbstractContextUser,
+    AbstractContextUserFactory,
+)
 from .vars import (
     bind_current_ctx,
     bind_current_ctx_user,
+    bind_current_scope,
     unbind_current_ctx,
     unbind_current_ctx_user,
+    unbind_current_scope,
 )
 
 ContextT = TypeVar("ContextT", bound=AbstractContext)
 ContextUserT = TypeVar("ContextUserT", bound=AbstractContextUser)
+P = ParamSpec("P")
+R = TypeVar("R")
 
 
 class ContextBind(Generic[ContextT], AbstractBind[ContextT]):
-    __slots__ = ["_ctx", "_token"]
-
-    def __init__(self, ctx: ContextT):
+    __slots__ = ["_ctx", "_token", "_on_unbind", "_instrumented"]
+
+    def __init__(
+        self,
+        ctx: ContextT,
+        *,
+        on_unbind: Callable[[], object] | None = None,
+    ):
         self._ctx = ctx
         self._token: Token | None = None
+        self._on_unbind = on_unbind
+        # (instrumentation, bind time) if instrumentation was active on bind
+        self._instrumented: tuple[instrument.Instrumentation, float] | None = None
 
     @property
     def ctx(self) -> ContextT:
@@ -26,20 +47,35 @@ class ContextBind(Generic[ContextT], AbstractBind[ContextT]):
 
     def bind(self) -> ContextT:
         self._token = bind_current_ctx(self._ctx)
+        instrumentation = instrument.active
+        if instrumentation is not None:
+            self._instrumented = (instrumentation, instrumentation.on_bind())
         return self._ctx
 
     def unbind(self) -> None:
         if self._token is not None:
             unbind_current_ctx(self._token)
             self._token = None
+            if self._instrumented is not None:
+                instrumentation, bound_at = self._instrumented
+                self._instrumented = None
+                instrumentation.on_unbind(self._ctx, bound_at)
+            if self._on_unbind is not None:
+                self._on_unbind()
 
 
 class ContextUserBind(Generic[ContextUserT], AbstractBind[ContextUserT]):
-    __slots__ = ["_user", "_token"]
-
-    def __init__(self, user: ContextUserT):
+    __slots__ = ["_user", "_token", "_on_unbind"]
+
+    def __init__(
+        self,
+        user: ContextUserT,
+        *,
+        on_unbind: Callable[[], object] | None = None,
+    ):
         self._user = user
         self._token: Token | None = None
+        self._on_unbind = on_unbind
 
     @property
     def user(self) -> ContextUserT:
@@ -53,11 +89,155 @@ class ContextUserBind(Generic[ContextUserT], AbstractBind[ContextUserT]):
         if self._token is not None:
             unbind_current_ctx_user(self._token)
             self._token = None
+            if self._on_unbind is not None:
+                self._on_unbind()
+
+
+class ScopeBind(
+    Generic[ContextT, ContextUserT],
+    AbstractBind[tuple[ContextT, ContextUserT]],
+):
+    # binds a context and a user together with one ContextVar operation
+    __slots__ = ["_ctx", "_user", "_token", "_on_unbind", "_instrumented"]
+
+    def __init__(
+        self,
+        ctx: ContextT,
+        user: ContextUserT,
+        *,
+        on_unbind: Callable[[], object] | None = None,
+    ):
+        self._ctx = ctx
+        self._user = user
+        self._token: Token | None = None
+        self._on_unbind = on_unbind
+        self._instrumented: tuple[instrument.Instrumentation, float] | None = None
 
+    @property
+    def ctx(self) -> ContextT:
+        return self._ctx
 
-def ctx_bind(ctx: ContextT) -> ContextBind[ContextT]:
-    return ContextBind(ctx)
+    @property
+    def user(self) -> ContextUserT:
+        return self._user
 
+    def bind(self) -> tuple[ContextT, ContextUserT]:
+        self._token = bind_current_scope(self._ctx, self._user)
+        instrumentation = instrument.active
+        if instrumentation is not None:
+            self._instrumented = (instrumentation, instrumentation.on_bind())
+        return self._ctx, self._user
 
-def ctx_user_bind(user: ContextUserT) -> ContextUserBind[ContextUserT]:
-    return ContextUserBind(user)
+    def unbind(self) -> None:
+        if self._token is not None:
+            unbind_current_scope(self._token)
+            self._token = None
+            if self._instrumented is not None:
+                instrumentation, bound_at = self._instrumented
+                self._instrumented = None
+                instrumentation.on_unbind(self._ctx, bound_at)
+            if self._on_unbind is not None:
+                self._on_unbind()
+
+
+def ctx_bind(
+    ctx: ContextT,
+    *,
+    on_unbind: Callable[[], object] | None = None,
+) -> ContextBind[ContextT]:
+    return ContextBind(ctx, on_unbind=on_unbind)
+
+
+def ctx_user_bind(
+    user: ContextUserT,
+    *,
+    on_unbind: Callable[[], object] | None = None,
+) -> ContextUserBind[ContextUserT]:
+    return ContextUserBind(user, on_unbind=on_unbind)
+
+
+def scope_bind(
+    ctx: ContextT,
+    user: ContextUserT,
+    *,
+    on_unbind: Callable[[], object] | None = None,
+) -> ScopeBind[ContextT, ContextUserT]:
+    return ScopeBind(ctx, user, on_unbind=on_unbind)
+
+
+def scoped(
+    ctx_factory: AbstractContextFactory[Any],
+    user_factory: AbstractContextUserFactory[Any],
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    # Decorator running every call of a sync or async handler with a new
+    # context and user bound, without a bind object per call (instances of
+    # pooled factories, see ktx.pool, are released afterwards):
+    #
+    #     @scoped(ContextFactory(), ContextUserFactory())
+    #     async def handle(request): ...
+    def decorator(fn: Callable[P, R]) -> Callable[P, R]:
+        # inspect is slow to import and only needed when decorating
+        import inspect
+
+        if inspect.iscoroutinefunction(fn):
+            # R is the coroutine type here, awaited by the wrapper
+            return _scoped_async(fn, ctx_factory, user_factory)  # type: ignore[return-value]
+
+        release_ctx, release_user = _releasers(ctx_factory, user_factory)
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            ctx = ctx_factory.create()
+            user = user_factory.create()
+            token = bind_current_scope(ctx, user)
+            instrumentation = instrument.active
+            bound_at = instrumentation.on_bind() if instrumentation is not None else 0.0
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                unbind_current_scope(token)
+                if instrumentation is not None:
+                    instrumentation.on_unbind(ctx, bound_at)
+                if release_ctx is not None:
+                    release_ctx(ctx)
+                if release_user is not None:
+                    release_user(user)
+
+        return wrapper
+
+    return decorator
+
+
+def _scoped_async(
+    fn: Callable[P, Awaitable[R]],
+    ctx_factory: AbstractContextFactory[Any],
+    user_factory: AbstractContextUserFactory[Any],
+) -> Callable[P, Awaitable[R]]:
+    release_ctx, release_user = _releasers(ctx_factory, user_factory)
+
+    @functools.wraps(fn)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        ctx = ctx_factory.create()
+        user = user_factory.create()
+        token = bind_current_scope(ctx, user)
+        instrumentation = instrument.active
+        bound_at = instrumentation.on_bind() if instrumentation is not None else 0.0
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            unbind_current_scope(token)
+            if instrumentation is not None:
+                instrumentation.on_unbind(ctx, bound_at)
+            if release_ctx is not None:
+                release_ctx(ctx)
+            if release_user is not None:
+                release_user(user)
+
+    return wrapper
+
+
+def _releasers(
+    ctx_factory: AbstractContextFactory[Any],
+    user_factory: AbstractContextUserFactory[Any],
+) -> tuple[Callable[[Any], object] | None, Callable[[Any], object] | None]:
+    return getattr(ctx_factory, "release", None), getattr(user_factory, "release", None)
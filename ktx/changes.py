@@ -0,0 +1,86 @@
+import weakref
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, NamedTuple
+
+from immutabledict import immutabledict
+
+from .abc import AbstractContext
+from .ctx import Context
+from .lazy import LazyPolicy, resolve_lazy
+
+# (ktx_id, generation, data seen by the consumer); opaque to consumers
+ChangeCursor = tuple[str, int, Mapping[str, Any]]
+
+_NO_DATA: Mapping[str, Any] = MappingProxyType({})
+_NO_KEYS: frozenset[str] = frozenset()
+_MISSING = object()
+
+
+class ContextChanges(NamedTuple):
+    # full: data is the whole context (first read, or the cursor is of
+    # another context); otherwise data holds the keys set since the cursor
+    # and cleared the keys removed since
+    full: bool
+    data: Mapping[str, Any]
+    cleared: frozenset[str]
+    cursor: ChangeCursor
+
+
+def changes_since(
+    ctx: AbstractContext,
+    cursor: ChangeCursor | None = None,
+    *,
+    lazy: LazyPolicy = "force",
+) -> ContextChanges:
+    # Keys set or cleared since the cursor returned by a previous call.
+    # Consumers keep their own cursors, so any number of them can read
+    # changes independently; nothing is tracked on writes. A key counts as
+    # set when its value is another object than the one seen before.
+    ktx_id = ctx.ktx_id()
+    # a pooled context recycled since the cursor is another context even
+    # with the same ktx_id
+    generation = getattr(ctx, "_generation", 0)
+    data = _read_data(ctx, lazy)
+    if cursor is None or cursor[0] != ktx_id or cursor[1] != generation:
+        return ContextChanges(True, data, _NO_KEYS, (ktx_id, generation, data))
+
+    seen = cursor[2]
+    if seen is data:
+        return ContextChanges(False, _NO_DATA, _NO_KEYS, cursor)
+
+    changed = {k: v for k, v in data.items() if seen.get(k, _MISSING) is not v}
+    cleared = frozenset(seen.keys() - data.keys()) or _NO_KEYS
+    return ContextChanges(False, changed, cleared, (ktx_id, generation, data))
+
+
+class ChangeTracker:
+    # Cursors of one consumer, one per context: read(ctx) returns the whole
+    # context on the first read of a context and changes afterwards.
+    # Contexts are held weakly; one tracker should not be read from several
+    # threads for the same context at once.
+    __slots__ = ["_cursors", "_lazy"]
+
+    def __init__(self, *, lazy: LazyPolicy = "force"):
+        self._cursors: weakref.WeakKeyDictionary[AbstractContext, ChangeCursor] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lazy = lazy
+
+    def read(self, ctx: AbstractContext) -> ContextChanges:
+        changes = changes_since(ctx, self._cursors.get(ctx), lazy=self._lazy)
+        self._cursors[ctx] = changes.cursor
+        return changes
+
+
+def _read_data(ctx: AbstractContext, lazy: LazyPolicy) -> Mapping[str, Any]:
+    if lazy != "force" and isinstance(ctx, Context):
+        data = resolve_lazy(ctx.peek_data(), lazy)
+    else:
+        data = ctx.get_data()
+
+    # the cursor keeps the data, so it must not change afterwards; the
+    # snapshots of Context.get_data() are immutable and cached per version
+    if type(data) is immutabledict:
+        return data
+    return MappingProxyType(dict(data))
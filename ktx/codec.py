@@ -0,0 +1,188 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from .abc import (
+    AbstractContext,
+    AbstractContextFactory,
+    AbstractContextUser,
+    AbstractContextUserFactory,
+)
+from .ctx import ContextFactory
+from .user import ContextUserFactory
+
+# Binary form: format version byte followed by compact JSON
+#   [ktx_id | null, {key: value} | null, [id, username, email, ip] | null]
+# Text form: the binary form in unpadded urlsafe base64, safe for headers.
+_VERSION = b"\x01"
+
+# only values of these types are encoded, others are skipped
+_VALUE_TYPES = (str, int, float, bool, type(None))
+
+DEFAULT_MAX_SIZE = 4096
+
+# order of user fields in the encoded form, named as in ContextUser.set_many
+_USER_KEYS = ("id", "username", "email", "ip_address")
+
+_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+_decode = json.JSONDecoder().decode
+
+_default_ctx_factory = ContextFactory(inherit_data=False)
+_default_user_factory = ContextUserFactory()
+
+
+class KtxCodecError(ValueError):
+    pass
+
+
+def encode_ctx(
+    ctx: AbstractContext | None,
+    user: AbstractContextUser | None = None,
+    *,
+    include_private: bool = False,
+    max_size: int | None = DEFAULT_MAX_SIZE,
+) -> bytes:
+    ktx_id = None
+    data = None
+    if ctx is not None:
+        ktx_id = ctx.ktx_id()
+        data = {
+            k: v
+            for k, v in ctx.get_data().items()
+            if isinstance(v, _VALUE_TYPES) and (include_private or k[:1] != "_")
+        }
+
+    user_fields = None
+    if user is not None:
+        user_id = user.get_id()
+        if not isinstance(user_id, _VALUE_TYPES):
+            user_id = str(user_id)
+
+        user_fields = [
+            user_id,
+            user.get_username(),
+            user.get_email(),
+            user.get_ip_address(),
+        ]
+
+    encoded = _VERSION + _encoder.encode([ktx_id, data, user_fields]).encode()
+    if max_size is not None and len(encoded) > max_size:
+        raise KtxCodecError(
+            f"encoded context is {len(encoded)} bytes, max_size is {max_size}"
+        )
+
+    return encoded
+
+
+def encode_ctx_text(
+    ctx: AbstractContext | None,
+    user: AbstractContextUser | None = None,
+    *,
+    include_private: bool = False,
+    max_size: int | None = DEFAULT_MAX_SIZE,
+) -> str:
+    # max_size limits the binary form, text form is 4/3 of it
+    encoded = encode_ctx(ctx, user, include_private=include_private, max_size=max_size)
+    return base64.urlsafe_b64encode(encoded).rstrip(b"=").decode("ascii")
+
+
+def decode_ctx(
+    encoded: bytes,
+    *,
+    ctx_factory: AbstractContextFactory | None = None,
+    user_factory: AbstractContextUserFactory | None = None,
+    max_size: int | None = DEFAULT_MAX_SIZE,
+) -> tuple[AbstractContext | None, AbstractContextUser | None]:
+    if max_size is not None and len(encoded) > max_size:
+        raise KtxCodecError(
+            f"encoded context is {len(encoded)} bytes, max_size is {max_size}"
+        )
+
+    if encoded[:1] != _VERSION:
+        raise KtxCodecError("unsupported encoded context format")
+
+    try:
+        payload = _decode(encoded[1:].decode())
+        ktx_id, data, user_fields = payload
+    except (ValueError, TypeError) as e:
+        raise KtxCodecError("malformed encoded context") from e
+
+    ctx = None
+    if ktx_id is not None:
+        if not isinstance(ktx_id, str) or not isinstance(data, dict):
+            raise KtxCodecError("malformed encoded context")
+
+        for value in data.values():
+            if not isinstance(value, _VALUE_TYPES):
+                raise KtxCodecError("malformed encoded context")
+
+        ctx = (ctx_factory or _default_ctx_factory).create(ktx_id)
+        if data:
+            _ctx_set_many(ctx, data)
+
+    user = None
+    if user_fields is not None:
+        if (
+            not isinstance(user_fields, list)
+            or len(user_fields) != 4
+            or not all(isinstance(v, _VALUE_TYPES) for v in user_fields)
+        ):
+            raise KtxCodecError("malformed encoded context")
+
+        user = (user_factory or _default_user_factory).create()
+        _user_set_fields(user, user_fields)
+
+    return ctx, user
+
+
+def decode_ctx_text(
+    text: str,
+    *,
+    ctx_factory: AbstractContextFactory | None = None,
+    user_factory: AbstractContextUserFactory | None = None,
+    max_size: int | None = DEFAULT_MAX_SIZE,
+) -> tuple[AbstractContext | None, AbstractContextUser | None]:
+    # checked before decoding base64 so that huge headers are rejected early
+    if max_size is not None and len(text) > (max_size * 4 + 2) // 3:
+        raise KtxCodecError(f"encoded context is longer than max_size {max_size}")
+
+    try:
+        encoded = base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+    except (ValueError, binascii.Error) as e:
+        raise KtxCodecError("malformed encoded context") from e
+
+    return decode_ctx(
+        encoded,
+        ctx_factory=ctx_factory,
+        user_factory=user_factory,
+        max_size=max_size,
+    )
+
+
+def _ctx_set_many(ctx: AbstractContext, data: dict[str, Any]) -> None:
+    set_many = getattr(ctx, "set_many", None)
+    if set_many is not None:
+        set_many(data)
+    else:
+        for key, value in data.items():
+            ctx.set(key, value)
+
+
+def _user_set_fields(user: AbstractContextUser, fields: list[Any]) -> None:
+    set_many = getattr(user, "set_many", None)
+    if set_many is not None:
+        set_many(
+            {k: v for k, v in zip(_USER_KEYS, fields, strict=True) if v is not None}
+        )
+        return
+
+    user_id, username, email, ip = fields
+    if user_id is not None:
+        user.set_id(user_id)
+    if username is not None:
+        user.set_username(username)
+    if email is not None:
+        user.set_email(email)
+    if ip is not None:
+        user.set_ip_address(ip)
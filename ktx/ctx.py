@@ -1,8 +1,11 @@
-from collections.abc import Mapping, Sequence
-from typing import Any
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, ClassVar, TypeVar
 
 from immutabledict import immutabledict
 
+from . import instrument
+from ._dispatch import adapters_set_many
 from .abc import (
     AbstractContext,
     AbstractContextDataAdapter,
@@ -10,16 +13,36 @@ from .abc import (
     KtxIdMaker,
 )
 from .ktxid import ktxid_uuid4
+from .lazy import Lazy, LazyPolicy, evaluate_lazy, has_lazy, resolve_lazy
 from .vars import get_current_ctx_or_none
 
+T = TypeVar("T")
+
 
 class Context(AbstractContext):
     __slots__ = [
         "_ktx_id",
         "_data",
+        "_data_shared",
+        "_version",
+        "_snapshot",
+        "_memo",
+        "_has_lazy",
         "_adapters",
+        "_generation",
     ]
 
+    # True when get_data() changes through set() only, so that consumers
+    # (ktx.log) may render it once per version with memoize(). Subclasses
+    # overriding get_data() may add other state and get False unless they
+    # declare it again.
+    _data_by_set: ClassVar[bool] = True
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if "get_data" in cls.__dict__ and "_data_by_set" not in cls.__dict__:
+            cls._data_by_set = False
+
     def __init__(
         self,
         ktx_id: str,
@@ -29,23 +52,164 @@ class Context(AbstractContext):
     ):
         self._ktx_id = ktx_id
         self._data = dict(data) if data is not None else {}
+        # True while self._data may be referenced by another context;
+        # the first write then copies it (copy-on-write)
+        self._data_shared = False
+        self._version = 0
+        self._snapshot: Mapping[str, Any] | None = None
+        self._memo: dict[Hashable, Any] | None = None
+        # True once a Lazy value has been stored, it is not reset
+        self._has_lazy = data is not None and has_lazy(data)
         self._adapters = adapters
+        # bumped when a pool recycles the instance, tells its lifetimes apart
+        self._generation = 0
 
     def ktx_id(self) -> str:
         return self._ktx_id
 
+    def version(self) -> int:
+        # bumped on every set(): consumers may compare it with a previously
+        # seen value to find out whether the data has changed since
+        return self._version
+
     def get_data(self) -> Mapping[str, Any]:
-        return immutabledict(self._data)
+        # the snapshot is immutable, so it is reused until the next set()
+        snapshot = self._snapshot
+        if snapshot is None:
+            if self._has_lazy:
+                snapshot = self._snapshot = immutabledict(evaluate_lazy(self._data))
+            else:
+                snapshot = self._snapshot = immutabledict(self._data)
+        return snapshot
+
+    def peek_data(self) -> Mapping[str, Any]:
+        # data as stored, without evaluating Lazy values
+        return MappingProxyType(self._data)
+
+    def memoize(
+        self,
+        key: Hashable,
+        make: Callable[[Mapping[str, Any]], T],
+        *,
+        lazy: LazyPolicy = "force",
+    ) -> T:
+        # values derived from the data (e.g. rendered log fields) are computed
+        # by make(get_data()) once and reused until the next set(); with
+        # lazy="skip" or "placeholder" make gets the data with unevaluated
+        # values resolved by that policy (the key should then include the
+        # policy)
+        if lazy != "force" and self._has_lazy:
+            # evaluating a value (here or in a context sharing it) changes
+            # the result but not the data
+            return make(resolve_lazy(self.peek_data(), lazy))
+
+        memo = self._memo
+        if memo is None:
+            memo = self._memo = {}
+        elif key in memo:
+            return memo[key]
+
+        value = memo[key] = make(self.get_data())
+        return value
 
     def get(self, key: str) -> Any:
-        return self._data.get(key)
+        value = self._data.get(key)
+        if type(value) is Lazy:
+            return value.get()
+        return value
 
     def set(self, key: str, value: Any) -> None:
+        # subclasses overriding set() or set_many() must go through them (or
+        # _unshare_data() and _after_set()) instead of writing self._data:
+        # it may be shared and the snapshot and memo are only reset here
+        if self._data_shared:
+            self._unshare_data()
+
         self._data[key] = value
-        if self._adapters is not None:
+        # _after_set() inlined, this is the hot path
+        self._version += 1
+        self._snapshot = None
+        self._memo = None
+        if self._push(key, value):
+            self._has_lazy = True
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        # one merge and one call per adapter instead of set() for every key
+        if not data:
+            return
+
+        if self._data_shared:
+            self._unshare_data()
+
+        self._data.update(data)
+        self._after_write(data)
+
+    # Write paths of Context and its subclasses store the data their own way
+    # and then call _after_set() / _after_write() with what was written:
+    # cached values are dropped and the values passed on by _push() /
+    # _push_many(), which subclasses keeping their own caches call directly.
+
+    def _after_set(self, key: str, value: Any) -> None:
+        self._version += 1
+        self._snapshot = None
+        self._memo = None
+        if self._push(key, value):
+            self._has_lazy = True
+
+    def _after_write(self, data: Mapping[str, Any]) -> None:
+        self._version += 1
+        self._snapshot = None
+        self._memo = None
+        if self._push_many(data):
+            self._has_lazy = True
+
+    def _push(self, key: str, value: Any) -> bool:
+        # passes a written value to adapters (unless it is an unevaluated
+        # Lazy one, then True is returned) and instrumentation
+        is_lazy = type(value) is Lazy
+        if not is_lazy and self._adapters is not None:
             for adapter in self._adapters:
                 adapter.set(key, value)
 
+        instrumentation = instrument.active
+        if instrumentation is not None:
+            instrumentation.on_set(key, value)
+        return is_lazy
+
+    def _push_many(self, data: Mapping[str, Any]) -> bool:
+        # _push() of several values, one call per adapter
+        is_lazy = has_lazy(data)
+        if self._adapters is not None:
+            pushed = (
+                {k: v for k, v in data.items() if type(v) is not Lazy}
+                if is_lazy
+                else data
+            )
+            if pushed:
+                adapters_set_many(self._adapters, pushed)
+
+        instrumentation = instrument.active
+        if instrumentation is not None:
+            for key, value in data.items():
+                instrumentation.on_set(key, value)
+        return is_lazy
+
+    def _share_data(self, child: "Context") -> None:
+        # O(1) inheritance: the child starts with the very same dict,
+        # whichever side writes first gets its own copy
+        self._data_shared = True
+        child._data = self._data
+        child._data_shared = True
+        child._snapshot = self._snapshot
+        child._has_lazy = self._has_lazy
+        if self._memo is None:
+            self._memo = {}
+        child._memo = self._memo
+
+    def _unshare_data(self) -> None:
+        self._data = dict(self._data)
+        self._data_shared = False
+
 
 class ContextFactory(AbstractContextFactory[Context]):
     __slots__ = [
@@ -66,13 +230,30 @@ class ContextFactory(AbstractContextFactory[Context]):
         self._adapters = adapters
 
     def create(self, ktx_id: str | None = None) -> Context:
-        if ktx_id is None:
-            ktx_id = self._ktx_id_maker()
-
-        data = None
+        ktx_id = _begin_create(ktx_id, self._ktx_id_maker)
+        ctx = Context(ktx_id, adapters=self._adapters)
         if self._inherit_data:
-            parent_ctx = get_current_ctx_or_none()
-            if parent_ctx is not None:
-                data = parent_ctx.get_data()
+            self._inherit(ctx)
+
+        return ctx
+
+    def _inherit(self, ctx: Context) -> None:
+        parent_ctx = get_current_ctx_or_none()
+        if type(parent_ctx) is Context:
+            # subclasses may add fields to get_data(), so only
+            # plain contexts can share their dict directly
+            parent_ctx._share_data(ctx)
+        elif parent_ctx is not None:
+            ctx._data = dict(parent_ctx.get_data())
+
+
+def _begin_create(ktx_id: str | None, ktx_id_maker: KtxIdMaker) -> str:
+    # common start of the create() of all factories: the ktx_id to use,
+    # and the creation counted by instrumentation
+    if ktx_id is None:
+        ktx_id = ktx_id_maker()
 
-        return Context(ktx_id, data=data, adapters=self._adapters)
+    instrumentation = instrument.active
+    if instrumentation is not None:
+        instrumentation.on_create()
+    return ktx_id
@@ -0,0 +1,68 @@
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from .abc import AbstractContext, AbstractContextUser
+from .codec import decode_ctx, encode_ctx
+from .vars import (
+    bind_current_scope,
+    get_current_scope,
+    unbind_current_scope,
+)
+
+T = TypeVar("T")
+
+
+class KtxThreadPoolExecutor(ThreadPoolExecutor):
+    # Runs submitted callables with the submitter's current Context and
+    # ContextUser bound, without copying the whole contextvars mapping.
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        ctx, user = get_current_scope()
+        if ctx is None and user is None:
+            return super().submit(fn, *args, **kwargs)
+
+        return super().submit(_run_bound, ctx, user, fn, args, kwargs)
+
+
+class KtxProcessPoolExecutor(ProcessPoolExecutor):
+    # Sends the current Context and ContextUser encoded with ktx.codec
+    # (ktx_id, data values of plain types including private ones, user
+    # fields) to the worker, which binds a new Context and ContextUser
+    # (without adapters) while running the callable.
+    # Callables submitted without a context are run with none bound, even
+    # if the worker was forked while the submitter had one.
+
+    def submit(self, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> Future[T]:
+        ctx, user = get_current_scope()
+        snapshot = encode_ctx(ctx, user, include_private=True, max_size=None)
+        return super().submit(_run_from_snapshot, snapshot, fn, args, kwargs)
+
+
+def _run_bound(
+    ctx: AbstractContext | None,
+    user: AbstractContextUser | None,
+    fn: Callable[..., T],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> T:
+    token = bind_current_scope(ctx, user)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        unbind_current_scope(token)
+
+
+def _run_from_snapshot(
+    snapshot: bytes,
+    fn: Callable[..., T],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> T:
+    ctx, user = decode_ctx(snapshot, max_size=None)
+
+    token = bind_current_scope(ctx, user)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        unbind_current_scope(token)
@@ -0,0 +1,136 @@
+import sys
+import time
+from collections import deque
+from collections.abc import Mapping, Sequence
+from types import FrameType
+from typing import Any, NamedTuple
+
+from .abc import AbstractContext, AbstractContextDataAdapter, KtxIdMaker
+from .ctx import Context, ContextFactory
+from .tasks import TaskContext
+
+DEFAULT_SIZE = 64
+
+# (filename, line number, function name)
+CallSite = tuple[str, int, str]
+
+
+class SetRecord(NamedTuple):
+    time_ns: int  # time.monotonic_ns() of the write
+    key: str
+    value: Any
+    call_site: CallSite | None
+
+
+class SetHistory:
+    # Adapter recording the last `size` writes it receives in a ring buffer,
+    # so memory stays constant however many writes there are. With
+    # call_site=True every record also gets the first caller outside ktx,
+    # read from the frame stack without building a traceback.
+    #
+    # Like any adapter it is only called when configured, so disabled
+    # history costs nothing; unevaluated Lazy values are not recorded as
+    # adapters do not receive them.
+    __slots__ = ["_records", "_call_site"]
+
+    def __init__(self, size: int = DEFAULT_SIZE, *, call_site: bool = False):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        # plain tuples are cheaper to create, snapshot() converts them
+        self._records: deque[tuple[int, str, Any, CallSite | None]] = deque(maxlen=size)
+        self._call_site = call_site
+
+    def set(self, key: str, value: Any) -> None:
+        self._records.append(
+            (
+                time.monotonic_ns(),
+                key,
+                value,
+                _find_call_site() if self._call_site else None,
+            )
+        )
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        now = time.monotonic_ns()
+        call_site = _find_call_site() if self._call_site else None
+        append = self._records.append
+        for key, value in data.items():
+            append((now, key, value, call_site))
+
+    def snapshot(self) -> list[SetRecord]:
+        # records from the oldest to the newest
+        return list(map(SetRecord._make, self._records))
+
+    def format(self) -> str:
+        # one line per record, times relative to the oldest record
+        records = self.snapshot()
+        if not records:
+            return ""
+
+        start = records[0].time_ns
+        lines = []
+        for record in records:
+            line = (
+                f"+{(record.time_ns - start) / 1e6:.3f}ms {record.key}={record.value!r}"
+            )
+            if record.call_site is not None:
+                filename, lineno, function = record.call_site
+                line += f" at {filename}:{lineno} in {function}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class SetHistoryContextFactory(ContextFactory):
+    # ContextFactory giving every context its own SetHistory, after the
+    # factory's adapters; get it back with get_set_history(ctx)
+    __slots__ = ["_size", "_call_site"]
+
+    def __init__(
+        self,
+        *,
+        ktx_id_maker: KtxIdMaker | None = None,
+        inherit_data: bool = True,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+        size: int = DEFAULT_SIZE,
+        call_site: bool = False,
+    ):
+        super().__init__(
+            ktx_id_maker=ktx_id_maker,
+            inherit_data=inherit_data,
+            adapters=adapters,
+        )
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._size = size
+        self._call_site = call_site
+
+    def create(self, ktx_id: str | None = None) -> Context:
+        ctx = super().create(ktx_id)
+        history = SetHistory(self._size, call_site=self._call_site)
+        ctx._adapters = (*(self._adapters or ()), history)
+        return ctx
+
+
+def get_set_history(ctx: AbstractContext) -> SetHistory | None:
+    # the last SetHistory among the adapters of a Context; a TaskContext
+    # has none of its own, the one of the context it currently uses counts
+    if type(ctx) is TaskContext:
+        ctx = ctx._target
+    adapters = getattr(ctx, "_adapters", None) if isinstance(ctx, Context) else None
+    if adapters is not None:
+        for adapter in reversed(adapters):
+            if type(adapter) is SetHistory:
+                return adapter
+    return None
+
+
+def _find_call_site() -> CallSite | None:
+    frame: FrameType | None = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module != "ktx" and not module.startswith("ktx."):
+            code = frame.f_code
+            return code.co_filename, frame.f_lineno, code.co_name
+        frame = frame.f_back
+    return None
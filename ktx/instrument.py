@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .abc import AbstractContext
+
+# Hot paths (ContextFactory.create, ContextBind.bind/unbind, Context.set)
+# check this single module attribute, so disabled instrumentation costs one
+# attribute lookup per call. They read it once into a local, as another
+# thread may disable instrumentation between two reads.
+active: "Instrumentation | None" = None
+
+BIND_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+KEY_COUNT_BUCKETS = (0, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+VALUE_SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536)
+
+# per-key write counts are kept for at most this many distinct keys,
+# writes of other keys are counted under OTHER_KEYS
+MAX_TRACKED_KEYS = 1000
+OTHER_KEYS = "<other>"
+
+
+class Histogram:
+    __slots__ = ["_buckets", "_counts", "_sum", "_count", "_max"]
+
+    def __init__(self, buckets: Sequence[float]):
+        self._buckets = tuple(buckets)
+        # the last count is for values above the last bucket
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum: float = 0
+        self._count = 0
+        self._max: float = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+        if value > self._max:
+            self._max = value
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "buckets": list(self._buckets),
+            "counts": list(self._counts),
+            "sum": self._sum,
+            "count": self._count,
+            "max": self._max,
+        }
+
+
+class Instrumentation:
+    # Counters and distributions of context lifecycle events. Exporting is
+    # pull-based: call snapshot() and send the result wherever needed.
+
+    def __init__(self, *, max_tracked_keys: int = MAX_TRACKED_KEYS):
+        self._lock = threading.Lock()
+        self._max_tracked_keys = max_tracked_keys
+        self._contexts_created = 0
+        self._binds = 0
+        self._unbinds = 0
+        self._sets = 0
+        self._bind_duration = Histogram(BIND_DURATION_BUCKETS)
+        self._key_count = Histogram(KEY_COUNT_BUCKETS)
+        self._value_size = Histogram(VALUE_SIZE_BUCKETS)
+        self._key_writes: dict[str, int] = {}
+
+    def on_create(self) -> None:
+        with self._lock:
+            self._contexts_created += 1
+
+    def on_bind(self) -> float:
+        with self._lock:
+            self._binds += 1
+        return time.perf_counter()
+
+    def on_unbind(self, ctx: "AbstractContext", bound_at: float) -> None:
+        from .ctx import Context  # ktx.ctx imports this module
+
+        duration = time.perf_counter() - bound_at
+        # keys are counted without evaluating Lazy values
+        key_count = len(ctx.peek_data() if isinstance(ctx, Context) else ctx.get_data())
+        with self._lock:
+            self._unbinds += 1
+            self._bind_duration.observe(duration)
+            self._key_count.observe(key_count)
+
+    def on_set(self, key: str, value: Any) -> None:
+        size = sys.getsizeof(value)
+        with self._lock:
+            self._sets += 1
+            self._value_size.observe(size)
+            self._count_key_write(key)
+
+    def _count_key_write(self, key: str) -> None:
+        key_writes = self._key_writes
+        if key not in key_writes and len(key_writes) >= self._max_tracked_keys:
+            key = OTHER_KEYS
+        key_writes[key] = key_writes.get(key, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "contexts_created": self._contexts_created,
+                "binds": self._binds,
+                "unbinds": self._unbinds,
+                "binds_active": self._binds - self._unbinds,
+                "sets": self._sets,
+                "bind_duration_seconds": self._bind_duration.snapshot(),
+                "key_count_at_unbind": self._key_count.snapshot(),
+                "value_size_bytes": self._value_size.snapshot(),
+                "key_writes": dict(self._key_writes),
+            }
+
+
+def enable_instrumentation(
+    instrumentation: Instrumentation | None = None,
+) -> Instrumentation:
+    global active
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+
+    active = instrumentation
+    return instrumentation
+
+
+def disable_instrumentation() -> None:
+    global active
+    active = None
+
+
+def get_instrumentation() -> Instrumentation | None:
+    return active
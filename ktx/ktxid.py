@@ -1,5 +1,74 @@
-import uuid
+import itertools
+import os
+import threading
+import time
+
+# bytes of entropy read from the OS at once by every thread
+_ENTROPY_POOL_SIZE = 4096
+
+
+class _EntropyPool(threading.local):
+    def __init__(self) -> None:
+        self.buf = b""
+        self.pos = 0
+
+    def take(self, n: int) -> bytes:
+        pos = self.pos
+        end = pos + n
+        if end > len(self.buf):
+            self.buf = os.urandom(_ENTROPY_POOL_SIZE)
+            pos = 0
+            end = n
+
+        self.pos = end
+        return self.buf[pos:end]
+
+
+_entropy = _EntropyPool()
+
+_counter = itertools.count()
+_counter_prefix = os.urandom(8).hex()
+
+
+def _reinit_after_fork() -> None:
+    # a forked child must neither replay the parent's buffered entropy
+    # nor continue its counter under the same prefix
+    global _entropy, _counter, _counter_prefix
+    _entropy = _EntropyPool()
+    _counter = itertools.count()
+    _counter_prefix = os.urandom(8).hex()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reinit_after_fork)
 
 
 def ktxid_uuid4() -> str:
-    return uuid.uuid4().hex
+    # same as uuid.uuid4().hex without importing uuid (and platform) on
+    # startup or creating a UUID object per id
+    b = bytearray(os.urandom(16))
+    b[6] = b[6] & 0x0F | 0x40  # version
+    b[8] = b[8] & 0x3F | 0x80  # variant
+    return b.hex()
+
+
+def ktxid_random() -> str:
+    # 128 random bits like ktxid_uuid4, but served from a per-thread buffer
+    # of OS entropy instead of a syscall and a UUID object per id
+    return _entropy.take(16).hex()
+
+
+def ktxid_uuid7() -> str:
+    # UUIDv7 layout (RFC 9562): ids sort by creation time with millisecond
+    # precision, the remaining 74 bits are random
+    b = bytearray((time.time_ns() // 1_000_000).to_bytes(6, "big"))
+    b += _entropy.take(10)
+    b[6] = b[6] & 0x0F | 0x70  # version
+    b[8] = b[8] & 0x3F | 0x80  # variant
+    return b.hex()
+
+
+def ktxid_counter() -> str:
+    # unique within the process (random prefix + sequence), the prefix is
+    # regenerated in forked children
+    return f"{_counter_prefix}{next(_counter):016x}"
@@ -0,0 +1,74 @@
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any, Generic, Literal, TypeVar
+
+T = TypeVar("T")
+
+# What a consumer that must not evaluate values does with unevaluated ones:
+# evaluate them anyway, leave them out or render them as PLACEHOLDER
+LazyPolicy = Literal["force", "skip", "placeholder"]
+
+PLACEHOLDER = "<lazy>"
+
+
+class Lazy(Generic[T]):
+    # A context value computed by `make` on first use, at most once.
+    #
+    #     ctx.set("tenant", Lazy(lambda: resolve_tenant(tenant_id)))
+    #
+    # Context.get() and get_data() return the computed value. If `make`
+    # raises, the error propagates and the next use calls it again.
+    __slots__ = ["_make", "_value", "_lock"]
+
+    def __init__(self, make: Callable[[], T]):
+        self._make: Callable[[], T] | None = make
+        self._value: T | None = None
+        self._lock: threading.Lock | None = threading.Lock()
+
+    def is_evaluated(self) -> bool:
+        return self._make is None
+
+    def get(self) -> T:
+        lock = self._lock
+        if lock is not None:
+            with lock:
+                make = self._make
+                if make is not None:
+                    self._value = make()
+                    self._make = None
+                    # drop the closure and the lock once the value is known
+                    self._lock = None
+
+        return self._value  # type: ignore[return-value]
+
+    def __repr__(self) -> str:
+        if self._make is None:
+            return f"Lazy({self._value!r})"
+        return PLACEHOLDER
+
+
+def has_lazy(data: Mapping[str, Any]) -> bool:
+    return Lazy in map(type, data.values())
+
+
+def evaluate_lazy(data: Mapping[str, Any]) -> dict[str, Any]:
+    return {k: v.get() if type(v) is Lazy else v for k, v in data.items()}
+
+
+def resolve_lazy(data: Mapping[str, Any], policy: LazyPolicy) -> Mapping[str, Any]:
+    # data with Lazy values replaced according to the policy; evaluated
+    # ones are always replaced by their value
+    if not has_lazy(data):
+        return data
+
+    if policy == "force":
+        return evaluate_lazy(data)
+
+    resolved = {}
+    for k, v in data.items():
+        if type(v) is not Lazy or v.is_evaluated():
+            resolved[k] = v.get() if type(v) is Lazy else v
+        elif policy == "placeholder":
+            resolved[k] = PLACEHOLDER
+
+    return resolved
@@ -1,8 +1,26 @@
-from collections.abc import ItemsView, Iterator, MutableMapping
-from typing import Any
+import logging
+import sys
+from collections.abc import (
+    Callable,
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+from typing import TYPE_CHECKING, Any
 
 from .abc import AbstractContext, AbstractContextUser
-from .vars import get_current_ctx_or_none, get_current_ctx_user_or_none
+from .ctx import Context
+from .lazy import LazyPolicy, resolve_lazy
+from .vars import (
+    get_current_ctx_or_none,
+    get_current_ctx_user_or_none,
+    get_current_scope,
+)
+
+if TYPE_CHECKING:
+    from .changes import ChangeTracker, ContextChanges
 
 
 def ktx_add_log(
@@ -11,6 +29,8 @@ def ktx_add_log(
     *,
     log_private: bool = False,
     data_key_prefix: str = "data_",
+    cache: bool = False,
+    lazy: LazyPolicy = "force",
 ) -> MutableMapping[str, Any]:
     if ctx is None:
         ctx = get_current_ctx_or_none()
@@ -21,8 +41,34 @@ def ktx_add_log(
 
     event_dict["ktx_id"] = ctx.ktx_id()
 
-    data_dict = ctx.get_data()
+    if cache and isinstance(ctx, Context) and ctx._data_by_set:
+        # fields are rendered once per context version, so values must not
+        # be mutated in place without calling ctx.set() again; contexts
+        # overriding get_data() are rendered every time
+        event_dict.update(
+            ctx.memoize(
+                (_render_data, log_private, data_key_prefix, lazy),
+                lambda data: _render_data({}, data, log_private, data_key_prefix),
+                lazy=lazy,
+            )
+        )
+        return event_dict
+
+    if lazy != "force" and isinstance(ctx, Context):
+        data = resolve_lazy(ctx.peek_data(), lazy)
+    else:
+        data = ctx.get_data()
+
+    _render_data(event_dict, data, log_private, data_key_prefix)
+    return event_dict
+
 
+def _render_data(
+    out: MutableMapping[str, Any],
+    data_dict: Mapping[str, Any],
+    log_private: bool,
+    data_key_prefix: str,
+) -> MutableMapping[str, Any]:
     if data_dict:
         data_dict_iter: Iterator[tuple[str, Any]] | ItemsView[str, Any]
         if not log_private:
@@ -34,9 +80,9 @@ def ktx_add_log(
 
         for k, v in data_dict_iter:
             if v is not None:
-                event_dict[f"{data_key_prefix}{k}"] = str(v)
+                out[f"{data_key_prefix}{k}"] = str(v)
 
-    return event_dict
+    return out
 
 
 def ktx_add_user_log(
@@ -65,3 +111,269 @@ def ktx_add_user_log(
         event_dict[f"{user_key_prefix}ip_address"] = val
 
     return event_dict
+
+
+# KtxLogProcessor caches prefixed names of at most this many context keys
+_MAX_CACHED_NAMES = 1024
+
+
+class KtxLogFilter(logging.Filter):
+    # Adds ktx_id (None without a context), context data and user fields,
+    # named as by ktx_add_log and ktx_add_user_log, to stdlib log records
+    # passing through a logger or a handler. Records below their level are
+    # dropped before filters run. Context fields are rendered once per
+    # context version. user_key_prefix=None disables user fields. The fields
+    # replace attributes of the same name, including ones passed in `extra`.
+
+    def __init__(
+        self,
+        name: str = "",
+        *,
+        log_private: bool = False,
+        data_key_prefix: str = "data_",
+        user_key_prefix: str | None = "user_",
+        lazy: LazyPolicy = "force",
+    ):
+        super().__init__(name)
+        self._log_private = log_private
+        self._data_key_prefix = data_key_prefix
+        self._user_key_prefix = user_key_prefix
+        self._lazy = lazy
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not super().filter(record):
+            return False
+
+        _enrich_record(
+            record,
+            self._log_private,
+            self._data_key_prefix,
+            self._user_key_prefix,
+            self._lazy,
+        )
+        return True
+
+
+class KtxLogRecordFactory:
+    # Adds the same fields as KtxLogFilter to every record when it is
+    # created, which happens only after the logger's level check:
+    #
+    #     logging.setLogRecordFactory(KtxLogRecordFactory())
+    #
+    # Logger.makeRecord sets `extra` on the record after creating it and
+    # raises KeyError for attributes the record has already, so keys passed
+    # in `extra` are left out and the caller's values win.
+    __slots__ = [
+        "_factory",
+        "_log_private",
+        "_data_key_prefix",
+        "_user_key_prefix",
+        "_lazy",
+    ]
+
+    def __init__(
+        self,
+        factory: Callable[..., logging.LogRecord] | None = None,
+        *,
+        log_private: bool = False,
+        data_key_prefix: str = "data_",
+        user_key_prefix: str | None = "user_",
+        lazy: LazyPolicy = "force",
+    ):
+        self._factory = factory or logging.getLogRecordFactory()
+        self._log_private = log_private
+        self._data_key_prefix = data_key_prefix
+        self._user_key_prefix = user_key_prefix
+        self._lazy = lazy
+
+    def __call__(self, *args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = self._factory(*args, **kwargs)
+        # `extra` is not passed to record factories, it is a local of the
+        # calling makeRecord
+        frame = sys._getframe(1)
+        extra = frame.f_locals["extra"] if frame.f_code is _MAKE_RECORD_CODE else None
+        _enrich_record(
+            record,
+            self._log_private,
+            self._data_key_prefix,
+            self._user_key_prefix,
+            self._lazy,
+            extra,
+        )
+        return record
+
+
+_MAKE_RECORD_CODE = logging.Logger.makeRecord.__code__
+
+
+def _enrich_record(
+    record: logging.LogRecord,
+    log_private: bool,
+    data_key_prefix: str,
+    user_key_prefix: str | None,
+    lazy: LazyPolicy,
+    skip: Mapping[str, Any] | None = None,
+) -> None:
+    # fields named by a key of `skip` are not set
+    attrs: dict[str, Any] = {} if skip else record.__dict__
+    # formats may refer to %(ktx_id)s, so it is set even without a context
+    attrs["ktx_id"] = None
+    ktx_add_log(
+        attrs,
+        log_private=log_private,
+        data_key_prefix=data_key_prefix,
+        cache=True,
+        lazy=lazy,
+    )
+    if user_key_prefix is not None:
+        ktx_add_user_log(attrs, user_key_prefix=user_key_prefix)
+    if skip:
+        record.__dict__.update(
+            (key, value) for key, value in attrs.items() if key not in skip
+        )
+
+
+class KtxLogProcessor:
+    # structlog processor adding ktx_id, context data and user fields in one
+    # step. Options are compiled when it is built: prefixed key names are
+    # precomputed and context fields are rendered once per context version,
+    # so an event with an unchanged context costs about a dict update.
+    #
+    #     structlog.configure(processors=[KtxLogProcessor(), ...])
+    #
+    # include (allowlist, private keys included) and exclude (denylist)
+    # select context keys, formatters map keys to functions rendering their
+    # values instead of str().
+    #
+    # With delta=True only the first event of every context gets all its
+    # fields, later events get the fields set since the previous event of
+    # that context (see ktx.changes), cleared ones as None.
+    __slots__ = [
+        "_log_private",
+        "_data_key_prefix",
+        "_include",
+        "_exclude",
+        "_formatters",
+        "_user_keys",
+        "_lazy",
+        "_names",
+        "_tracker",
+    ]
+
+    def __init__(
+        self,
+        *,
+        log_private: bool = False,
+        data_key_prefix: str = "data_",
+        user_key_prefix: str | None = "user_",
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] = (),
+        formatters: Mapping[str, Callable[[Any], Any]] | None = None,
+        lazy: LazyPolicy = "force",
+        delta: bool = False,
+    ):
+        self._log_private = log_private
+        self._data_key_prefix = data_key_prefix
+        self._exclude = frozenset(exclude)
+        self._include = (
+            None
+            if include is None
+            else tuple(k for k in include if k not in self._exclude)
+        )
+        self._formatters = dict(formatters or {})
+        self._lazy = lazy
+        # prefixed names of context keys, computed once per key
+        self._names: dict[str, str] = {
+            k: f"{data_key_prefix}{k}" for k in self._include or ()
+        }
+        # user field names, None disables user fields
+        self._user_keys = (
+            None
+            if user_key_prefix is None
+            else tuple(
+                f"{user_key_prefix}{k}"
+                for k in ("id", "username", "email", "ip_address")
+            )
+        )
+        self._tracker: "ChangeTracker | None" = None
+        if delta:
+            # ktx.changes is only imported by processors that use it
+            from .changes import ChangeTracker
+
+            self._tracker = ChangeTracker(lazy=lazy)
+
+    def __call__(
+        self, logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+    ) -> MutableMapping[str, Any]:
+        ctx, user = get_current_scope()
+        if ctx is not None:
+            event_dict["ktx_id"] = ctx.ktx_id()
+            changes = self._tracker.read(ctx) if self._tracker is not None else None
+            if changes is not None and not changes.full:
+                if changes.data or changes.cleared:
+                    event_dict.update(self._render_changes(changes))
+            elif isinstance(ctx, Context) and ctx._data_by_set:
+                event_dict.update(ctx.memoize(self, self._render_data, lazy=self._lazy))
+            else:
+                event_dict.update(self._render_data(ctx.get_data()))
+
+        user_keys = self._user_keys
+        if user_keys is not None and user is not None:
+            id_key, username_key, email_key, ip_key = user_keys
+            if val := user.get_id():
+                event_dict[id_key] = str(val)
+            if val := user.get_username():
+                event_dict[username_key] = val
+            if val := user.get_email():
+                event_dict[email_key] = val
+            if val := user.get_ip_address():
+                event_dict[ip_key] = val
+
+        return event_dict
+
+    def _render_data(self, data: Mapping[str, Any]) -> dict[str, Any]:
+        rendered: dict[str, Any] = {}
+        if not data:
+            return rendered
+
+        formatters = self._formatters
+        names = self._names
+        if self._include is not None:
+            for k in self._include:
+                v = data.get(k)
+                if v is not None:
+                    formatter = formatters.get(k, str)
+                    rendered[names[k]] = formatter(v)
+            return rendered
+
+        exclude = self._exclude
+        log_private = self._log_private
+        for k, v in data.items():
+            if v is None or k in exclude or (not log_private and k.startswith("_")):
+                continue
+
+            name = names.get(k)
+            if name is None:
+                name = f"{self._data_key_prefix}{k}"
+                if len(names) < _MAX_CACHED_NAMES:
+                    names[k] = name
+
+            formatter = formatters.get(k, str)
+            rendered[name] = formatter(v)
+
+        return rendered
+
+    def _render_changes(self, changes: "ContextChanges") -> dict[str, Any]:
+        rendered = self._render_data(changes.data)
+        # fields set to None or removed are logged as None, so that the
+        # reader knows they no longer apply
+        cleared = [k for k, v in changes.data.items() if v is None]
+        cleared.extend(changes.cleared)
+        for k in cleared:
+            if self._include is not None:
+                if k not in self._include:
+                    continue
+            elif k in self._exclude or (not self._log_private and k.startswith("_")):
+                continue
+            rendered[f"{self._data_key_prefix}{k}"] = None
+        return rendered
@@ -0,0 +1,201 @@
+from collections.abc import Awaitable, Callable, Iterable, Mapping, MutableMapping
+from typing import Any
+
+from . import instrument
+from .abc import (
+    AbstractContext,
+    AbstractContextFactory,
+    AbstractContextUser,
+    AbstractContextUserFactory,
+)
+from .ctx import ContextFactory
+from .user import ContextUserFactory
+from .vars import bind_current_scope, unbind_current_scope
+
+AsgiScope = MutableMapping[str, Any]
+AsgiReceive = Callable[[], Awaitable[MutableMapping[str, Any]]]
+AsgiSend = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+AsgiApp = Callable[[AsgiScope, AsgiReceive, AsgiSend], Awaitable[None]]
+
+WsgiEnviron = dict[str, Any]
+WsgiStartResponse = Callable[..., Any]
+WsgiApp = Callable[[WsgiEnviron, WsgiStartResponse], Iterable[bytes]]
+
+DEFAULT_HEADER = "x-request-id"
+
+# longer inbound ids are ignored and a new one is made
+MAX_KTX_ID_LENGTH = 128
+
+_ASGI_SCOPE_TYPES = frozenset(("http", "websocket"))
+
+
+def asgi_request_data(scope: AsgiScope) -> Mapping[str, Any]:
+    if scope["type"] == "http":
+        return {"method": scope["method"], "path": scope["path"]}
+    return {"path": scope["path"]}
+
+
+def wsgi_request_data(environ: WsgiEnviron) -> Mapping[str, Any]:
+    return {"method": environ["REQUEST_METHOD"], "path": environ.get("PATH_INFO", "")}
+
+
+class _KtxMiddleware:
+    __slots__ = [
+        "_ctx_factory",
+        "_user_factory",
+        "_release_ctx",
+        "_release_user",
+        "_set_user_ip",
+    ]
+
+    def __init__(
+        self,
+        ctx_factory: AbstractContextFactory[Any] | None,
+        user_factory: AbstractContextUserFactory[Any] | None,
+        set_user_ip: bool,
+    ):
+        self._ctx_factory = ctx_factory or ContextFactory()
+        self._user_factory = user_factory or ContextUserFactory()
+        # pooled factories (see ktx.pool) get the instances back
+        self._release_ctx = getattr(self._ctx_factory, "release", None)
+        self._release_user = getattr(self._user_factory, "release", None)
+        self._set_user_ip = set_user_ip
+
+    def _create(
+        self,
+        ktx_id: str | None,
+        data: Mapping[str, Any] | None,
+        ip: str | None,
+    ) -> tuple[AbstractContext, AbstractContextUser]:
+        ctx = self._ctx_factory.create(ktx_id)
+        user = self._user_factory.create()
+        if data:
+            set_many = getattr(ctx, "set_many", None)
+            if set_many is not None:
+                set_many(data)
+            else:
+                for key, value in data.items():
+                    ctx.set(key, value)
+        if ip is not None:
+            user.set_ip_address(ip)
+        return ctx, user
+
+    def _release(self, ctx: AbstractContext, user: AbstractContextUser) -> None:
+        if self._release_ctx is not None:
+            self._release_ctx(ctx)
+        if self._release_user is not None:
+            self._release_user(user)
+
+
+class KtxAsgiMiddleware(_KtxMiddleware):
+    # ASGI middleware running every HTTP and WebSocket connection with a new
+    # context and user bound (other scopes, e.g. lifespan, are passed
+    # through). The ktx_id is taken from the `header` request header if
+    # present, otherwise made by the context factory; request_data(scope)
+    # is set on the context with one set_many() call and the client address
+    # becomes the user's ip address.
+    __slots__ = ["_app", "_header", "_request_data"]
+
+    def __init__(
+        self,
+        app: AsgiApp,
+        *,
+        ctx_factory: AbstractContextFactory[Any] | None = None,
+        user_factory: AbstractContextUserFactory[Any] | None = None,
+        header: str | None = DEFAULT_HEADER,
+        request_data: Callable[[AsgiScope], Mapping[str, Any]] | None = (
+            asgi_request_data
+        ),
+        set_user_ip: bool = True,
+    ):
+        super().__init__(ctx_factory, user_factory, set_user_ip)
+        self._app = app
+        # ASGI header names are lowercase bytes
+        self._header = header.lower().encode("latin-1") if header else None
+        self._request_data = request_data
+
+    async def __call__(
+        self, scope: AsgiScope, receive: AsgiReceive, send: AsgiSend
+    ) -> None:
+        if scope["type"] not in _ASGI_SCOPE_TYPES:
+            await self._app(scope, receive, send)
+            return
+
+        ktx_id = None
+        header = self._header
+        if header is not None:
+            for name, value in scope["headers"]:
+                if name == header:
+                    if 0 < len(value) <= MAX_KTX_ID_LENGTH:
+                        ktx_id = value.decode("latin-1")
+                    break
+
+        ip = None
+        if self._set_user_ip:
+            client = scope.get("client")
+            if client:
+                ip = client[0]
+
+        data = self._request_data(scope) if self._request_data is not None else None
+        ctx, user = self._create(ktx_id, data, ip)
+
+        token = bind_current_scope(ctx, user)
+        instrumentation = instrument.active
+        bound_at = instrumentation.on_bind() if instrumentation is not None else 0.0
+        try:
+            await self._app(scope, receive, send)
+        finally:
+            unbind_current_scope(token)
+            if instrumentation is not None:
+                instrumentation.on_unbind(ctx, bound_at)
+            self._release(ctx, user)
+
+
+class KtxWsgiMiddleware(_KtxMiddleware):
+    # WSGI counterpart of KtxAsgiMiddleware. The context and user are bound
+    # while the application is called: a response body produced lazily by
+    # the returned iterable runs without them.
+    __slots__ = ["_app", "_environ_key", "_request_data"]
+
+    def __init__(
+        self,
+        app: WsgiApp,
+        *,
+        ctx_factory: AbstractContextFactory[Any] | None = None,
+        user_factory: AbstractContextUserFactory[Any] | None = None,
+        header: str | None = DEFAULT_HEADER,
+        request_data: Callable[[WsgiEnviron], Mapping[str, Any]] | None = (
+            wsgi_request_data
+        ),
+        set_user_ip: bool = True,
+    ):
+        super().__init__(ctx_factory, user_factory, set_user_ip)
+        self._app = app
+        self._environ_key = (
+            "HTTP_" + header.upper().replace("-", "_") if header else None
+        )
+        self._request_data = request_data
+
+    def __call__(
+        self, environ: WsgiEnviron, start_response: WsgiStartResponse
+    ) -> Iterable[bytes]:
+        ktx_id = None
+        if self._environ_key is not None:
+            value = environ.get(self._environ_key)
+            if value and len(value) <= MAX_KTX_ID_LENGTH:
+                ktx_id = value
+
+        ip = (environ.get("REMOTE_ADDR") or None) if self._set_user_ip else None
+        data = self._request_data(environ) if self._request_data is not None else None
+        ctx, user = self._create(ktx_id, data, ip)
+
+        token = bind_current_scope(ctx, user)
+        instrumentation = instrument.active
+        bound_at = instrumentation.on_bind() if instrumentation is not None else 0.0
+        try:
+            return self._app(environ, start_response)
+        finally:
+            unbind_current_scope(token)
+            if instrumentation is not None:
+                instrumentation.on_unbind(ctx, bound_at)
+            self._release(ctx, user)
@@ -0,0 +1,180 @@
+import functools
+import threading
+from collections.abc import Sequence
+from typing import Any, NoReturn
+
+from .abc import AbstractContextDataAdapter, KtxIdMaker
+from .bind import ContextBind, ContextUserBind
+from .ctx import Context, ContextFactory, _begin_create
+from .user import ContextUser, ContextUserFactory
+
+DEFAULT_MAX_SIZE = 128
+
+# ktx_id of a context and adapters of a user in the pool, to detect
+# double release
+_RELEASED = "<released>"
+_RELEASED_ADAPTERS: list[AbstractContextDataAdapter] = []
+
+
+class _FreeList(threading.local):
+    # released instances of one factory, per thread (and so per event loop)
+    def __init__(self) -> None:
+        self.items: list[Any] = []
+
+
+class PooledContextFactory(ContextFactory):
+    # ContextFactory handing out recycled Context instances. A context goes
+    # back to the pool with release(), called on unbind when it is bound
+    # with bind(); nothing may keep using it afterwards (tasks spawned while
+    # it was bound included). With debug=True released contexts raise
+    # RuntimeError on any use until they are handed out again.
+    __slots__ = ["_free", "_max_size", "_debug"]
+
+    def __init__(
+        self,
+        *,
+        ktx_id_maker: KtxIdMaker | None = None,
+        inherit_data: bool = True,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        debug: bool = False,
+    ):
+        super().__init__(
+            ktx_id_maker=ktx_id_maker,
+            inherit_data=inherit_data,
+            adapters=adapters,
+        )
+        self._free = _FreeList()
+        self._max_size = max_size
+        self._debug = debug
+
+    def create(self, ktx_id: str | None = None) -> Context:
+        free = self._free.items
+        if not free:
+            return super().create(ktx_id)
+
+        ktx_id = _begin_create(ktx_id, self._ktx_id_maker)
+        ctx = free.pop()
+        if self._debug:
+            ctx.__class__ = Context
+        ctx._ktx_id = ktx_id
+        ctx._adapters = self._adapters
+        if self._inherit_data:
+            self._inherit(ctx)
+
+        return ctx
+
+    def bind(self, ktx_id: str | None = None) -> ContextBind[Context]:
+        # binds a new context, released to the pool on unbind
+        ctx = self.create(ktx_id)
+        return ContextBind(ctx, on_unbind=functools.partial(self.release, ctx))
+
+    def release(self, ctx: Context) -> None:
+        if type(ctx) is not Context or ctx._ktx_id is _RELEASED:
+            raise RuntimeError(f"{ctx!r} is already released or was not pooled")
+
+        ctx._ktx_id = _RELEASED
+        if ctx._data_shared:
+            # the dict is still used by a parent or a child context
+            ctx._data = {}
+            ctx._data_shared = False
+        else:
+            ctx._data.clear()
+        ctx._version = 0
+        ctx._snapshot = None
+        ctx._memo = None
+        ctx._has_lazy = False
+        ctx._adapters = None
+        # cursors of ktx.changes taken before must not match the next use,
+        # which may get the same ktx_id (e.g. a retried request id)
+        ctx._generation += 1
+
+        if self._debug:
+            ctx.__class__ = _ReleasedContext
+
+        free = self._free.items
+        if len(free) < self._max_size:
+            free.append(ctx)
+
+
+class PooledContextUserFactory(ContextUserFactory):
+    # ContextUserFactory handing out recycled ContextUser instances, see
+    # PooledContextFactory
+    __slots__ = ["_free", "_max_size", "_debug"]
+
+    def __init__(
+        self,
+        *,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+        debug: bool = False,
+    ):
+        super().__init__(adapters=adapters)
+        self._free = _FreeList()
+        self._max_size = max_size
+        self._debug = debug
+
+    def create(self) -> ContextUser:
+        free = self._free.items
+        if not free:
+            return super().create()
+
+        user = free.pop()
+        if self._debug:
+            user.__class__ = ContextUser
+        user._adapters = self._adapters
+        return user
+
+    def bind(self) -> ContextUserBind[ContextUser]:
+        # binds a new user, released to the pool on unbind
+        user = self.create()
+        return ContextUserBind(user, on_unbind=functools.partial(self.release, user))
+
+    def release(self, user: ContextUser) -> None:
+        if type(user) is not ContextUser or user._adapters is _RELEASED_ADAPTERS:
+            raise RuntimeError(f"{user!r} is already released or was not pooled")
+
+        user._id = None
+        user._email = None
+        user._username = None
+        user._ip = None
+        user._adapters = _RELEASED_ADAPTERS
+
+        if self._debug:
+            user.__class__ = _ReleasedContextUser
+
+        free = self._free.items
+        if len(free) < self._max_size:
+            free.append(user)
+
+
+def _raise_released(obj: object, name: str) -> NoReturn:
+    raise RuntimeError(
+        f"{type(obj).__mro__[1].__name__}.{name} used after release to the pool"
+    )
+
+
+class _ReleasedContext(Context):
+    # class of released contexts in debug mode; same layout as Context, so
+    # that __class__ can be switched back and forth
+    __slots__ = []
+
+    def __getattribute__(self, name: str) -> Any:
+        if name.startswith("__"):
+            return super().__getattribute__(name)
+        _raise_released(self, name)
+
+    def __repr__(self) -> str:
+        return "<released Context>"
+
+
+class _ReleasedContextUser(ContextUser):
+    __slots__ = []
+
+    def __getattribute__(self, name: str) -> Any:
+        if name.startswith("__"):
+            return super().__getattribute__(name)
+        _raise_released(self, name)
+
+    def __repr__(self) -> str:
+        return "<released ContextUser>"
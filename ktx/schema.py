@@ -0,0 +1,278 @@
+import operator
+from collections.abc import Callable, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, ClassVar, TypeVar, get_origin
+
+from immutabledict import immutabledict
+
+from .abc import AbstractContextDataAdapter, AbstractContextFactory, KtxIdMaker
+from .ctx import Context, _begin_create
+from .ktxid import ktxid_uuid4
+from .lazy import Lazy, evaluate_lazy, has_lazy
+from .vars import get_current_ctx_or_none
+
+SchemaContextT = TypeVar("SchemaContextT", bound="SchemaContext")
+
+# defaults are shared by all instances, so mutable ones are rejected
+_MUTABLE_DEFAULTS = (list, dict, set, bytearray)
+
+
+class SchemaContext(Context):
+    # Base for typed contexts declared with @context_schema: fields are
+    # stored in slots, other keys in the regular data dict ("overflow").
+    #
+    #     @context_schema
+    #     class RequestContext(SchemaContext):
+    #         path: str = ""
+    #         user_agent: str | None = None
+    #
+    # get()/set() route field keys to slots through per-class tables built by
+    # the decorator, get_data() merges fields and overflow into one cached
+    # snapshot.
+
+    __slots__: list[str] = []
+
+    # field name -> slot reader / writer
+    _schema_getters: ClassVar[Mapping[str, Callable[[Any], Any]]] = {}
+    _schema_setters: ClassVar[Mapping[str, Callable[[Any, Any], None]]] = {}
+    _schema_fields: ClassVar[tuple[str, ...]] = ()
+    _schema_defaults: ClassVar[Mapping[str, Any]] = {}
+
+    # get_data() merges fields and overflow, both written by set() only
+    _data_by_set = True
+
+    def __init__(
+        self,
+        ktx_id: str,
+        *,
+        data: Mapping[str, Any] | None = None,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+    ):
+        super().__init__(ktx_id, adapters=adapters)
+        self._schema_init(data)
+        if data and has_lazy(data):
+            self._has_lazy = True
+
+    # @context_schema generates _schema_init() setting the fields from data
+    # or defaults, and _schema_dict() merging the fields and the data dict,
+    # for the fields of every class
+    def _schema_init(self, data: Mapping[str, Any] | None) -> None:
+        if data:
+            self._data.update(data)
+
+    def _schema_dict(self) -> dict[str, Any]:
+        return dict(self._data)
+
+    def get_data(self) -> Mapping[str, Any]:
+        snapshot = self._snapshot
+        if snapshot is None:
+            data = self._schema_dict()
+            if self._has_lazy:
+                data = evaluate_lazy(data)
+            snapshot = self._snapshot = immutabledict(data)
+        return snapshot
+
+    def peek_data(self) -> Mapping[str, Any]:
+        return MappingProxyType(self._schema_dict())
+
+    def get(self, key: str) -> Any:
+        getter = self._schema_getters.get(key)
+        if getter is None:
+            return super().get(key)
+
+        value = getter(self)
+        if type(value) is Lazy:
+            return value.get()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        setter = self._schema_setters.get(key)
+        if setter is None:
+            super().set(key, value)
+            return
+
+        setter(self, value)
+        self._after_set(key, value)
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        if not data:
+            return
+
+        setters = self._schema_setters
+        overflow = None
+        for key, value in data.items():
+            setter = setters.get(key)
+            if setter is not None:
+                setter(self, value)
+            else:
+                if overflow is None:
+                    if self._data_shared:
+                        self._unshare_data()
+                    overflow = self._data
+                overflow[key] = value
+
+        self._after_write(data)
+
+
+def context_schema(cls: type[SchemaContextT]) -> type[SchemaContextT]:
+    # Rebuilds a SchemaContext subclass with a slot for every annotated
+    # field (like dataclass(slots=True)). Fields are read and written as
+    # attributes too; writes go through set() to keep snapshots, adapters
+    # and versions consistent.
+    if not issubclass(cls, SchemaContext):
+        raise TypeError(f"{cls.__name__} must be a subclass of SchemaContext")
+
+    own_fields = {
+        name: cls.__dict__.get(name)
+        for name, annotation in cls.__dict__.get("__annotations__", {}).items()
+        if not _is_class_var(annotation)
+    }
+    inherited_fields = cls._schema_fields
+    for name, default in own_fields.items():
+        if name in inherited_fields:
+            raise ValueError(f"field {name!r} is already declared in a base schema")
+        if hasattr(SchemaContext, name):
+            raise ValueError(f"field {name!r} clashes with a Context attribute")
+        if isinstance(default, _MUTABLE_DEFAULTS):
+            raise ValueError(f"mutable default for field {name!r} is not allowed")
+
+    namespace = {
+        k: v
+        for k, v in cls.__dict__.items()
+        if k not in own_fields and k not in ("__dict__", "__weakref__")
+    }
+    namespace["__slots__"] = [_slot_name(name) for name in own_fields]
+    for name in own_fields:
+        namespace[name] = property(
+            operator.attrgetter(_slot_name(name)), _make_property_setter(name)
+        )
+
+    metaclass: type = type(cls)
+    new_cls = metaclass(cls.__name__, cls.__bases__, namespace)
+    _fix_class_cells(cls, new_cls)
+
+    # slot descriptors, including the ones of base schemas
+    slots = {name: getattr(new_cls, _slot_name(name)) for name in inherited_fields}
+    for name in own_fields:
+        slots[name] = new_cls.__dict__[_slot_name(name)]
+
+    fields = (*inherited_fields, *own_fields)
+    new_cls._schema_fields = fields
+    new_cls._schema_defaults = {**cls._schema_defaults, **own_fields}
+    new_cls._schema_getters = {
+        name: operator.attrgetter(_slot_name(name)) for name in fields
+    }
+    new_cls._schema_setters = {name: slots[name].__set__ for name in fields}
+    new_cls._schema_init = _make_init(new_cls)
+    new_cls._schema_dict = _make_dict(new_cls)
+    return new_cls
+
+
+class SchemaContextFactory(AbstractContextFactory[SchemaContextT]):
+    # ContextFactory for SchemaContext classes; inherited parent data is
+    # routed to fields and overflow like any other data.
+    __slots__ = [
+        "_context_class",
+        "_ktx_id_maker",
+        "_inherit_data",
+        "_adapters",
+    ]
+
+    def __init__(
+        self,
+        context_class: type[SchemaContextT],
+        *,
+        ktx_id_maker: KtxIdMaker | None = None,
+        inherit_data: bool = True,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+    ):
+        self._context_class = context_class
+        self._ktx_id_maker = ktx_id_maker or ktxid_uuid4
+        self._inherit_data = inherit_data
+        self._adapters = adapters
+
+    def create(self, ktx_id: str | None = None) -> SchemaContextT:
+        ktx_id = _begin_create(ktx_id, self._ktx_id_maker)
+        data = None
+        if self._inherit_data:
+            parent_ctx = get_current_ctx_or_none()
+            if parent_ctx is not None:
+                data = parent_ctx.get_data()
+
+        return self._context_class(ktx_id, data=data, adapters=self._adapters)
+
+
+def _slot_name(name: str) -> str:
+    return f"_f_{name}"
+
+
+def _make_property_setter(name: str) -> Callable[[SchemaContext, Any], None]:
+    def setter(ctx: SchemaContext, value: Any) -> None:
+        ctx.set(name, value)
+
+    return setter
+
+
+def _make_init(cls: type[SchemaContext]) -> Callable[..., None]:
+    # Plain attribute stores are much cheaper than a loop over the fields,
+    # so the code is generated (as dataclasses do). Data with field keys
+    # only, the usual case, needs no overflow pass.
+    fields = cls._schema_fields
+    with_data = "\n".join(
+        f"        self.{_slot_name(name)} = get({name!r}, _defaults[{name!r}])"
+        for name in fields
+    )
+    defaults = "\n".join(
+        f"        self.{_slot_name(name)} = _defaults[{name!r}]" for name in fields
+    )
+    source = f"""
+def _schema_init(self, data):
+    if data:
+        get = data.get
+{with_data or "        pass"}
+        if not data.keys() <= _fields:
+            overflow = self._data
+            for key, value in data.items():
+                if key not in _fields:
+                    overflow[key] = value
+    else:
+{defaults or "        pass"}
+"""
+    return _compile(
+        source,
+        "_schema_init",
+        {"_defaults": dict(cls._schema_defaults), "_fields": frozenset(fields)},
+    )
+
+
+def _make_dict(cls: type[SchemaContext]) -> Callable[..., dict[str, Any]]:
+    items = "".join(
+        f"{name!r}: self.{_slot_name(name)}, " for name in cls._schema_fields
+    )
+    source = f"""
+def _schema_dict(self):
+    return {{**self._data, {items}}}
+"""
+    return _compile(source, "_schema_dict", {})
+
+
+def _compile(source: str, name: str, namespace: dict[str, Any]) -> Callable[..., Any]:
+    exec(source, namespace)  # noqa: S102
+    return namespace[name]
+
+
+def _is_class_var(annotation: Any) -> bool:
+    if isinstance(annotation, str):
+        return annotation.startswith(("ClassVar", "typing.ClassVar"))
+    return annotation is ClassVar or get_origin(annotation) is ClassVar
+
+
+def _fix_class_cells(old_cls: type, new_cls: type) -> None:
+    # zero-argument super() in methods refers to the class through a
+    # __class__ cell, which still points to the class being replaced
+    for value in new_cls.__dict__.values():
+        func = getattr(value, "fget", value)
+        func = getattr(func, "__func__", func)
+        for cell in getattr(func, "__closure__", None) or ():
+            if cell.cell_contents is old_cls:
+                cell.cell_contents = new_cls
@@ -0,0 +1,196 @@
+import asyncio
+from collections.abc import Callable, Coroutine, Generator, Hashable, Mapping
+from typing import Any, TypeVar
+
+from .abc import AbstractContext, AbstractContextFactory
+from .ctx import Context, ContextFactory
+from .lazy import LazyPolicy
+from .vars import (
+    bind_current_ctx,
+    bind_current_scope,
+    get_current_scope,
+    unbind_current_ctx,
+    unbind_current_scope,
+)
+
+T = TypeVar("T")
+
+Coro = Generator[Any, None, T] | Coroutine[Any, Any, T]
+TaskFactory = Callable[..., "asyncio.Future[Any]"]
+
+
+class TaskContext(Context):
+    # Context bound in a task created by KtxTaskFactory. It reads through to
+    # the parent context (the live one, parent writes are seen) until the
+    # first write, which creates the task's own context with the factory:
+    # a new ktx_id and the parent's data, shared copy-on-write. From then on
+    # the task reads and writes its own context only.
+    #
+    # None of the Context slots are used, every method goes to the target.
+    __slots__ = ["_parent", "_target", "_factory"]
+
+    # the target's, it is the one memoizing
+    @property
+    def _data_by_set(self) -> bool:  # type: ignore[override]
+        return getattr(self._target, "_data_by_set", False)
+
+    def __init__(self, parent: AbstractContext, factory: AbstractContextFactory[Any]):
+        self._parent = parent
+        self._target = parent
+        self._factory = factory
+
+    def is_detached(self) -> bool:
+        # True once the task has written and got its own context
+        return self._target is not self._parent
+
+    def ktx_id(self) -> str:
+        return self._target.ktx_id()
+
+    def version(self) -> int:
+        target = self._target
+        if isinstance(target, Context):
+            return target.version()
+        raise TypeError(f"{type(target).__name__} has no version()")
+
+    def get_data(self) -> Mapping[str, Any]:
+        return self._target.get_data()
+
+    def peek_data(self) -> Mapping[str, Any]:
+        target = self._target
+        if isinstance(target, Context):
+            return target.peek_data()
+        return target.get_data()
+
+    def memoize(
+        self,
+        key: Hashable,
+        make: Callable[[Mapping[str, Any]], T],
+        *,
+        lazy: LazyPolicy = "force",
+    ) -> T:
+        target = self._target
+        if isinstance(target, Context):
+            return target.memoize(key, make, lazy=lazy)
+        return make(target.get_data())
+
+    def get(self, key: str) -> Any:
+        return self._target.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self._detach().set(key, value)
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        if not data:
+            return
+
+        target = self._detach()
+        set_many = getattr(target, "set_many", None)
+        if set_many is not None:
+            set_many(data)
+        else:
+            for key, value in data.items():
+                target.set(key, value)
+
+    def _detach(self) -> AbstractContext:
+        target = self._target
+        if target is self._parent:
+            # the factory inherits the data of the current context
+            token = bind_current_ctx(target)
+            try:
+                target = self._target = self._factory.create()
+            finally:
+                unbind_current_ctx(token)
+        return target
+
+    def __repr__(self) -> str:
+        return f"<TaskContext of {self._target!r}>"
+
+
+class KtxTaskFactory:
+    # Event loop task factory binding a TaskContext over the current context
+    # in every new task, so that concurrent tasks never write to their
+    # parent's context. Creating a task costs one small object; the task's
+    # own context is only created on its first write. The current user is
+    # passed on as is.
+    #
+    # Only plain Context parents get a TaskContext: a subclass's own API
+    # (and get_current_ctx(SubClass)) would not work through one, so tasks
+    # share those as they do without the factory.
+    #
+    # A factory that was already installed (e.g. asyncio.eager_task_factory)
+    # may be wrapped, it is then used to create the tasks.
+    __slots__ = ["_ctx_factory", "_wrapped"]
+
+    def __init__(
+        self,
+        ctx_factory: AbstractContextFactory[Any] | None = None,
+        *,
+        wrapped: TaskFactory | None = None,
+    ):
+        self._ctx_factory = ctx_factory or ContextFactory()
+        self._wrapped = wrapped
+
+    def __call__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coro[T],
+        /,
+        **kwargs: Any,
+    ) -> "asyncio.Future[T]":
+        context = kwargs.get("context")
+        if context is not None:
+            # the task runs in the given context, so its scope is the parent;
+            # the child is bound in a copy, the caller's context is not changed
+            ctx, user = context.run(get_current_scope)
+            child = self._child(ctx)
+            if child is None:
+                return self._create(loop, coro, kwargs)
+
+            context = context.copy()
+            context.run(bind_current_scope, child, user)
+            return self._create(loop, coro, {**kwargs, "context": context})
+
+        ctx, user = get_current_scope()
+        child = self._child(ctx)
+        if child is None:
+            return self._create(loop, coro, kwargs)
+
+        # the task copies the current contextvars context when created
+        token = bind_current_scope(child, user)
+        try:
+            return self._create(loop, coro, kwargs)
+        finally:
+            unbind_current_scope(token)
+
+    def _child(self, ctx: AbstractContext | None) -> TaskContext | None:
+        if type(ctx) is TaskContext:
+            # tasks of a task that has not written share its parent
+            return TaskContext(ctx._target, self._ctx_factory)
+        if type(ctx) is not Context:
+            return None
+        return TaskContext(ctx, self._ctx_factory)
+
+    def _create(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        coro: Coro[T],
+        kwargs: dict[str, Any],
+    ) -> "asyncio.Future[T]":
+        if self._wrapped is not None:
+            return self._wrapped(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+
+def install_task_factory(
+    loop: asyncio.AbstractEventLoop | None = None,
+    *,
+    ctx_factory: AbstractContextFactory[Any] | None = None,
+) -> KtxTaskFactory:
+    # installs KtxTaskFactory on the loop (the running one by default),
+    # wrapping the loop's current task factory if there is one
+    if loop is None:
+        loop = asyncio.get_running_loop()
+
+    factory = KtxTaskFactory(ctx_factory, wrapped=loop.get_task_factory())
+    loop.set_task_factory(factory)
+    return factory
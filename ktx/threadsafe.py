@@ -0,0 +1,153 @@
+import threading
+from collections.abc import Callable, Hashable, Mapping, Sequence
+from types import MappingProxyType
+from typing import Any, TypeVar
+
+from .abc import AbstractContextDataAdapter
+from .ctx import Context, ContextFactory, _begin_create
+from .lazy import Lazy, LazyPolicy, evaluate_lazy, has_lazy, resolve_lazy
+from .vars import get_current_ctx_or_none
+
+T = TypeVar("T")
+
+# (data, read-only view of data, version, has Lazy values); the data dict is
+# never changed once published, writers publish a new state
+_State = tuple[dict[str, Any], Mapping[str, Any], int, bool]
+
+
+class ThreadSafeContext(Context):
+    # Context safe to share between threads without the GIL (free-threaded
+    # CPython). Readers never lock: get(), get_data() and version() read one
+    # immutable state published by writers, so they always see the data of
+    # a single version. Writers serialize on a lock of this context only,
+    # adapters are called under it and so receive writes in data order.
+    #
+    # Every write copies the data (O(number of keys)), get_data() is O(1).
+    # None of the Context slots but _ktx_id, _adapters and _generation are
+    # used.
+    __slots__ = ["_lock", "_state", "_evaluated", "_memo_state"]
+
+    # get_data() is the published state, written by set() only
+    _data_by_set = True
+
+    def __init__(
+        self,
+        ktx_id: str,
+        *,
+        data: Mapping[str, Any] | None = None,
+        adapters: Sequence[AbstractContextDataAdapter] | None = None,
+    ):
+        self._ktx_id = ktx_id
+        self._adapters = adapters
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._init_state(dict(data) if data is not None else {})
+
+    def _init_state(self, data: dict[str, Any]) -> None:
+        # data must not be changed afterwards
+        self._state: _State = (data, MappingProxyType(data), 0, has_lazy(data))
+        # (data, snapshot) with Lazy values evaluated
+        self._evaluated: tuple[dict[str, Any], Mapping[str, Any]] | None = None
+        # (data, memoized values) of the last data memoize() was called for
+        self._memo_state: tuple[dict[str, Any], dict[Hashable, Any]] | None = None
+
+    def version(self) -> int:
+        return self._state[2]
+
+    def get_data(self) -> Mapping[str, Any]:
+        return self._snapshot_of(self._state)
+
+    def peek_data(self) -> Mapping[str, Any]:
+        return self._state[1]
+
+    def memoize(
+        self,
+        key: Hashable,
+        make: Callable[[Mapping[str, Any]], T],
+        *,
+        lazy: LazyPolicy = "force",
+    ) -> T:
+        # concurrent first calls may each call make(), one value is kept
+        state = self._state
+        data = state[0]
+        if lazy != "force" and state[3]:
+            # evaluating a value changes the result but not the state
+            return make(resolve_lazy(data, lazy))
+
+        memo_state = self._memo_state
+        if memo_state is None or memo_state[0] is not data:
+            memo_state = self._memo_state = (data, {})
+
+        memo = memo_state[1]
+        if key in memo:
+            return memo[key]
+
+        value = memo[key] = make(self._snapshot_of(state))
+        return value
+
+    def get(self, key: str) -> Any:
+        value = self._state[0].get(key)
+        if type(value) is Lazy:
+            return value.get()
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            state = self._state
+            data = dict(state[0])
+            data[key] = value
+            self._state = (
+                data,
+                MappingProxyType(data),
+                state[2] + 1,
+                state[3] or type(value) is Lazy,
+            )
+            # the state holds the version and caches, only values are pushed
+            self._push(key, value)
+
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        if not data:
+            return
+
+        is_lazy = has_lazy(data)
+        with self._lock:
+            state = self._state
+            new_data = {**state[0], **data}
+            self._state = (
+                new_data,
+                MappingProxyType(new_data),
+                state[2] + 1,
+                state[3] or is_lazy,
+            )
+            self._push_many(data)
+
+    def _snapshot_of(self, state: _State) -> Mapping[str, Any]:
+        if not state[3]:
+            return state[1]
+
+        data = state[0]
+        evaluated = self._evaluated
+        if evaluated is None or evaluated[0] is not data:
+            evaluated = self._evaluated = (
+                data,
+                MappingProxyType(evaluate_lazy(data)),
+            )
+        return evaluated[1]
+
+
+class ThreadSafeContextFactory(ContextFactory):
+    # ContextFactory creating ThreadSafeContext instances; data inherited
+    # from another ThreadSafeContext is shared without copying
+    __slots__: list[str] = []
+
+    def create(self, ktx_id: str | None = None) -> ThreadSafeContext:
+        ktx_id = _begin_create(ktx_id, self._ktx_id_maker)
+        ctx = ThreadSafeContext(ktx_id, adapters=self._adapters)
+        if self._inherit_data:
+            parent_ctx = get_current_ctx_or_none()
+            if isinstance(parent_ctx, ThreadSafeContext):
+                ctx._init_state(parent_ctx._state[0])
+            elif parent_ctx is not None:
+                ctx._init_state(dict(parent_ctx.get_data()))
+
+        return ctx
@@ -1,12 +1,21 @@
-from collections.abc import Sequence
+from collections.abc import Mapping, Sequence
 from typing import Any
 
+from ._dispatch import adapters_set_many
 from .abc import (
     AbstractContextDataAdapter,
     AbstractContextUser,
     AbstractContextUserFactory,
 )
 
+# keys passed to adapters -> ContextUser attributes
+_USER_FIELDS = {
+    "id": "_id",
+    "email": "_email",
+    "username": "_username",
+    "ip_address": "_ip",
+}
+
 
 class ContextUser(AbstractContextUser):
     __slots__ = [
@@ -59,6 +68,19 @@ class ContextUser(AbstractContextUser):
         self._ip = value
         self._post_apply_user_key("ip_address", value)
 
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        # sets several fields (keyed as for adapters: id, email, username,
+        # ip_address) and notifies every adapter once for the whole batch
+        unknown = data.keys() - _USER_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"unknown user fields: {sorted(unknown)}")
+
+        for key, value in data.items():
+            setattr(self, _USER_FIELDS[key], value)
+
+        if data and self._adapters is not None:
+            adapters_set_many(self._adapters, data)
+
     def _post_apply_user_key(self, key: str, value: Any):
         if self._adapters is not None:
             for adapter in self._adapters:
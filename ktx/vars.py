@@ -1,30 +1,72 @@
+from __future__ import annotations
+
 from contextvars import ContextVar, Token
-from typing import TypeVar, overload
+from typing import TYPE_CHECKING, TypeVar, overload
+
+if TYPE_CHECKING:
+    # only annotations need the protocols, so reading the current context
+    # does not import ktx.abc
+    from .abc import AbstractContext, AbstractContextUser
+
+Scope = tuple["AbstractContext | None", "AbstractContextUser | None"]
+
+_EMPTY_SCOPE: Scope = (None, None)
+
+# The current context and user are kept together, so that binding or
+# reading both of them takes a single ContextVar operation
+_CurrentScope: ContextVar[Scope] = ContextVar("CurrentScope", default=_EMPTY_SCOPE)
+
+
+def bind_current_scope(
+    ctx: AbstractContext | None, user: AbstractContextUser | None
+) -> Token:
+    return _CurrentScope.set((ctx, user))
 
-from .abc import AbstractContext, AbstractContextUser
 
-_CurrentCtx: ContextVar = ContextVar("CurrentCtx")
-_CurrentCtxUser: ContextVar = ContextVar("CurrentCtxUser")
+def unbind_current_scope(token: Token):
+    return _CurrentScope.reset(token)
 
 
 def bind_current_ctx(ctx: AbstractContext) -> Token:
-    return _CurrentCtx.set(ctx)
+    return _CurrentScope.set((ctx, _CurrentScope.get()[1]))
 
 
 def unbind_current_ctx(token: Token):
-    return _CurrentCtx.reset(token)
+    prev_ctx, prev_user = _previous_scope(token)
+    user = _CurrentScope.get()[1]
+    if user is prev_user:
+        # the user has not been rebound since, reset() restores both
+        return _CurrentScope.reset(token)
+
+    _CurrentScope.set((prev_ctx, user))
 
 
 def bind_current_ctx_user(user: AbstractContextUser) -> Token:
-    return _CurrentCtxUser.set(user)
+    return _CurrentScope.set((_CurrentScope.get()[0], user))
 
 
 def unbind_current_ctx_user(token: Token):
-    return _CurrentCtxUser.reset(token)
+    prev_ctx, prev_user = _previous_scope(token)
+    ctx = _CurrentScope.get()[0]
+    if ctx is prev_ctx:
+        return _CurrentScope.reset(token)
+
+    _CurrentScope.set((ctx, prev_user))
+
+
+def _previous_scope(token: Token) -> Scope:
+    old_value = token.old_value
+    if old_value is Token.MISSING:
+        return _EMPTY_SCOPE
+    return old_value
+
+
+def get_current_scope() -> Scope:
+    return _CurrentScope.get()
 
 
-ContextT = TypeVar("ContextT", bound=AbstractContext)
-ContextUserT = TypeVar("ContextUserT", bound=AbstractContextUser)
+ContextT = TypeVar("ContextT", bound="AbstractContext")
+ContextUserT = TypeVar("ContextUserT", bound="AbstractContextUser")
 
 
 @overload
@@ -38,7 +80,7 @@ def get_current_ctx_or_none(tp: type[ContextT] | None = None) -> ContextT | None
 def get_current_ctx_or_none(
     tp: type[ContextT] | None = None,
 ) -> ContextT | AbstractContext | None:
-    return _CurrentCtx.get(None)
+    return _CurrentScope.get()[0]
 
 
 @overload
@@ -75,7 +117,7 @@ def get_current_ctx_user_or_none(
 def get_current_ctx_user_or_none(
     tp: type[ContextUserT] | None = None,
 ) -> ContextUserT | AbstractContextUser | None:
-    return _CurrentCtxUser.get(None)
+    return _CurrentScope.get()[1]
 
 
 @overload
@@ -1,3 +1,6 @@
+from collections.abc import Mapping
+from typing import Any
+
 import pytest
 from sentry_sdk import isolation_scope, new_scope
 
@@ -7,3 +10,29 @@ def sentry_scope():
     with isolation_scope():
         with new_scope():
             yield
+
+
+class RecordingAdapter:
+    # context data adapter recording its calls as ("set", key, value)
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def set(self, key: str, value: Any) -> None:
+        self.calls.append(("set", key, value))
+
+    @property
+    def data(self) -> dict[str, Any]:
+        # the last value received for every key
+        data: dict[str, Any] = {}
+        for call in self.calls:
+            if call[0] == "set":
+                data[call[1]] = call[2]
+            else:
+                data.update(call[1])
+        return data
+
+
+class RecordingBulkAdapter(RecordingAdapter):
+    # also implements set_many, recorded as ("set_many", data)
+    def set_many(self, data: Mapping[str, Any]) -> None:
+        self.calls.append(("set_many", dict(data)))
@@ -0,0 +1,229 @@
+import asyncio
+import os
+import threading
+from typing import Any
+
+import pytest
+
+from ktx import ctx_bind
+from ktx.adapters.background import AsyncioDispatchAdapter, ThreadDispatchAdapter
+from ktx.ctx import Context
+from tests.conftest import RecordingAdapter
+
+
+class _BlockingAdapter(RecordingAdapter):
+    def __init__(self):
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def set(self, key: str, value: Any) -> None:
+        self.entered.set()
+        self.release.wait(5)
+        super().set(key, value)
+
+
+class TestThreadDispatchAdapter:
+    def test_dispatch(self):
+        adapter = RecordingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter)
+        ctx = Context("id1", adapters=[dispatcher])
+
+        ctx.set("attr1", "val1")
+        ctx.set_many({"attr2": "val2", "attr3": "val3"})
+
+        assert dispatcher.flush(5)
+        assert adapter.data == {"attr1": "val1", "attr2": "val2", "attr3": "val3"}
+        assert dispatcher.dispatched == 3
+        dispatcher.close(5)
+
+    def test_coalesce(self):
+        adapter = _BlockingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter)
+
+        dispatcher.set("first", 1)
+        assert adapter.entered.wait(5)
+
+        for i in range(10):
+            dispatcher.set("attr", i)
+
+        adapter.release.set()
+        assert dispatcher.flush(5)
+
+        assert adapter.data == {"first": 1, "attr": 9}
+        assert len(adapter.calls) == 2
+        assert dispatcher.coalesced == 9
+        dispatcher.close(5)
+
+    def test_drop(self):
+        adapter = _BlockingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter, maxsize=2, overflow="drop")
+
+        dispatcher.set("first", 1)
+        assert adapter.entered.wait(5)
+
+        dispatcher.set_many({"attr1": 1, "attr2": 2, "attr3": 3})
+        dispatcher.set("attr1", 10)
+
+        adapter.release.set()
+        assert dispatcher.flush(5)
+
+        assert adapter.data == {"first": 1, "attr1": 10, "attr2": 2}
+        assert dispatcher.dropped == 1
+        dispatcher.close(5)
+
+    def test_block(self):
+        adapter = _BlockingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter, maxsize=1, overflow="block")
+
+        dispatcher.set("first", 1)
+        assert adapter.entered.wait(5)
+        dispatcher.set("attr1", 1)
+
+        producer = threading.Thread(target=dispatcher.set, args=("attr2", 2))
+        producer.start()
+        producer.join(0.1)
+        assert producer.is_alive()
+
+        adapter.release.set()
+        producer.join(5)
+        assert dispatcher.flush(5)
+
+        assert adapter.data == {"first": 1, "attr1": 1, "attr2": 2}
+        assert dispatcher.dropped == 0
+        dispatcher.close(5)
+
+    def test_errors(self):
+        class _FailingAdapter:
+            def set(self, key: str, value: Any) -> None:
+                raise RuntimeError("failed")
+
+        dispatcher = ThreadDispatchAdapter(_FailingAdapter())
+        dispatcher.set("attr1", 1)
+
+        assert dispatcher.flush(5)
+        assert dispatcher.errors == 1
+        dispatcher.close(5)
+
+    def test_flush_on_unbind(self):
+        adapter = RecordingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter)
+
+        with ctx_bind(
+            Context("id1", adapters=[dispatcher]), on_unbind=dispatcher.flush
+        ) as ctx:
+            ctx.set("attr1", "val1")
+
+        assert adapter.data == {"attr1": "val1"}
+        dispatcher.close(5)
+
+    def test_closed(self):
+        adapter = RecordingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter)
+        dispatcher.set("attr1", 1)
+        dispatcher.close(5)
+
+        dispatcher.set("attr2", 2)
+        dispatcher.set_many({"attr1": 10, "attr3": 3})
+
+        assert dispatcher.flush()
+        assert adapter.data == {"attr1": 1}
+        assert dispatcher.dropped == 3
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_fork(self):
+        adapter = _BlockingAdapter()
+        dispatcher = ThreadDispatchAdapter(adapter)
+        dispatcher.set("parent", 1)
+        assert adapter.entered.wait(5)
+        dispatcher.set("queued", 2)  # pending while the worker is busy
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            adapter.release.set()
+            dispatcher.set("child", 3)
+            ok = dispatcher.flush(5) and adapter.data == {"child": 3}
+            os._exit(0 if ok else 1)
+
+        _, status = os.waitpid(pid, 0)
+        adapter.release.set()
+        assert dispatcher.flush(5)
+        dispatcher.close(5)
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert adapter.data == {"parent": 1, "queued": 2}
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            ThreadDispatchAdapter(RecordingAdapter(), maxsize=0)
+
+        with pytest.raises(ValueError):
+            ThreadDispatchAdapter(RecordingAdapter(), overflow="wait")  # type: ignore[arg-type]
+
+
+class TestAsyncioDispatchAdapter:
+    def test_dispatch(self):
+        adapter = RecordingAdapter()
+
+        async def main():
+            dispatcher = AsyncioDispatchAdapter(adapter)
+            ctx = Context("id1", adapters=[dispatcher])
+
+            ctx.set("attr1", "val1")
+            ctx.set("attr1", "val2")
+            ctx.set_many({"attr2": "val3"})
+            assert adapter.data == {}
+
+            await asyncio.sleep(0)
+            assert adapter.data == {"attr1": "val2", "attr2": "val3"}
+            assert len(adapter.calls) == 2
+            assert dispatcher.coalesced == 1
+
+            ctx.set("attr3", "val4")
+            await dispatcher.close()
+            assert adapter.data["attr3"] == "val4"
+
+        asyncio.run(main())
+
+    def test_drop(self):
+        adapter = RecordingAdapter()
+
+        async def main():
+            dispatcher = AsyncioDispatchAdapter(adapter, maxsize=1)
+            dispatcher.set("attr1", 1)
+            dispatcher.set("attr2", 2)
+            await dispatcher.close()
+
+            assert adapter.data == {"attr1": 1}
+            assert dispatcher.dropped == 1
+
+        asyncio.run(main())
+
+    def test_block(self):
+        adapter = RecordingAdapter()
+
+        async def main():
+            dispatcher = AsyncioDispatchAdapter(adapter, maxsize=1, overflow="block")
+            dispatcher.set("attr1", 1)
+            dispatcher.set("attr2", 2)
+            assert adapter.data == {"attr1": 1}
+
+            await dispatcher.close()
+            assert adapter.data == {"attr1": 1, "attr2": 2}
+            assert dispatcher.dropped == 0
+
+        asyncio.run(main())
+
+    def test_flush_on_unbind(self):
+        adapter = RecordingAdapter()
+
+        async def main():
+            dispatcher = AsyncioDispatchAdapter(adapter)
+            ctx = Context("id1", adapters=[dispatcher])
+            with ctx_bind(ctx, on_unbind=dispatcher.flush):
+                ctx.set("attr1", "val1")
+
+            assert adapter.data == {"attr1": "val1"}
+            await dispatcher.close()
+
+        asyncio.run(main())
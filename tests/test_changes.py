@@ -0,0 +1,113 @@
+import gc
+
+from ktx.changes import ChangeTracker, changes_since
+from ktx.ctx import Context
+from ktx.lazy import Lazy
+from ktx.pool import PooledContextFactory
+from ktx.threadsafe import ThreadSafeContext
+
+
+class TestChangesSince:
+    def test_first_read_is_full(self):
+        ctx = Context("id", data={"a": 1})
+        changes = changes_since(ctx)
+        assert changes.full
+        assert changes.data == {"a": 1}
+        assert changes.cleared == frozenset()
+
+    def test_changes(self):
+        ctx = Context("id", data={"a": 1, "b": 2})
+        cursor = changes_since(ctx).cursor
+
+        unchanged = changes_since(ctx, cursor)
+        assert not unchanged.full
+        assert unchanged.data == {}
+        assert unchanged.cursor is cursor
+
+        ctx.set("b", 3)
+        ctx.set("c", None)
+        changes = changes_since(ctx, cursor)
+        assert not changes.full
+        assert changes.data == {"b": 3, "c": None}
+        assert changes_since(ctx, changes.cursor).data == {}
+
+        # older cursors still see everything since them
+        ctx.set("a", 0)
+        assert changes_since(ctx, cursor).data == {"a": 0, "b": 3, "c": None}
+        assert changes_since(ctx, changes.cursor).data == {"a": 0}
+
+    def test_cleared(self):
+        data = {"a": 1, "b": 2}
+
+        class _Ctx:
+            def ktx_id(self):
+                return "custom"
+
+            def get_data(self):
+                return data
+
+        ctx = _Ctx()
+        cursor = changes_since(ctx).cursor  # type: ignore[arg-type]
+        del data["a"]
+        data["b"] = 3
+        changes = changes_since(ctx, cursor)  # type: ignore[arg-type]
+        assert changes.data == {"b": 3}
+        assert changes.cleared == {"a"}
+
+    def test_other_context_is_full(self):
+        cursor = changes_since(Context("first", data={"a": 1})).cursor
+        changes = changes_since(Context("second", data={"a": 1}), cursor)
+        assert changes.full
+        assert changes.data == {"a": 1}
+
+    def test_recycled_context_is_full(self):
+        factory = PooledContextFactory()
+        ctx = factory.create("id")
+        ctx.set("a", 1)
+        cursor = changes_since(ctx).cursor
+        factory.release(ctx)
+
+        recycled = factory.create("id")
+        assert recycled is ctx
+        recycled.set("b", 2)
+        changes = changes_since(recycled, cursor)
+        assert changes.full
+        assert changes.data == {"b": 2}
+
+    def test_lazy(self):
+        ctx = Context("id")
+        ctx.set("lazy", Lazy(lambda: "value"))
+        changes = changes_since(ctx, lazy="skip")
+        assert changes.data == {}
+
+        ctx.get("lazy")
+        assert changes_since(ctx, changes.cursor, lazy="skip").data == {"lazy": "value"}
+
+    def test_thread_safe_context(self):
+        ctx = ThreadSafeContext("id", data={"a": 1})
+        cursor = changes_since(ctx).cursor
+        ctx.set("b", 2)
+        assert changes_since(ctx, cursor).data == {"b": 2}
+
+
+class TestChangeTracker:
+    def test_independent_consumers(self):
+        ctx = Context("id", data={"a": 1})
+        first = ChangeTracker()
+        second = ChangeTracker()
+
+        assert first.read(ctx).full
+        ctx.set("b", 2)
+        assert first.read(ctx).data == {"b": 2}
+        assert first.read(ctx).data == {}
+
+        assert second.read(ctx).data == {"a": 1, "b": 2}
+        ctx.set("a", 0)
+        assert second.read(ctx).data == {"a": 0}
+        assert first.read(ctx).data == {"a": 0}
+
+    def test_contexts_held_weakly(self):
+        tracker = ChangeTracker()
+        tracker.read(Context("id"))
+        gc.collect()
+        assert len(tracker._cursors) == 0
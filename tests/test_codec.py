@@ -0,0 +1,140 @@
+import base64
+import re
+import uuid
+
+import pytest
+
+from ktx.codec import (
+    KtxCodecError,
+    decode_ctx,
+    decode_ctx_text,
+    encode_ctx,
+    encode_ctx_text,
+)
+from ktx.ctx import Context, ContextFactory
+from ktx.user import ContextUser
+
+
+@pytest.fixture
+def ctx() -> Context:
+    return Context(
+        "some-ktx-id",
+        data={
+            "str": "значение",
+            "int": 1,
+            "float": 1.5,
+            "bool": True,
+            "none": None,
+            "obj": object(),
+            "_private": "value",
+        },
+    )
+
+
+@pytest.fixture
+def user() -> ContextUser:
+    return ContextUser(
+        id=uuid.UUID(int=1),
+        username="test",
+        email="test@example.com",
+        ip="127.0.0.1",
+    )
+
+
+class TestCodec:
+    def test_roundtrip(self, ctx: Context, user: ContextUser):
+        decoded_ctx, decoded_user = decode_ctx(encode_ctx(ctx, user))
+
+        assert isinstance(decoded_ctx, Context)
+        assert decoded_ctx.ktx_id() == "some-ktx-id"
+        assert decoded_ctx.get_data() == {
+            "str": "значение",
+            "int": 1,
+            "float": 1.5,
+            "bool": True,
+            "none": None,
+        }
+
+        assert isinstance(decoded_user, ContextUser)
+        assert decoded_user.get_id() == str(uuid.UUID(int=1))
+        assert decoded_user.get_username() == "test"
+        assert decoded_user.get_email() == "test@example.com"
+        assert decoded_user.get_ip_address() == "127.0.0.1"
+
+    def test_text_roundtrip(self, ctx: Context, user: ContextUser):
+        text = encode_ctx_text(ctx, user)
+        assert re.fullmatch(r"[A-Za-z0-9_-]+", text)
+
+        decoded_ctx, decoded_user = decode_ctx_text(text)
+        assert decoded_ctx is not None
+        assert decoded_ctx.get("str") == "значение"
+        assert decoded_user is not None
+        assert decoded_user.get_email() == "test@example.com"
+
+    def test_include_private(self, ctx: Context):
+        decoded_ctx, decoded_user = decode_ctx(encode_ctx(ctx, include_private=True))
+
+        assert decoded_ctx is not None
+        assert decoded_ctx.get("_private") == "value"
+        assert decoded_user is None
+
+    def test_only_user(self, user: ContextUser):
+        decoded_ctx, decoded_user = decode_ctx(encode_ctx(None, user))
+
+        assert decoded_ctx is None
+        assert decoded_user is not None
+        assert decoded_user.get_username() == "test"
+
+    def test_factories(self, ctx: Context):
+        calls = []
+
+        class _Adapter:
+            def set(self, key, value):
+                calls.append((key, value))
+
+        factory = ContextFactory(adapters=[_Adapter()])
+        decoded_ctx, _ = decode_ctx(encode_ctx(ctx), ctx_factory=factory)
+
+        assert decoded_ctx is not None
+        assert decoded_ctx.ktx_id() == "some-ktx-id"
+        assert ("int", 1) in calls
+
+    def test_max_size(self, ctx: Context):
+        ctx.set("big", "x" * 100)
+
+        with pytest.raises(KtxCodecError):
+            encode_ctx(ctx, max_size=100)
+
+        encoded = encode_ctx(ctx)
+        with pytest.raises(KtxCodecError):
+            decode_ctx(encoded, max_size=100)
+
+        with pytest.raises(KtxCodecError):
+            decode_ctx_text(encode_ctx_text(ctx), max_size=100)
+
+        assert decode_ctx(encoded, max_size=None)[0] is not None
+
+    @pytest.mark.parametrize(
+        "encoded",
+        [
+            b"",
+            b"\x02[null,null,null]",
+            b"\x01[",
+            b"\x01{}",
+            b"\x01[1,{},null]",
+            b'\x01["id",{"a":[1]},null]',
+            b'\x01["id",[],null]',
+            b"\x01[null,null,[1,2]]",
+            b"\x01[null,null,[{},null,null,null]]",
+        ],
+    )
+    def test_malformed(self, encoded: bytes):
+        with pytest.raises(KtxCodecError):
+            decode_ctx(encoded)
+
+        with pytest.raises(KtxCodecError):
+            decode_ctx_text(base64.urlsafe_b64encode(encoded).decode())
+
+    def test_malformed_text(self):
+        with pytest.raises(KtxCodecError):
+            decode_ctx_text("!!!")
@@ -29,6 +29,88 @@ class TestGeneralContext:
         with pytest.raises(TypeError):
             ctx.get_data()["qwe"] = "qweqwe"  # type: ignore[index]
 
+    def test_get_data_cached(self):
+        ctx = Context("some-ktx-id")
+        ctx.set("attr1", "val1")
+
+        data = ctx.get_data()
+        assert ctx.get_data() is data
+
+        ctx.set("attr2", "val2")
+        assert ctx.get_data() is not data
+        assert data == {"attr1": "val1"}
+        assert ctx.get_data() == {"attr1": "val1", "attr2": "val2"}
+
+    def test_version(self):
+        ctx = Context("some-ktx-id", data={"attr1": "val1"})
+        assert ctx.version() == 0
+
+        ctx.get_data()
+        assert ctx.version() == 0
+
+        ctx.set("attr1", "val2")
+        ctx.set("attr1", "val2")
+        assert ctx.version() == 2
+
+    def test_set_many(self):
+        ctx = Context("some-ktx-id", data={"attr1": "val1"})
+        data = ctx.get_data()
+
+        ctx.set_many({"attr1": "val2", "attr2": "val3"})
+        assert ctx.get_data() == {"attr1": "val2", "attr2": "val3"}
+        assert data == {"attr1": "val1"}
+        assert ctx.version() == 1
+
+        ctx.set_many({})
+        assert ctx.version() == 1
+
+    def test_set_many_adapters(self):
+        class _Adapter:
+            def __init__(self):
+                self.calls: list[tuple] = []
+
+            def set(self, key, value):
+                self.calls.append(("set", key, value))
+
+        class _BulkAdapter(_Adapter):
+            def set_many(self, data):
+                self.calls.append(("set_many", dict(data)))
+
+        adapter = _Adapter()
+        bulk_adapter = _BulkAdapter()
+        ctx = Context("some-ktx-id", adapters=[adapter, bulk_adapter])
+        ctx.set_many({"attr1": "val1", "attr2": "val2"})
+
+        assert adapter.calls == [("set", "attr1", "val1"), ("set", "attr2", "val2")]
+        assert bulk_adapter.calls == [
+            ("set_many", {"attr1": "val1", "attr2": "val2"}),
+        ]
+
+    def test_set_many_with_sentry(self):
+        ctx = Context("some-ktx-id", adapters=[SentryDataAdapter()])
+        ctx.set_many({"attr1": "val1", "_attr2": "val2"})
+
+        assert get_isolation_scope()._extras["attr1"] == "val1"
+        assert "_attr2" not in get_isolation_scope()._extras
+
+    def test_memoize(self):
+        ctx = Context("some-ktx-id")
+        ctx.set("attr1", "val1")
+
+        calls = []
+
+        def make(data):
+            calls.append(dict(data))
+            return len(data)
+
+        assert ctx.memoize("len", make) == 1
+        assert ctx.memoize("len", make) == 1
+        assert calls == [{"attr1": "val1"}]
+
+        ctx.set("attr2", "val2")
+        assert ctx.memoize("len", make) == 2
+        assert len(calls) == 2
+
     def test_ctx_manager(self):
         assert get_current_ctx_or_none() is None
 
@@ -94,6 +176,114 @@ class TestContextFactory:
 
             assert parent_ctx.get("attr2") == "val2"
 
+    def test_inherit_data_parent_write_isolated(self):
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(factory.create("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+
+            child_ctx = factory.create("id2")
+            parent_ctx.set("attr1", "val2")
+            parent_ctx.set("attr2", "val3")
+
+            assert child_ctx.get_data() == {"attr1": "val1"}
+            assert parent_ctx.get_data() == {"attr1": "val2", "attr2": "val3"}
+
+    def test_inherit_data_siblings_isolated(self):
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(factory.create("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+
+            child1 = factory.create("id2")
+            child2 = factory.create("id3")
+            child1.set("attr1", "child1")
+            child2.set("attr2", "child2")
+
+            assert parent_ctx.get_data() == {"attr1": "val1"}
+            assert child1.get_data() == {"attr1": "child1"}
+            assert child2.get_data() == {"attr1": "val1", "attr2": "child2"}
+
+    def test_inherit_data_set_many_isolated(self):
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(factory.create("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+            child_ctx = factory.create("id2")
+            child_ctx.set_many({"attr1": "val2", "attr2": "val3"})
+
+            assert parent_ctx.get_data() == {"attr1": "val1"}
+
+    def test_inherit_data_snapshot(self):
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(factory.create("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+            parent_data = parent_ctx.get_data()
+
+            child_ctx = factory.create("id2")
+            assert child_ctx.get_data() is parent_data
+
+            child_ctx.set("attr2", "val2")
+            assert child_ctx.get_data() == {"attr1": "val1", "attr2": "val2"}
+            assert parent_ctx.get_data() is parent_data
+
+    def test_inherit_data_nested(self):
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(factory.create("id1")) as ctx1:
+            ctx1.set("attr1", "val1")
+            with ctx_bind(factory.create("id2")) as ctx2:
+                with ctx_bind(factory.create("id3")) as ctx3:
+                    ctx3.set("attr2", "val2")
+                    assert ctx3.get_data() == {"attr1": "val1", "attr2": "val2"}
+
+                assert ctx2.get_data() == {"attr1": "val1"}
+
+        assert ctx1.get_data() == {"attr1": "val1"}
+
+    def test_inherit_data_from_subclass(self):
+        class _CustomContext(Context):
+            def get_data(self):
+                return {**super().get_data(), "custom": "value"}
+
+        factory = ContextFactory(inherit_data=True)
+
+        with ctx_bind(_CustomContext("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+            child_ctx = factory.create("id2")
+
+        assert child_ctx.get_data() == {"attr1": "val1", "custom": "value"}
+
+    def test_data_by_set(self):
+        class _CustomContext(Context):
+            def get_data(self):
+                return {**super().get_data(), "custom": "value"}
+
+        class _DeclaredContext(_CustomContext):
+            _data_by_set = True
+
+        class _ChildContext(_CustomContext):
+            pass
+
+        class _PlainContext(Context):
+            pass
+
+        assert Context._data_by_set
+        assert _PlainContext._data_by_set
+        assert not _CustomContext._data_by_set
+        assert not _ChildContext._data_by_set
+        assert _DeclaredContext._data_by_set
+
+    def test_no_inherit_data(self):
+        factory = ContextFactory(inherit_data=False)
+
+        with ctx_bind(factory.create("id1")) as parent_ctx:
+            parent_ctx.set("attr1", "val1")
+            child_ctx = factory.create("id2")
+
+        assert child_ctx.get_data() == {}
+
     def test_create_default(self):
         factory = ContextFactory()
         ctx = factory.create()
@@ -170,3 +360,15 @@ class TestContextBind:
 
         b.unbind()
         assert get_current_ctx_or_none() is None
+
+    def test_on_unbind(self):
+        calls = []
+
+        b = ctx_bind(Context("id1"), on_unbind=lambda: calls.append(1))
+        b.unbind()
+        assert calls == []
+
+        with b:
+            assert calls == []
+
+        assert calls == [1]
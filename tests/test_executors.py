@@ -0,0 +1,79 @@
+import uuid
+from typing import Any
+
+from ktx import (
+    ctx_bind,
+    ctx_user_bind,
+    get_current_ctx_or_none,
+    get_current_ctx_user_or_none,
+)
+from ktx.ctx import Context
+from ktx.executors import KtxProcessPoolExecutor, KtxThreadPoolExecutor
+from ktx.user import ContextUser
+
+
+def _current() -> tuple[Any, ...]:
+    ctx = get_current_ctx_or_none()
+    user = get_current_ctx_user_or_none()
+    return (
+        ctx.ktx_id() if ctx is not None else None,
+        dict(ctx.get_data()) if ctx is not None else None,
+        user.get_id() if user is not None else None,
+        user.get_email() if user is not None else None,
+    )
+
+
+def _add(a: int, *, b: int) -> int:
+    return a + b
+
+
+class TestKtxThreadPoolExecutor:
+    def test_propagate(self):
+        ctx = Context("id1", data={"attr1": "val1"})
+        user = ContextUser(id=42, email="test@example.com")
+
+        with KtxThreadPoolExecutor(2) as pool:
+            with ctx_bind(ctx), ctx_user_bind(user):
+                future = pool.submit(get_current_ctx_or_none)
+                user_future = pool.submit(get_current_ctx_user_or_none)
+
+            assert future.result() is ctx
+            assert user_future.result() is user
+
+            # worker threads do not keep the context after the call
+            assert pool.submit(_current).result() == (None, None, None, None)
+
+    def test_no_ctx(self):
+        with KtxThreadPoolExecutor(1) as pool:
+            assert pool.submit(_add, 1, b=2).result() == 3
+            assert pool.submit(_current).result() == (None, None, None, None)
+
+    def test_map(self):
+        ctx = Context("id1")
+        with KtxThreadPoolExecutor(2) as pool, ctx_bind(ctx):
+            assert (
+                list(pool.map(lambda _: get_current_ctx_or_none(), range(4)))
+                == [ctx] * 4
+            )
+
+
+class TestKtxProcessPoolExecutor:
+    def test_propagate(self):
+        ctx = Context(
+            "id1",
+            data={"attr1": "val1", "attr2": 2, "obj": object(), "_private": True},
+        )
+        user = ContextUser(id=uuid.UUID(int=1), email="test@example.com")
+
+        with KtxProcessPoolExecutor(1) as pool:
+            with ctx_bind(ctx), ctx_user_bind(user):
+                result = pool.submit(_current).result()
+
+            assert result == (
+                "id1",
+                {"attr1": "val1", "attr2": 2, "_private": True},
+                str(uuid.UUID(int=1)),
+                "test@example.com",
+            )
+            assert pool.submit(_current).result() == (None, None, None, None)
+            assert pool.submit(_add, 1, b=2).result() == 3
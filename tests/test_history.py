@@ -0,0 +1,141 @@
+import asyncio
+import sys
+
+import pytest
+
+from ktx import ctx_bind, get_current_ctx
+from ktx.ctx import Context, ContextFactory
+from ktx.history import (
+    SetHistory,
+    SetHistoryContextFactory,
+    SetRecord,
+    get_set_history,
+)
+from ktx.lazy import Lazy
+from ktx.tasks import install_task_factory
+from tests.conftest import RecordingAdapter
+
+
+class TestSetHistory:
+    def test_records(self):
+        history = SetHistory()
+        ctx = Context("id", adapters=[history])
+        ctx.set("a", 1)
+        ctx.set_many({"b": 2, "c": 3})
+        ctx.set("lazy", Lazy(lambda: 0))
+        ctx.set("a", 4)
+
+        records = history.snapshot()
+        assert [(r.key, r.value) for r in records] == [
+            ("a", 1),
+            ("b", 2),
+            ("c", 3),
+            ("a", 4),
+        ]
+        assert all(isinstance(r, SetRecord) for r in records)
+        assert records[1].time_ns == records[2].time_ns
+        times = [r.time_ns for r in records]
+        assert times == sorted(times)
+        assert {r.call_site for r in records} == {None}
+
+    def test_ring_buffer(self):
+        history = SetHistory(3)
+        for i in range(10):
+            history.set(f"k{i}", i)
+
+        assert [r.value for r in history.snapshot()] == [7, 8, 9]
+
+    def test_size(self):
+        with pytest.raises(ValueError):
+            SetHistory(0)
+        with pytest.raises(ValueError):
+            SetHistoryContextFactory(size=0)
+
+    def test_call_site(self):
+        history = SetHistory(call_site=True)
+        ctx = Context("id", adapters=[history])
+        ctx.set("a", 1)
+        line = sys._getframe().f_lineno - 1
+        ctx.set_many({"b": 2})
+
+        first, second = history.snapshot()
+        assert first.call_site == (__file__, line, "test_call_site")
+        assert second.call_site == (__file__, line + 2, "test_call_site")
+
+    def test_format(self):
+        history = SetHistory(call_site=True)
+        assert history.format() == ""
+
+        history.set("a", "value")
+        history.set("b", 2)
+        lines = history.format().splitlines()
+        assert lines[0].startswith("+0.000ms a='value' at ")
+        assert " b=2 at " in lines[1]
+        assert lines[1].endswith(" in test_format")
+
+
+class TestSetHistoryContextFactory:
+    def test_per_context(self):
+        adapter = RecordingAdapter()
+        factory = SetHistoryContextFactory(adapters=[adapter], size=2)
+        with ctx_bind(factory.create()) as parent:
+            parent.set("a", 1)
+            child = factory.create()
+            child.set("b", 2)
+            child.set("c", 3)
+            child.set("d", 4)
+
+        parent_history = get_set_history(parent)
+        child_history = get_set_history(child)
+        assert parent_history is not None
+        assert child_history is not None
+        assert [r.key for r in parent_history.snapshot()] == ["a"]
+        assert [r.key for r in child_history.snapshot()] == ["c", "d"]
+        assert adapter.calls == [
+            ("set", "a", 1),
+            ("set", "b", 2),
+            ("set", "c", 3),
+            ("set", "d", 4),
+        ]
+
+    def test_disabled(self):
+        ctx = ContextFactory().create()
+        assert ctx._adapters is None
+        assert get_set_history(ctx) is None
+        assert get_set_history(Context("id", adapters=[RecordingAdapter()])) is None
+
+    def test_dump_on_exception(self):
+        factory = SetHistoryContextFactory(call_site=True)
+        dumped = []
+        with ctx_bind(factory.create()) as ctx:
+            try:
+                ctx.set("step", "validate")
+                ctx.set("step", "save")
+                raise RuntimeError("failed")
+            except RuntimeError:
+                history = get_set_history(ctx)
+                assert history is not None
+                dumped = history.snapshot()
+
+        assert [r.value for r in dumped] == ["validate", "save"]
+
+    def test_task_context(self):
+        factory = SetHistoryContextFactory()
+
+        async def child():
+            ctx = get_current_ctx()
+            before = get_set_history(ctx)
+            ctx.set("child", 1)
+            return before, get_set_history(ctx)
+
+        async def main():
+            install_task_factory(ctx_factory=factory)
+            with ctx_bind(factory.create()) as parent:
+                parent.set("parent", 1)
+                before, after = await asyncio.create_task(child())
+            assert before is get_set_history(parent)
+            assert after is not None
+            assert after is not before
+            assert [r.key for r in after.snapshot()] == ["child"]
+
+        asyncio.run(main())
@@ -0,0 +1,63 @@
+import subprocess
+import sys
+
+import pytest
+
+import ktx
+from ktx import _meta, bind
+
+
+def _modules_after(code: str) -> set[str]:
+    # modules loaded by a fresh interpreter running `code`
+    out = subprocess.run(
+        [sys.executable, "-c", f"{code}\nimport sys; print(*sys.modules)"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(out.split())
+
+
+class TestLazyImports:
+    def test_import_ktx(self):
+        modules = _modules_after("import ktx")
+        assert {m for m in modules if m.startswith("ktx.")} == set()
+        assert "immutabledict" not in modules
+
+    def test_import_name(self):
+        modules = _modules_after("from ktx import get_current_ctx")
+        assert {m for m in modules if m.startswith("ktx.")} == {"ktx.vars"}
+
+    def test_bind_and_log(self):
+        modules = _modules_after("from ktx import ctx_bind\nimport ktx.log")
+        assert "inspect" not in modules
+        assert "uuid" not in modules
+        assert "ktx.changes" not in modules
+
+    def test_sentry_detected_on_use(self):
+        modules = _modules_after(
+            "import ktx._meta\n"
+            "assert 'has_sentry' not in vars(ktx._meta)\n"
+            "assert isinstance(ktx._meta.has_sentry, bool)\n"
+            "assert 'has_sentry' in vars(ktx._meta)"
+        )
+        assert "ktx._meta" in modules
+
+    def test_submodule_attributes(self):
+        modules = _modules_after(
+            "import ktx\n"
+            "assert ktx.abc.AbstractContext\n"
+            "assert ktx.vars.get_current_ctx is ktx.get_current_ctx\n"
+            "assert ktx.bind.ctx_bind is ktx.ctx_bind"
+        )
+        assert {"ktx.abc", "ktx.vars", "ktx.bind"} <= modules
+
+    def test_package_attributes(self):
+        assert ktx.scoped is bind.scoped
+        assert set(ktx.__all__) <= set(dir(ktx))
+        for name in ktx.__all__:
+            assert callable(getattr(ktx, name))
+        with pytest.raises(AttributeError):
+            ktx.missing  # noqa: B018
+        with pytest.raises(AttributeError):
+            _meta.missing  # noqa: B018
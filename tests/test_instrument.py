@@ -0,0 +1,132 @@
+from collections.abc import Iterator
+
+import pytest
+
+from ktx import ctx_bind
+from ktx.ctx import Context, ContextFactory
+from ktx.instrument import (
+    OTHER_KEYS,
+    Histogram,
+    Instrumentation,
+    disable_instrumentation,
+    enable_instrumentation,
+    get_instrumentation,
+)
+from ktx.lazy import Lazy
+
+
+@pytest.fixture
+def instrumentation() -> Iterator[Instrumentation]:
+    try:
+        yield enable_instrumentation()
+    finally:
+        disable_instrumentation()
+
+
+class TestInstrumentation:
+    def test_disabled_by_default(self):
+        assert get_instrumentation() is None
+
+    def test_enable_disable(self):
+        instrumentation = Instrumentation()
+        try:
+            assert enable_instrumentation(instrumentation) is instrumentation
+            assert get_instrumentation() is instrumentation
+        finally:
+            disable_instrumentation()
+        assert get_instrumentation() is None
+
+    def test_lifecycle_counts(self, instrumentation: Instrumentation):
+        factory = ContextFactory()
+        with ctx_bind(factory.create()) as ctx:
+            ctx.set("a", 1)
+            ctx.set("a", 2)
+            ctx.set_many({"b": "x", "c": "y"})
+            assert instrumentation.snapshot()["binds_active"] == 1
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["contexts_created"] == 1
+        assert snapshot["binds"] == 1
+        assert snapshot["unbinds"] == 1
+        assert snapshot["binds_active"] == 0
+        assert snapshot["sets"] == 4
+        assert snapshot["key_writes"] == {"a": 2, "b": 1, "c": 1}
+        assert snapshot["bind_duration_seconds"]["count"] == 1
+        assert snapshot["key_count_at_unbind"]["count"] == 1
+        assert snapshot["key_count_at_unbind"]["sum"] == 3
+        assert snapshot["value_size_bytes"]["count"] == 4
+
+    def test_lazy_not_evaluated(self, instrumentation: Instrumentation):
+        calls = []
+        with ctx_bind(ContextFactory().create()) as ctx:
+            ctx.set("lazy", Lazy(lambda: calls.append(1)))
+
+        assert calls == []
+        assert instrumentation.snapshot()["key_count_at_unbind"]["sum"] == 1
+
+    def test_nothing_recorded_when_disabled(self):
+        instrumentation = Instrumentation()
+        enable_instrumentation(instrumentation)
+        disable_instrumentation()
+
+        with ctx_bind(ContextFactory().create()) as ctx:
+            ctx.set("a", 1)
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["contexts_created"] == 0
+        assert snapshot["binds"] == 0
+        assert snapshot["sets"] == 0
+
+    def test_bind_started_before_disable_is_recorded(self):
+        instrumentation = enable_instrumentation()
+        try:
+            with ctx_bind(Context("id")):
+                disable_instrumentation()
+        finally:
+            disable_instrumentation()
+
+        assert instrumentation.snapshot()["unbinds"] == 1
+
+    def test_disabled_during_set_many(self):
+        class _Disabling(Instrumentation):
+            def on_set(self, key, value):
+                super().on_set(key, value)
+                disable_instrumentation()
+
+        instrumentation = enable_instrumentation(_Disabling())
+        try:
+            Context("id").set_many({"a": 1, "b": 2})
+        finally:
+            disable_instrumentation()
+
+        assert instrumentation.snapshot()["sets"] == 2
+
+    def test_key_writes_are_capped(self):
+        instrumentation = enable_instrumentation(Instrumentation(max_tracked_keys=2))
+        try:
+            ctx = Context("id")
+            for key in ("a", "b", "c", "d", "a"):
+                ctx.set(key, 1)
+        finally:
+            disable_instrumentation()
+
+        assert instrumentation.snapshot()["key_writes"] == {
+            "a": 2,
+            "b": 1,
+            OTHER_KEYS: 2,
+        }
+
+
+class TestHistogram:
+    def test_observe(self):
+        histogram = Histogram((1, 10))
+        for value in (0.5, 1, 5, 100):
+            histogram.observe(value)
+
+        assert histogram.snapshot() == {
+            "buckets": [1, 10],
+            "counts": [2, 1, 1],
+            "sum": 106.5,
+            "count": 4,
+            "max": 100,
+        }
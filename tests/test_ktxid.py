@@ -0,0 +1,71 @@
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ktx.ctx import ContextFactory
+from ktx.ktxid import ktxid_counter, ktxid_random, ktxid_uuid4, ktxid_uuid7
+
+MAKERS = [ktxid_uuid4, ktxid_random, ktxid_uuid7, ktxid_counter]
+
+
+@pytest.mark.parametrize("maker", MAKERS)
+class TestKtxIdMakers:
+    def test_format(self, maker):
+        ktx_id = maker()
+        assert len(ktx_id) == 32
+        int(ktx_id, 16)
+
+    def test_unique_in_threads(self, maker):
+        def make_many(_: int) -> list[str]:
+            return [maker() for _ in range(5000)]
+
+        with ThreadPoolExecutor(8) as pool:
+            ids = [i for chunk in pool.map(make_many, range(16)) for i in chunk]
+
+        assert len(set(ids)) == len(ids)
+
+    def test_factory(self, maker):
+        factory = ContextFactory(ktx_id_maker=maker)
+        assert factory.create().ktx_id() != factory.create().ktx_id()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    def test_unique_after_fork(self, maker):
+        maker()  # fill per-process state before forking
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            os.close(r)
+            os.write(w, maker().encode())
+            os._exit(0)
+
+        os.close(w)
+        with os.fdopen(r) as f:
+            child_id = f.read()
+        os.waitpid(pid, 0)
+
+        assert child_id
+        assert child_id != maker()
+
+
+class TestUuid7:
+    def test_uuid_version(self):
+        value = uuid.UUID(ktxid_uuid7())
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+
+    def test_time_sortable(self):
+        first = ktxid_uuid7()
+        time.sleep(0.002)
+        assert ktxid_uuid7() > first
+
+
+class TestUuid4:
+    def test_uuid_version(self):
+        ktx_id = ktxid_uuid4()
+        value = uuid.UUID(ktx_id)
+        assert value.version == 4
+        assert value.variant == uuid.RFC_4122
+        assert value.hex == ktx_id
@@ -0,0 +1,190 @@
+import threading
+import time
+
+import pytest
+
+from ktx.ctx import Context
+from ktx.lazy import PLACEHOLDER, Lazy, resolve_lazy
+from ktx.log import ktx_add_log
+from ktx.schema import SchemaContext, context_schema
+from tests.conftest import RecordingBulkAdapter
+
+
+class _Counter:
+    def __init__(self, value="value"):
+        self.calls = 0
+        self.value = value
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@context_schema
+class _SchemaContext(SchemaContext):
+    field: object = None
+
+
+class TestLazy:
+    def test_evaluated_once(self):
+        make = _Counter()
+        value = Lazy(make)
+        assert not value.is_evaluated()
+        assert repr(value) == PLACEHOLDER
+
+        assert value.get() == "value"
+        assert value.get() == "value"
+        assert value.is_evaluated()
+        assert make.calls == 1
+        assert repr(value) == "Lazy('value')"
+
+    def test_error_is_not_memoized(self):
+        calls = []
+
+        def make():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return "value"
+
+        value = Lazy(make)
+        with pytest.raises(RuntimeError):
+            value.get()
+
+        assert not value.is_evaluated()
+        assert value.get() == "value"
+
+    def test_threads(self):
+        make = _Counter()
+
+        def slow():
+            time.sleep(0.01)
+            return make()
+
+        value = Lazy(slow)
+        threads = [threading.Thread(target=value.get) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert make.calls == 1
+
+    def test_resolve(self):
+        evaluated = Lazy(lambda: 1)
+        evaluated.get()
+        data = {"a": evaluated, "b": Lazy(lambda: 2), "c": 3}
+
+        assert resolve_lazy(data, "force") == {"a": 1, "b": 2, "c": 3}
+        data["b"] = Lazy(lambda: 2)
+        assert resolve_lazy(data, "skip") == {"a": 1, "c": 3}
+        assert resolve_lazy(data, "placeholder") == {"a": 1, "b": PLACEHOLDER, "c": 3}
+
+        plain = {"c": 3}
+        assert resolve_lazy(plain, "skip") is plain
+
+
+class TestContextLazy:
+    def test_get(self):
+        make = _Counter()
+        ctx = Context("id")
+        ctx.set("key", Lazy(make))
+        assert make.calls == 0
+
+        assert ctx.get("key") == "value"
+        assert ctx.get("key") == "value"
+        assert make.calls == 1
+
+    def test_get_data(self):
+        make = _Counter()
+        ctx = Context("id", data={"key": Lazy(make), "other": 1})
+        assert make.calls == 0
+
+        assert ctx.get_data() == {"key": "value", "other": 1}
+        assert make.calls == 1
+        assert type(ctx.peek_data()["key"]) is Lazy
+
+    def test_adapters_skip_lazy(self):
+        adapter = RecordingBulkAdapter()
+        ctx = Context("id", adapters=[adapter])
+
+        ctx.set("key", Lazy(_Counter()))
+        ctx.set_many({"a": Lazy(_Counter()), "b": 1})
+        ctx.set_many({"c": Lazy(_Counter())})
+        assert adapter.calls == [("set_many", {"b": 1})]
+
+    def test_inherited(self):
+        make = _Counter()
+        parent = Context("parent")
+        parent.set("key", Lazy(make))
+        child = Context("child")
+        parent._share_data(child)
+
+        assert child.get_data() == {"key": "value"}
+        assert parent.get("key") == "value"
+        assert make.calls == 1
+
+    def test_schema_field(self):
+        make = _Counter()
+        adapter = RecordingBulkAdapter()
+        ctx = _SchemaContext("id", adapters=[adapter])
+        ctx.set("field", Lazy(make))
+        ctx.set("other", Lazy(make))
+        assert adapter.calls == []
+        assert ktx_add_log({}, ctx, lazy="placeholder") == {
+            "ktx_id": "id",
+            "data_field": PLACEHOLDER,
+            "data_other": PLACEHOLDER,
+        }
+
+        assert ctx.field is not None
+        assert ctx.get("field") == "value"
+        assert ctx.get_data() == {"field": "value", "other": "value"}
+        assert make.calls == 2
+
+
+class TestLogLazy:
+    @pytest.mark.parametrize("cache", [False, True])
+    def test_policies(self, cache: bool):
+        make = _Counter()
+        ctx = Context("id", data={"key": Lazy(make), "other": 1})
+
+        assert ktx_add_log({}, ctx, lazy="skip", cache=cache) == {
+            "ktx_id": "id",
+            "data_other": "1",
+        }
+        assert ktx_add_log({}, ctx, lazy="placeholder", cache=cache) == {
+            "ktx_id": "id",
+            "data_key": PLACEHOLDER,
+            "data_other": "1",
+        }
+        assert make.calls == 0
+
+        assert ktx_add_log({}, ctx, cache=cache) == {
+            "ktx_id": "id",
+            "data_key": "value",
+            "data_other": "1",
+        }
+        assert make.calls == 1
+
+    def test_cache_after_evaluation(self):
+        ctx = Context("id", data={"key": Lazy(_Counter())})
+        assert ktx_add_log({}, ctx, lazy="skip", cache=True) == {"ktx_id": "id"}
+
+        ctx.get("key")
+        assert ktx_add_log({}, ctx, lazy="skip", cache=True) == {
+            "ktx_id": "id",
+            "data_key": "value",
+        }
+
+    def test_cache_after_evaluation_in_child(self):
+        parent = Context("parent", data={"key": Lazy(_Counter())})
+        assert ktx_add_log({}, parent, lazy="skip", cache=True) == {"ktx_id": "parent"}
+        child = Context("child")
+        parent._share_data(child)
+
+        child.get("key")
+        assert ktx_add_log({}, parent, lazy="skip", cache=True) == {
+            "ktx_id": "parent",
+            "data_key": "value",
+        }
@@ -1,14 +1,33 @@
+import logging
 import uuid
+from collections.abc import Iterator
 
 import pytest
 
 from ktx import ctx_bind
 from ktx.bind import ctx_user_bind
 from ktx.ctx import Context
-from ktx.log import ktx_add_log, ktx_add_user_log
+from ktx.log import (
+    KtxLogFilter,
+    KtxLogProcessor,
+    KtxLogRecordFactory,
+    ktx_add_log,
+    ktx_add_user_log,
+)
+from ktx.pool import PooledContextFactory
 from ktx.user import ContextUser
 
 
+class _FieldContext(Context):
+    # get_data() adds state not written by set()
+    def __init__(self, ktx_id: str, *, custom_field: str):
+        super().__init__(ktx_id)
+        self.custom_field = custom_field
+
+    def get_data(self):
+        return {**super().get_data(), "custom_field": self.custom_field}
+
+
 @pytest.fixture
 def event_dict() -> dict[str, str]:
     return {"some": "value"}
@@ -147,3 +166,443 @@ class TestLogUser:
             **event_dict,
             "user_id": str(user.get_id()),
         }
+
+
+class TestLogCache:
+    def test_cache(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set("attr1", "value1")
+        ctx.set("_attr2", "value2")
+        ctx.set("attr3", None)
+
+        expected = {
+            **event_dict,
+            "ktx_id": "some-trace-id",
+            "data_attr1": "value1",
+        }
+        assert ktx_add_log(dict(event_dict), ctx, cache=True) == expected
+        assert ktx_add_log(dict(event_dict), ctx, cache=True) == expected
+
+    def test_cache_invalidated_on_set(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set("attr1", "value1")
+        ktx_add_log(dict(event_dict), ctx, cache=True)
+
+        ctx.set("attr1", "value2")
+        assert ktx_add_log(dict(event_dict), ctx, cache=True) == {
+            **event_dict,
+            "ktx_id": "some-trace-id",
+            "data_attr1": "value2",
+        }
+
+    def test_cache_per_options(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set("attr1", "value1")
+        ctx.set("_attr2", "value2")
+        ktx_add_log(dict(event_dict), ctx, cache=True)
+
+        assert ktx_add_log(
+            dict(event_dict), ctx, cache=True, log_private=True, data_key_prefix="d_"
+        ) == {
+            **event_dict,
+            "ktx_id": "some-trace-id",
+            "d_attr1": "value1",
+            "d__attr2": "value2",
+        }
+
+    def test_cache_rendered_once(self, event_dict: dict[str, str], ctx: Context):
+        rendered = 0
+
+        class _Value:
+            def __str__(self) -> str:
+                nonlocal rendered
+                rendered += 1
+                return "value"
+
+        ctx.set("attr1", _Value())
+        for _ in range(3):
+            assert (
+                ktx_add_log(dict(event_dict), ctx, cache=True)["data_attr1"] == "value"
+            )
+
+        assert rendered == 1
+
+    def test_cache_indirect_ctx(self, event_dict: dict[str, str], ctx: Context):
+        with ctx_bind(ctx) as ctx:
+            ctx.set("attr1", "value1")
+
+            assert ktx_add_log(event_dict, cache=True) == {
+                **event_dict,
+                "ktx_id": "some-trace-id",
+                "data_attr1": "value1",
+            }
+
+    def test_cache_overridden_get_data(self, event_dict: dict[str, str]):
+        with ctx_bind(_FieldContext("id", custom_field="a")) as ctx:
+            assert ktx_add_log({}, cache=True)["data_custom_field"] == "a"
+            ctx.custom_field = "b"
+            assert ktx_add_log({}, cache=True)["data_custom_field"] == "b"
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.fixture
+def logger() -> Iterator[logging.Logger]:
+    logger = logging.getLogger("ktx.tests")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        yield logger
+    finally:
+        logger.handlers.clear()
+        logger.filters.clear()
+
+
+class TestStdlibLogging:
+    def test_filter(self, logger: logging.Logger, ctx: Context):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        logger.addFilter(KtxLogFilter())
+
+        logger.info("no context")
+        with ctx_bind(ctx):
+            with ctx_user_bind(ContextUser(id=1, username="user")):
+                ctx.set("attr1", "value1")
+                ctx.set("_attr2", "value2")
+                logger.info("context")
+
+        no_ctx, with_ctx = handler.records
+        assert no_ctx.ktx_id is None  # type: ignore[attr-defined]
+        assert not hasattr(no_ctx, "data_attr1")
+
+        assert with_ctx.ktx_id == "some-trace-id"  # type: ignore[attr-defined]
+        assert with_ctx.data_attr1 == "value1"  # type: ignore[attr-defined]
+        assert not hasattr(with_ctx, "data__attr2")
+        assert with_ctx.user_id == "1"  # type: ignore[attr-defined]
+        assert with_ctx.user_username == "user"  # type: ignore[attr-defined]
+
+    def test_filter_options(self, logger: logging.Logger, ctx: Context):
+        handler = _ListHandler()
+        handler.addFilter(
+            KtxLogFilter(log_private=True, data_key_prefix="d_", user_key_prefix=None)
+        )
+        logger.addHandler(handler)
+
+        with ctx_bind(ctx):
+            with ctx_user_bind(ContextUser(id=1)):
+                ctx.set("_attr2", "value2")
+                logger.info("context")
+
+        (record,) = handler.records
+        assert record.d__attr2 == "value2"  # type: ignore[attr-defined]
+        assert not hasattr(record, "user_id")
+
+    def test_filter_name(self, logger: logging.Logger):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        logger.addFilter(KtxLogFilter("other"))
+
+        logger.info("filtered out")
+        assert handler.records == []
+
+    def test_filter_not_called_below_level(self, logger: logging.Logger, ctx: Context):
+        called = 0
+
+        class _Value:
+            def __str__(self) -> str:
+                nonlocal called
+                called += 1
+                return "value"
+
+        logger.addHandler(_ListHandler())
+        logger.addFilter(KtxLogFilter())
+        with ctx_bind(ctx):
+            ctx.set("attr1", _Value())
+            logger.debug("dropped")
+
+        assert called == 0
+
+    def test_filter_overridden_get_data(self, logger: logging.Logger):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        logger.addFilter(KtxLogFilter())
+
+        with ctx_bind(_FieldContext("id", custom_field="a")) as ctx:
+            logger.info("first")
+            ctx.custom_field = "b"
+            logger.info("second")
+
+        assert [r.data_custom_field for r in handler.records] == ["a", "b"]  # type: ignore[attr-defined]
+
+    def test_record_factory(self, logger: logging.Logger, ctx: Context):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        old_factory = logging.getLogRecordFactory()
+        logging.setLogRecordFactory(KtxLogRecordFactory())
+        try:
+            with ctx_bind(ctx):
+                ctx.set("attr1", "value1")
+                logger.info("context")
+        finally:
+            logging.setLogRecordFactory(old_factory)
+
+        (record,) = handler.records
+        assert record.ktx_id == "some-trace-id"  # type: ignore[attr-defined]
+        assert record.data_attr1 == "value1"  # type: ignore[attr-defined]
+        assert record.getMessage() == "context"
+
+    def test_record_factory_extra(
+        self, logger: logging.Logger, ctx: Context, user: ContextUser
+    ):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        old_factory = logging.getLogRecordFactory()
+        logging.setLogRecordFactory(KtxLogRecordFactory())
+        try:
+            logger.info("no context", extra={"ktx_id": "mine"})
+            with ctx_bind(ctx), ctx_user_bind(user):
+                ctx.set("attr1", "value1")
+                user.set_id(uuid.uuid4())
+                logger.info("context", extra={"user_id": 5, "data_attr1": "mine"})
+        finally:
+            logging.setLogRecordFactory(old_factory)
+
+        first, second = handler.records
+        assert first.ktx_id == "mine"  # type: ignore[attr-defined]
+        assert second.ktx_id == "some-trace-id"  # type: ignore[attr-defined]
+        assert second.user_id == 5  # type: ignore[attr-defined]
+        assert second.data_attr1 == "mine"  # type: ignore[attr-defined]
+
+    def test_filter_extra(self, logger: logging.Logger, ctx: Context):
+        handler = _ListHandler()
+        logger.addHandler(handler)
+        logger.addFilter(KtxLogFilter())
+
+        with ctx_bind(ctx):
+            logger.info("context", extra={"ktx_id": "mine"})
+
+        (record,) = handler.records
+        assert record.ktx_id == "some-trace-id"  # type: ignore[attr-defined]
+
+    def test_format(self, ctx: Context):
+        record = KtxLogRecordFactory(logging.LogRecord)(
+            "name", logging.INFO, __file__, 1, "message", None, None
+        )
+        formatter = logging.Formatter("%(ktx_id)s %(message)s")
+        assert formatter.format(record) == "None message"
+
+        with ctx_bind(ctx):
+            ctx.set("attr1", "value1")
+            record = KtxLogRecordFactory(logging.LogRecord)(
+                "name", logging.INFO, __file__, 1, "message", None, None
+            )
+
+        formatter = logging.Formatter("%(ktx_id)s %(data_attr1)s %(message)s")
+        assert formatter.format(record) == "some-trace-id value1 message"
+
+
+class TestKtxLogProcessor:
+    def test_no_ctx(self, event_dict: dict[str, str]):
+        assert KtxLogProcessor()(None, "info", dict(event_dict)) == event_dict
+
+    def test_same_as_functions(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set("attr1", "value1")
+        ctx.set("_attr2", "value2")
+        ctx.set("attr3", None)
+        user = ContextUser(id=uuid.UUID(int=1), username="user", ip="127.0.0.1")
+        processor = KtxLogProcessor()
+
+        with ctx_bind(ctx), ctx_user_bind(user):
+            expected = ktx_add_user_log(ktx_add_log(dict(event_dict)))
+            assert processor(None, "info", dict(event_dict)) == expected
+            assert processor(None, "info", dict(event_dict)) == expected
+
+    def test_include_exclude(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set_many({"attr1": 1, "attr2": 2, "_attr3": 3})
+
+        with ctx_bind(ctx):
+            assert KtxLogProcessor(include=["attr1", "_attr3", "missing"])(
+                None, "info", dict(event_dict)
+            ) == {
+                **event_dict,
+                "ktx_id": "some-trace-id",
+                "data_attr1": "1",
+                "data__attr3": "3",
+            }
+            assert KtxLogProcessor(
+                include=["attr1", "attr2"], exclude=["attr2"], data_key_prefix=""
+            )(None, "info", dict(event_dict)) == {
+                **event_dict,
+                "ktx_id": "some-trace-id",
+                "attr1": "1",
+            }
+            assert KtxLogProcessor(exclude={"attr1"}, log_private=True)(
+                None, "info", dict(event_dict)
+            ) == {
+                **event_dict,
+                "ktx_id": "some-trace-id",
+                "data_attr2": "2",
+                "data__attr3": "3",
+            }
+
+    def test_formatters(self, event_dict: dict[str, str], ctx: Context):
+        ctx.set_many({"attr1": 1.23456, "attr2": 2})
+        processor = KtxLogProcessor(formatters={"attr1": lambda v: round(v, 2)})
+
+        with ctx_bind(ctx):
+            assert processor(None, "info", dict(event_dict)) == {
+                **event_dict,
+                "ktx_id": "some-trace-id",
+                "data_attr1": 1.23,
+                "data_attr2": "2",
+            }
+
+    def test_rendered_once_per_version(self, ctx: Context):
+        rendered = 0
+
+        def formatter(value: str) -> str:
+            nonlocal rendered
+            rendered += 1
+            return value
+
+        processor = KtxLogProcessor(formatters={"attr1": formatter})
+        with ctx_bind(ctx):
+            ctx.set("attr1", "value1")
+            for _ in range(3):
+                processor(None, "info", {})
+            assert rendered == 1
+
+            ctx.set("attr1", "value2")
+            assert processor(None, "info", {})["data_attr1"] == "value2"
+            assert rendered == 2
+
+    def test_user(self, ctx: Context):
+        with ctx_bind(ctx), ctx_user_bind(ContextUser(id=1, email="a@b.c")):
+            assert KtxLogProcessor(user_key_prefix="u_")(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+                "u_id": "1",
+                "u_email": "a@b.c",
+            }
+            assert KtxLogProcessor(user_key_prefix=None)(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+            }
+
+    def test_custom_ctx(self):
+        class _Ctx:
+            def ktx_id(self) -> str:
+                return "custom"
+
+            def get_data(self):
+                return {"attr1": "value1"}
+
+            def get(self, key):
+                return None
+
+            def set(self, key, value):
+                pass
+
+        with ctx_bind(_Ctx()):
+            assert KtxLogProcessor()(None, "info", {}) == {
+                "ktx_id": "custom",
+                "data_attr1": "value1",
+            }
+
+    def test_overridden_get_data(self):
+        processor = KtxLogProcessor()
+        with ctx_bind(_FieldContext("id", custom_field="a")) as ctx:
+            assert processor(None, "info", {})["data_custom_field"] == "a"
+            ctx.custom_field = "b"
+            assert processor(None, "info", {})["data_custom_field"] == "b"
+
+    def test_delta(self, ctx: Context):
+        processor = KtxLogProcessor(delta=True, exclude={"secret"})
+        full = KtxLogProcessor(delta=True)
+        with ctx_bind(ctx):
+            ctx.set_many({"attr1": "value1", "attr2": "value2", "_private": 1})
+            assert processor(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+                "data_attr1": "value1",
+                "data_attr2": "value2",
+            }
+            assert processor(None, "info", {}) == {"ktx_id": "some-trace-id"}
+
+            ctx.set("attr2", "changed")
+            ctx.set("attr1", None)
+            ctx.set("secret", "s")
+            ctx.set("_private", 2)
+            assert processor(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+                "data_attr1": None,
+                "data_attr2": "changed",
+            }
+            assert processor(None, "info", {}) == {"ktx_id": "some-trace-id"}
+
+            # consumers are independent
+            assert full(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+                "data_attr2": "changed",
+                "data_secret": "s",
+            }
+
+            with ctx_bind(Context("other", data={"attr1": "other"})):
+                assert processor(None, "info", {}) == {
+                    "ktx_id": "other",
+                    "data_attr1": "other",
+                }
+
+            ctx.set("attr3", 3)
+            assert processor(None, "info", {}) == {
+                "ktx_id": "some-trace-id",
+                "data_attr3": "3",
+            }
+
+    def test_delta_pooled_context_reused(self):
+        factory = PooledContextFactory()
+        processor = KtxLogProcessor(delta=True)
+        with factory.bind("req-1") as ctx:
+            ctx.set("a", "x")
+            processor(None, "info", {})
+
+        # a retry with the same request id gets the recycled instance
+        with factory.bind("req-1") as retried:
+            assert retried is ctx
+            retried.set("b", "y")
+            assert processor(None, "info", {}) == {
+                "ktx_id": "req-1",
+                "data_b": "y",
+            }
+
+    def test_delta_include_and_cleared(self):
+        class _Ctx:
+            def __init__(self):
+                self.data = {"attr1": 1, "attr2": 2}
+
+            def ktx_id(self) -> str:
+                return "custom"
+
+            def get_data(self):
+                return self.data
+
+            def get(self, key):
+                return self.data.get(key)
+
+            def set(self, key, value):
+                self.data[key] = value
+
+        ctx = _Ctx()
+        processor = KtxLogProcessor(delta=True, include=["attr1"])
+        with ctx_bind(ctx):
+            assert processor(None, "info", {}) == {
+                "ktx_id": "custom",
+                "data_attr1": "1",
+            }
+            del ctx.data["attr1"]
+            del ctx.data["attr2"]
+            assert processor(None, "info", {}) == {
+                "ktx_id": "custom",
+                "data_attr1": None,
+            }
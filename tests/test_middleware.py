@@ -0,0 +1,241 @@
+import asyncio
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+from ktx import get_current_ctx, get_current_ctx_user, get_current_scope
+from ktx.ctx import ContextFactory
+from ktx.middleware import KtxAsgiMiddleware, KtxWsgiMiddleware
+from ktx.pool import PooledContextFactory, PooledContextUserFactory
+
+
+def _asgi_scope(headers=(), scope_type="http", **extra):
+    scope = {
+        "type": scope_type,
+        "path": "/items",
+        "headers": list(headers),
+        "client": ("10.0.0.1", 51000),
+        **extra,
+    }
+    if scope_type == "http":
+        scope["method"] = "POST"
+    return scope
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+def _run_asgi(app, scope):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, _receive, send))
+    return sent
+
+
+class _AsgiApp:
+    def __init__(self):
+        self.seen = []
+
+    async def __call__(self, scope, receive, send):
+        ctx = get_current_ctx()
+        user = get_current_ctx_user()
+        child = await asyncio.create_task(self._child())
+        self.seen.append((ctx.ktx_id(), dict(ctx.get_data()), user, child))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": ctx.ktx_id().encode()})
+
+    async def _child(self):
+        return get_current_ctx().ktx_id()
+
+
+class TestKtxAsgiMiddleware:
+    def test_header(self):
+        app = _AsgiApp()
+        middleware = KtxAsgiMiddleware(app)
+        sent = _run_asgi(
+            middleware,
+            _asgi_scope([(b"accept", b"*/*"), (b"x-request-id", b"inbound")]),
+        )
+
+        [(ktx_id, data, user, child)] = app.seen
+        assert ktx_id == "inbound"
+        assert child == "inbound"
+        assert data == {"method": "POST", "path": "/items"}
+        assert user.get_ip_address() == "10.0.0.1"
+        assert sent[-1]["body"] == b"inbound"
+        assert get_current_scope() == (None, None)
+
+    def test_id_maker_fallback(self):
+        app = _AsgiApp()
+        middleware = KtxAsgiMiddleware(
+            app, ctx_factory=ContextFactory(ktx_id_maker=lambda: "made")
+        )
+        _run_asgi(middleware, _asgi_scope())
+        _run_asgi(middleware, _asgi_scope([(b"x-request-id", b"")]))
+        _run_asgi(middleware, _asgi_scope([(b"x-request-id", b"x" * 129)]))
+
+        assert [seen[0] for seen in app.seen] == ["made", "made", "made"]
+
+    def test_custom_header_and_data(self):
+        app = _AsgiApp()
+        middleware = KtxAsgiMiddleware(
+            app,
+            header="X-Correlation-ID",
+            request_data=lambda scope: {"route": scope["path"]},
+            set_user_ip=False,
+        )
+        _run_asgi(
+            middleware,
+            _asgi_scope([(b"x-request-id", b"other"), (b"x-correlation-id", b"c1")]),
+        )
+
+        [(ktx_id, data, user, _)] = app.seen
+        assert ktx_id == "c1"
+        assert data == {"route": "/items"}
+        assert user.get_ip_address() is None
+
+    def test_no_header_no_data(self):
+        app = _AsgiApp()
+        middleware = KtxAsgiMiddleware(
+            app,
+            ctx_factory=ContextFactory(ktx_id_maker=lambda: "made"),
+            header=None,
+            request_data=None,
+        )
+        _run_asgi(middleware, _asgi_scope([(b"x-request-id", b"inbound")]))
+
+        [(ktx_id, data, _, _)] = app.seen
+        assert ktx_id == "made"
+        assert data == {}
+
+    def test_websocket(self):
+        app = _AsgiApp()
+        _run_asgi(KtxAsgiMiddleware(app), _asgi_scope(scope_type="websocket"))
+
+        [(_, data, _, _)] = app.seen
+        assert data == {"path": "/items"}
+
+    def test_lifespan_passed_through(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(get_current_scope())
+
+        _run_asgi(KtxAsgiMiddleware(app), {"type": "lifespan"})
+        assert calls == [(None, None)]
+
+    def test_concurrent_requests_isolated(self):
+        async def app(scope, receive, send):
+            ctx = get_current_ctx()
+            await asyncio.sleep(0)
+            ctx.set("status", 200)
+            await asyncio.sleep(0)
+            assert get_current_ctx() is ctx
+            results.append((ctx.ktx_id(), ctx.get("status")))
+
+        async def send(message):
+            pass
+
+        async def main():
+            await asyncio.gather(
+                *(
+                    middleware(
+                        _asgi_scope([(b"x-request-id", str(i).encode())]),
+                        _receive,
+                        send,
+                    )
+                    for i in range(100)
+                )
+            )
+
+        results: list[tuple] = []
+        middleware = KtxAsgiMiddleware(app)
+        asyncio.run(main())
+        assert sorted(results) == sorted((str(i), 200) for i in range(100))
+
+    def test_pooled_factories_and_error(self):
+        ctx_factory = PooledContextFactory()
+        user_factory = PooledContextUserFactory()
+        bound = []
+
+        async def app(scope, receive, send):
+            bound.append(get_current_scope())
+            raise ValueError("boom")
+
+        middleware = KtxAsgiMiddleware(
+            app, ctx_factory=ctx_factory, user_factory=user_factory
+        )
+        with pytest.raises(ValueError, match="boom"):
+            _run_asgi(middleware, _asgi_scope())
+
+        [(ctx, user)] = bound
+        assert get_current_scope() == (None, None)
+        assert ctx_factory.create() is ctx
+        assert user_factory.create() is user
+
+
+def _wsgi_environ(**extra):
+    environ = {"REQUEST_METHOD": "GET", "PATH_INFO": "/items", **extra}
+    setup_testing_defaults(environ)
+    return environ
+
+
+class TestKtxWsgiMiddleware:
+    @staticmethod
+    def _app(seen):
+        def app(environ, start_response):
+            ctx = get_current_ctx()
+            user = get_current_ctx_user()
+            seen.append((ctx.ktx_id(), dict(ctx.get_data()), user.get_ip_address()))
+            start_response("200 OK", [("Content-Type", "text/plain")])
+            return [ctx.ktx_id().encode()]
+
+        return app
+
+    def test_header(self):
+        seen: list[tuple] = []
+        statuses = []
+        middleware = KtxWsgiMiddleware(self._app(seen))
+        body = middleware(
+            _wsgi_environ(HTTP_X_REQUEST_ID="inbound", REMOTE_ADDR="10.0.0.2"),
+            lambda status, headers: statuses.append(status),
+        )
+
+        assert list(body) == [b"inbound"]
+        assert statuses == ["200 OK"]
+        assert seen == [("inbound", {"method": "GET", "path": "/items"}, "10.0.0.2")]
+        assert get_current_scope() == (None, None)
+
+    def test_id_maker_fallback_and_options(self):
+        seen: list[tuple] = []
+        middleware = KtxWsgiMiddleware(
+            self._app(seen),
+            ctx_factory=ContextFactory(ktx_id_maker=lambda: "made"),
+            header="X-Correlation-ID",
+            request_data=lambda environ: {"query": environ.get("QUERY_STRING", "")},
+            set_user_ip=False,
+        )
+        middleware(_wsgi_environ(HTTP_X_REQUEST_ID="ignored"), lambda *args: None)
+        middleware(
+            _wsgi_environ(HTTP_X_CORRELATION_ID="x" * 129, QUERY_STRING="q=1"),
+            lambda *args: None,
+        )
+        middleware(_wsgi_environ(HTTP_X_CORRELATION_ID="c1"), lambda *args: None)
+
+        assert seen == [
+            ("made", {"query": ""}, None),
+            ("made", {"query": "q=1"}, None),
+            ("c1", {"query": ""}, None),
+        ]
+
+    def test_error_unbinds(self):
+        def app(environ, start_response):
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            KtxWsgiMiddleware(app)(_wsgi_environ(), lambda *args: None)
+        assert get_current_scope() == (None, None)
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from ktx import ctx_bind, get_current_ctx, scoped
+from ktx.ctx import Context
+from ktx.lazy import Lazy
+from ktx.pool import PooledContextFactory, PooledContextUserFactory
+from ktx.user import ContextUser
+from tests.conftest import RecordingAdapter
+
+
+class TestPooledContextFactory:
+    def test_recycled(self):
+        adapter = RecordingAdapter()
+        factory = PooledContextFactory(adapters=[adapter])
+        with factory.bind("first") as ctx:
+            ctx.set("key", Lazy(lambda: "value"))
+            ctx.set("other", 1)
+            ctx.get_data()
+            assert get_current_ctx() is ctx
+
+        recycled = factory.create("second")
+        assert recycled is ctx
+        assert recycled.ktx_id() == "second"
+        assert recycled.get_data() == {}
+        assert recycled.version() == 0
+        recycled.set("key", 2)
+        assert adapter.calls == [("set", "other", 1), ("set", "key", 2)]
+
+    def test_new_when_empty(self):
+        factory = PooledContextFactory(ktx_id_maker=lambda: "new")
+        ctx = factory.create()
+        assert ctx.ktx_id() == "new"
+        assert factory.create() is not ctx
+
+    def test_max_size(self):
+        factory = PooledContextFactory(max_size=1)
+        first, second = factory.create(), factory.create()
+        factory.release(first)
+        factory.release(second)
+
+        assert factory.create() is first
+        assert factory.create() is not second
+
+    def test_inherit(self):
+        factory = PooledContextFactory()
+        factory.release(factory.create())
+        with ctx_bind(Context("parent", data={"key": "value"})):
+            ctx = factory.create()
+
+        assert ctx.get_data() == {"key": "value"}
+
+    def test_shared_data_is_not_cleared(self):
+        factory = PooledContextFactory()
+        with factory.bind() as parent:
+            parent.set("key", "value")
+            child = factory.create()
+
+        assert child.get_data() == {"key": "value"}
+
+    def test_double_release(self):
+        factory = PooledContextFactory()
+        ctx = factory.create()
+        factory.release(ctx)
+        with pytest.raises(RuntimeError):
+            factory.release(ctx)
+
+    def test_debug_use_after_release(self):
+        factory = PooledContextFactory(debug=True)
+        with factory.bind() as ctx:
+            ctx.set("key", "value")
+
+        with pytest.raises(RuntimeError, match="used after release"):
+            ctx.get("key")
+        with pytest.raises(RuntimeError):
+            ctx.set("key", "value")
+        with pytest.raises(RuntimeError):
+            factory.release(ctx)
+
+        assert factory.create() is ctx
+        assert type(ctx) is Context
+        assert ctx.get("key") is None
+
+    def test_per_thread(self):
+        factory = PooledContextFactory()
+        ctx = factory.create()
+        factory.release(ctx)
+
+        async def other_loop() -> Context:
+            return factory.create()
+
+        async def main() -> Context:
+            return await asyncio.to_thread(asyncio.run, other_loop())
+
+        assert asyncio.run(main()) is not ctx
+        assert factory.create() is ctx
+
+
+class TestPooledContextUserFactory:
+    def test_recycled(self):
+        factory = PooledContextUserFactory()
+        with factory.bind() as user:
+            user.set_many({"id": 1, "email": "a@b.c"})
+
+        recycled = factory.create()
+        assert recycled is user
+        assert recycled.get_id() is None
+        assert recycled.get_email() is None
+
+    def test_debug_use_after_release(self):
+        factory = PooledContextUserFactory(debug=True)
+        user = factory.create()
+        factory.release(user)
+
+        with pytest.raises(RuntimeError, match="used after release"):
+            user.get_id()
+        with pytest.raises(RuntimeError):
+            factory.release(user)
+
+        assert factory.create() is user
+        assert type(user) is ContextUser
+
+    def test_double_release(self):
+        factory = PooledContextUserFactory()
+        user = factory.create()
+        factory.release(user)
+        with pytest.raises(RuntimeError):
+            factory.release(user)
+
+
+class TestScopedPooled:
+    def test_released_after_call(self):
+        ctx_factory = PooledContextFactory()
+        user_factory = PooledContextUserFactory()
+        seen = []
+
+        @scoped(ctx_factory, user_factory)
+        def handler() -> None:
+            seen.append(get_current_ctx())
+
+        handler()
+        handler()
+        assert seen[0] is seen[1]
@@ -0,0 +1,169 @@
+from typing import Any, ClassVar
+
+import pytest
+
+from ktx import ctx_bind
+from ktx.abc import AbstractContext
+from ktx.ctx import Context
+from ktx.log import ktx_add_log
+from ktx.schema import SchemaContext, SchemaContextFactory, context_schema
+from tests.conftest import RecordingBulkAdapter
+
+
+@context_schema
+class RequestContext(SchemaContext):
+    path: str = ""
+    user_agent: str | None = None
+    _token: str | None = None
+
+    kind: ClassVar[str] = "request"
+
+    def describe(self) -> str:
+        return f"{self.kind} {self.path}"
+
+    def set(self, key: str, value: Any) -> None:
+        super().set(key, value)
+
+
+@context_schema
+class ApiContext(RequestContext):
+    api_version: int = 1
+
+
+class TestSchemaContext:
+    def test_protocol(self):
+        ctx = RequestContext("id")
+        assert isinstance(ctx, AbstractContext)
+        assert isinstance(ctx, Context)
+
+    def test_slots(self):
+        ctx = RequestContext("id")
+        assert RequestContext.__slots__ == ["_f_path", "_f_user_agent", "_f__token"]
+        ctx.set("path", "/")
+        assert "path" not in vars(ctx)
+        assert RequestContext.__name__ == "RequestContext"
+        assert RequestContext.kind == "request"
+        assert ctx.describe() == "request /"
+
+    def test_defaults(self):
+        ctx = RequestContext("id")
+        assert ctx.path == ""
+        assert ctx.get("path") == ""
+        assert ctx.get("user_agent") is None
+        assert ctx.get_data() == {"path": "", "user_agent": None, "_token": None}
+
+    def test_data_routing(self):
+        ctx = RequestContext("id", data={"path": "/a", "other": 1})
+        assert ctx.path == "/a"
+        assert ctx.get("other") == 1
+        assert ctx._data == {"other": 1}
+        assert ctx.get_data() == {
+            "path": "/a",
+            "user_agent": None,
+            "_token": None,
+            "other": 1,
+        }
+
+    def test_set(self):
+        ctx = RequestContext("id")
+        data = ctx.get_data()
+
+        ctx.set("path", "/b")
+        ctx.set("other", 2)
+        assert ctx.path == "/b"
+        assert ctx.get("other") == 2
+        assert ctx.version() == 2
+        assert data["path"] == ""
+        assert ctx.get_data()["path"] == "/b"
+        assert ctx.get_data() is ctx.get_data()
+
+    def test_attribute_set_goes_through_set(self):
+        adapter = RecordingBulkAdapter()
+        ctx = RequestContext("id", adapters=[adapter])
+        ctx.get_data()
+
+        ctx.user_agent = "curl"
+        assert ctx.get("user_agent") == "curl"
+        assert ctx.get_data()["user_agent"] == "curl"
+        assert ctx.version() == 1
+        assert adapter.calls == [("set", "user_agent", "curl")]
+
+    def test_set_many(self):
+        adapter = RecordingBulkAdapter()
+        ctx = RequestContext("id", adapters=[adapter])
+
+        ctx.set_many({"path": "/c", "other": 3})
+        assert ctx.path == "/c"
+        assert ctx.get("other") == 3
+        assert ctx.version() == 1
+        assert adapter.calls == [("set_many", {"path": "/c", "other": 3})]
+
+    def test_inherited_schema(self):
+        ctx = ApiContext("id", data={"path": "/d", "api_version": 2})
+        assert ctx.path == "/d"
+        assert ctx.api_version == 2
+        assert ctx.get("api_version") == 2
+        assert ApiContext._schema_fields == (
+            "path",
+            "user_agent",
+            "_token",
+            "api_version",
+        )
+        assert ctx.get_data() == {
+            "path": "/d",
+            "user_agent": None,
+            "_token": None,
+            "api_version": 2,
+        }
+
+    def test_log(self):
+        ctx = RequestContext("id", data={"path": "/e", "other": 1})
+        assert ktx_add_log({}, ctx) == {
+            "ktx_id": "id",
+            "data_path": "/e",
+            "data_other": "1",
+        }
+
+    def test_factory(self):
+        factory = SchemaContextFactory(RequestContext, ktx_id_maker=lambda: "new")
+        with ctx_bind(Context("parent", data={"path": "/f", "other": 1})):
+            ctx = factory.create()
+
+        assert isinstance(ctx, RequestContext)
+        assert ctx.ktx_id() == "new"
+        assert ctx.path == "/f"
+        assert ctx.get("other") == 1
+
+        assert SchemaContextFactory(RequestContext, inherit_data=False).create(
+            "id"
+        ).get_data() == {"path": "", "user_agent": None, "_token": None}
+
+
+class TestContextSchema:
+    def test_requires_schema_context(self):
+        with pytest.raises(TypeError):
+
+            @context_schema
+            class _Ctx(Context):  # type: ignore[type-var]
+                field: str = ""
+
+    def test_redeclared_field(self):
+        with pytest.raises(ValueError):
+
+            @context_schema
+            class _Ctx(RequestContext):
+                path: str = ""
+
+    def test_clashing_field(self):
+        with pytest.raises(ValueError):
+
+            @context_schema
+            class _Ctx(SchemaContext):
+                get_data: str = ""  # type: ignore[assignment]
+
+    def test_mutable_default(self):
+        with pytest.raises(ValueError):
+
+            @context_schema
+            class _Ctx(SchemaContext):
+                items: list = []
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from ktx import (
+    ctx_bind,
+    ctx_user_bind,
+    get_current_ctx,
+    get_current_ctx_or_none,
+    get_current_ctx_user,
+    get_current_ctx_user_or_none,
+    get_current_scope,
+    scope_bind,
+    scoped,
+)
+from ktx.ctx import Context, ContextFactory
+from ktx.instrument import disable_instrumentation, enable_instrumentation
+from ktx.user import ContextUser, ContextUserFactory
+
+
+class TestScopeBind:
+    def test_bind(self):
+        ctx = Context("id")
+        user = ContextUser(id=1)
+        assert get_current_scope() == (None, None)
+
+        with scope_bind(ctx, user) as (bound_ctx, bound_user):
+            assert bound_ctx is ctx
+            assert bound_user is user
+            assert get_current_scope() == (ctx, user)
+            assert get_current_ctx() is ctx
+            assert get_current_ctx_user() is user
+
+        assert get_current_scope() == (None, None)
+
+    def test_properties_and_on_unbind(self):
+        calls = []
+        bind = scope_bind(
+            Context("id"), ContextUser(), on_unbind=lambda: calls.append(1)
+        )
+        assert bind.ctx.ktx_id() == "id"
+        assert bind.user.get_id() is None
+
+        bind.unbind()
+        assert calls == []
+        with bind:
+            pass
+        assert calls == [1]
+
+    def test_nested_separate_binds(self):
+        ctx = Context("outer")
+        user = ContextUser(id=1)
+        inner_ctx = Context("inner")
+        inner_user = ContextUser(id=2)
+
+        with scope_bind(ctx, user):
+            with ctx_bind(inner_ctx):
+                assert get_current_scope() == (inner_ctx, user)
+                with ctx_user_bind(inner_user):
+                    assert get_current_scope() == (inner_ctx, inner_user)
+                assert get_current_scope() == (inner_ctx, user)
+            assert get_current_scope() == (ctx, user)
+
+            with scope_bind(inner_ctx, inner_user):
+                assert get_current_scope() == (inner_ctx, inner_user)
+            assert get_current_scope() == (ctx, user)
+
+    def test_scope_inside_separate_binds(self):
+        ctx = Context("outer")
+        with ctx_bind(ctx):
+            with scope_bind(Context("inner"), ContextUser()):
+                pass
+            assert get_current_scope() == (ctx, None)
+
+    def test_separate_binds_unbound_out_of_order(self):
+        ctx = Context("id")
+        user = ContextUser(id=1)
+        ctx_binding = ctx_bind(ctx)
+        user_binding = ctx_user_bind(user)
+
+        ctx_binding.bind()
+        user_binding.bind()
+        ctx_binding.unbind()
+        assert get_current_ctx_or_none() is None
+        assert get_current_ctx_user_or_none() is user
+
+        ctx_binding.bind()
+        user_binding.unbind()
+        assert get_current_ctx_or_none() is ctx
+        assert get_current_ctx_user_or_none() is None
+        ctx_binding.unbind()
+        assert get_current_scope() == (None, None)
+
+    def test_instrumented(self):
+        instrumentation = enable_instrumentation()
+        try:
+            with scope_bind(Context("id"), ContextUser()):
+                pass
+        finally:
+            disable_instrumentation()
+
+        snapshot = instrumentation.snapshot()
+        assert snapshot["binds"] == snapshot["unbinds"] == 1
+
+
+class TestScoped:
+    def test_sync(self):
+        @scoped(ContextFactory(ktx_id_maker=lambda: "new"), ContextUserFactory())
+        def handler(value: int) -> tuple[str, int]:
+            get_current_ctx_user()
+            return get_current_ctx().ktx_id(), value
+
+        assert handler(1) == ("new", 1)
+        assert handler.__name__ == "handler"
+        assert get_current_scope() == (None, None)
+
+    def test_sync_error(self):
+        @scoped(ContextFactory(), ContextUserFactory())
+        def handler() -> None:
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            handler()
+        assert get_current_scope() == (None, None)
+
+    def test_async(self):
+        seen = set()
+
+        @scoped(ContextFactory(), ContextUserFactory())
+        async def handler() -> None:
+            ctx = get_current_ctx()
+            await asyncio.sleep(0)
+            assert get_current_ctx() is ctx
+            seen.add(ctx.ktx_id())
+
+        async def main() -> None:
+            await asyncio.gather(*(handler() for _ in range(10)))
+            assert get_current_scope() == (None, None)
+
+        asyncio.run(main())
+        assert len(seen) == 10
@@ -0,0 +1,94 @@
+from typing import Any
+
+import pytest
+import sentry_sdk
+from sentry_sdk.transport import Transport
+
+from ktx import ctx_bind, ctx_user_bind
+from ktx.adapters.sentry import KtxSentryIntegration, ktx_sentry_enrich_event
+from ktx.ctx import Context
+from ktx.user import ContextUser
+
+
+class _NullTransport(Transport):
+    def capture_envelope(self, envelope: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def events():
+    captured: list[dict[str, Any]] = []
+
+    def before_send(event, hint):
+        captured.append(event)
+        return None
+
+    sentry_sdk.init(
+        dsn="http://public@localhost/1",
+        transport=_NullTransport(),
+        integrations=[KtxSentryIntegration()],
+        default_integrations=False,
+        before_send=before_send,
+    )
+    try:
+        yield captured
+    finally:
+        sentry_sdk.get_global_scope().set_client(None)
+
+
+class TestKtxSentryIntegration:
+    def test_event_enriched(self, events: list[dict[str, Any]]):
+        ctx = Context("id1")
+        user = ContextUser()
+        with ctx_bind(ctx), ctx_user_bind(user):
+            ctx.set("attr1", "val1")
+            ctx.set("_attr2", "val2")
+            user.set_id(42)
+            user.set_email("test@example.com")
+
+            sentry_sdk.capture_message("message")
+
+        assert len(events) == 1
+        assert events[0]["extra"] == {"attr1": "val1"}
+        assert events[0]["user"] == {"id": 42, "email": "test@example.com"}
+
+    def test_no_ctx(self, events: list[dict[str, Any]]):
+        sentry_sdk.capture_message("message")
+
+        assert len(events) == 1
+        assert "attr1" not in events[0].get("extra", {})
+        assert "user" not in events[0]
+
+    def test_scope_values_win(self, events: list[dict[str, Any]]):
+        ctx = Context("id1")
+        user = ContextUser()
+        with ctx_bind(ctx), ctx_user_bind(user):
+            ctx.set("attr1", "val1")
+            ctx.set("attr2", "val2")
+            user.set_id(42)
+            user.set_username("ktx")
+            sentry_sdk.set_extra("attr2", "explicit")
+            sentry_sdk.set_user({"id": 1})
+
+            sentry_sdk.capture_message("message")
+
+        assert events[0]["extra"] == {"attr1": "val1", "attr2": "explicit"}
+        assert events[0]["user"] == {"id": 1, "username": "ktx"}
+
+
+class TestEnrichEvent:
+    def test_ignore_prefix(self):
+        ctx = Context("id1", data={"attr1": "val1", "_attr2": "val2", "x_attr3": 3})
+        with ctx_bind(ctx):
+            assert ktx_sentry_enrich_event({}, ignore_prefix="x_") == {
+                "extra": {"attr1": "val1", "_attr2": "val2"},
+            }
+            assert ktx_sentry_enrich_event({}, ignore_prefix=None) == {
+                "extra": {"attr1": "val1", "_attr2": "val2", "x_attr3": 3},
+            }
+
+    def test_no_user(self):
+        user = ContextUser(id=42)
+        with ctx_user_bind(user):
+            assert ktx_sentry_enrich_event({}, user=False) == {}
+            assert ktx_sentry_enrich_event({}) == {"user": {"id": 42}}
@@ -0,0 +1,227 @@
+import asyncio
+import contextvars
+import sys
+
+import pytest
+
+from ktx import (
+    ctx_bind,
+    get_current_ctx,
+    get_current_ctx_or_none,
+    get_current_ctx_user,
+    scope_bind,
+)
+from ktx.ctx import Context, ContextFactory
+from ktx.log import ktx_add_log
+from ktx.schema import SchemaContext, context_schema
+from ktx.tasks import KtxTaskFactory, TaskContext, install_task_factory
+from ktx.user import ContextUser
+
+
+def _counter_factory():
+    counter = iter(range(1_000_000))
+    return ContextFactory(ktx_id_maker=lambda: f"child{next(counter)}")
+
+
+class TestKtxTaskFactory:
+    def test_reads_parent_until_first_write(self):
+        async def child():
+            ctx = get_current_ctx(TaskContext)
+            assert get_current_ctx(Context) is ctx
+            assert not ctx.is_detached()
+            assert ctx.ktx_id() == "parent"
+            assert ctx.get("key") == "parent"
+
+            await asyncio.sleep(0)
+            # parent writes are seen until the task writes
+            assert ctx.get("late") == 1
+
+            ctx.set("key", "child")
+            assert ctx.is_detached()
+            assert ctx.ktx_id() == "child0"
+            assert ctx.get_data() == {"key": "child", "late": 1}
+            assert get_current_ctx() is ctx
+
+        async def main():
+            install_task_factory(ctx_factory=_counter_factory())
+            with ctx_bind(Context("parent", data={"key": "parent"})) as parent:
+                task = asyncio.create_task(child())
+                await asyncio.sleep(0)
+                parent.set("late", 1)
+                await task
+
+                assert parent.get_data() == {"key": "parent", "late": 1}
+                assert get_current_ctx() is parent
+
+        asyncio.run(main())
+
+    def test_thousands_of_tasks_isolated(self):
+        tasks_count = 5_000
+
+        async def writer(i):
+            ctx = get_current_ctx(TaskContext)
+            await asyncio.sleep(0)
+            ctx.set("task", i)
+            await asyncio.sleep(0)
+            ctx.set_many({"done": True})
+            await asyncio.sleep(0)
+            return ctx.ktx_id(), dict(ctx.get_data())
+
+        async def reader():
+            ctx = get_current_ctx(TaskContext)
+            await asyncio.sleep(0)
+            return ctx.is_detached(), ctx.ktx_id()
+
+        async def main():
+            install_task_factory()
+            with ctx_bind(Context("parent", data={"shared": 1})) as parent:
+                writers = [asyncio.create_task(writer(i)) for i in range(tasks_count)]
+                readers = [asyncio.create_task(reader()) for _ in range(tasks_count)]
+                written = await asyncio.gather(*writers)
+                read = await asyncio.gather(*readers)
+                return parent, written, read
+
+        parent, written, read = asyncio.run(main())
+        assert parent.get_data() == {"shared": 1}
+        assert parent.version() == 0
+        assert len({ktx_id for ktx_id, _ in written}) == tasks_count
+        assert [data for _, data in written] == [
+            {"shared": 1, "task": i, "done": True} for i in range(tasks_count)
+        ]
+        assert read == [(False, "parent")] * tasks_count
+
+    def test_nested_tasks(self):
+        async def grandchild():
+            return get_current_ctx().get("level")
+
+        async def child():
+            ctx = get_current_ctx()
+            before = await asyncio.create_task(grandchild())
+            ctx.set("level", "child")
+            after = await asyncio.create_task(grandchild())
+            return before, after
+
+        async def main():
+            install_task_factory()
+            with ctx_bind(Context("parent", data={"level": "parent"})):
+                return await asyncio.create_task(child())
+
+        assert asyncio.run(main()) == ("parent", "child")
+
+    def test_context_subclass_passed_as_is(self):
+        @context_schema
+        class RequestContext(SchemaContext):
+            route: str = ""
+
+        async def child():
+            ctx = get_current_ctx(RequestContext)
+            ctx.route = "/child"
+            return ctx
+
+        async def main():
+            install_task_factory()
+            with ctx_bind(RequestContext("parent")) as ctx:
+                assert await asyncio.create_task(child()) is ctx
+                return ctx.route
+
+        assert asyncio.run(main()) == "/child"
+
+    def test_no_context_and_user(self):
+        user = ContextUser(id=1)
+
+        async def no_ctx():
+            with pytest.raises(RuntimeError):
+                get_current_ctx()
+
+        async def with_user():
+            return get_current_ctx_user()
+
+        async def main():
+            install_task_factory()
+            await asyncio.create_task(no_ctx())
+            with scope_bind(Context("parent"), user):
+                return await asyncio.create_task(with_user())
+
+        assert asyncio.run(main()) is user
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="create_task(context=)")
+    def test_explicit_context(self):
+        seen = []
+
+        async def child():
+            ctx = get_current_ctx()
+            seen.append(ctx)
+            ctx.set("key", "child")
+
+        async def main():
+            install_task_factory()
+            with ctx_bind(Context("parent")) as parent:
+                context = contextvars.copy_context()
+                await asyncio.get_running_loop().create_task(child(), context=context)
+                assert context.run(get_current_ctx) is parent
+                assert isinstance(seen[0], TaskContext)
+                assert seen[0].get("key") == "child"
+                assert parent.get("key") is None
+
+        asyncio.run(main())
+
+    @pytest.mark.skipif(sys.version_info < (3, 11), reason="create_task(context=)")
+    def test_explicit_context_of_other_scope(self):
+        seen = []
+
+        async def child():
+            ctx = get_current_ctx_or_none()
+            seen.append(ctx.ktx_id() if ctx is not None else None)
+
+        async def main():
+            install_task_factory()
+            loop = asyncio.get_running_loop()
+            with ctx_bind(Context("other")) as other:
+                context = contextvars.copy_context()
+            with ctx_bind(Context("current")):
+                await loop.create_task(child(), context=context)
+                assert context.run(get_current_ctx) is other
+
+            await loop.create_task(child(), context=contextvars.Context())
+            assert seen == ["other", None]
+
+        asyncio.run(main())
+
+    def test_wraps_installed_factory(self):
+        created = []
+
+        def factory(loop, coro, **kwargs):
+            created.append(coro)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        async def child():
+            return type(get_current_ctx())
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_task_factory(factory)
+            ktx_factory = install_task_factory(loop)
+            assert loop.get_task_factory() is ktx_factory
+            with ctx_bind(Context("parent")):
+                return await asyncio.create_task(child())
+
+        assert asyncio.run(main()) is TaskContext
+        assert created[0].__name__ == "child"
+
+    def test_factory_call_and_logging(self):
+        async def child():
+            ctx = get_current_ctx(TaskContext)
+            first = ktx_add_log({}, cache=True)
+            ctx.set("key", "child")
+            return first, ktx_add_log({}, cache=True), ctx.version()
+
+        async def main():
+            factory = KtxTaskFactory(_counter_factory())
+            with ctx_bind(Context("parent", data={"key": "parent"})):
+                task = factory(asyncio.get_running_loop(), child())
+                return await task
+
+        first, second, version = asyncio.run(main())
+        assert first == {"ktx_id": "parent", "data_key": "parent"}
+        assert second == {"ktx_id": "child0", "data_key": "child"}
+        assert version == 1
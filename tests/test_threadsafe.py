@@ -0,0 +1,141 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import pytest
+
+from ktx import ctx_bind, get_current_ctx
+from ktx.ctx import Context, ContextFactory
+from ktx.lazy import Lazy
+from ktx.log import ktx_add_log
+from ktx.threadsafe import ThreadSafeContext, ThreadSafeContextFactory
+from tests.conftest import RecordingBulkAdapter
+
+
+class TestThreadSafeContext:
+    def test_get_set(self):
+        ctx = ThreadSafeContext("id", data={"a": 1})
+        assert ctx.ktx_id() == "id"
+        assert ctx.get("a") == 1
+        assert ctx.get("b") is None
+        assert ctx.version() == 0
+
+        data = ctx.get_data()
+        ctx.set("b", 2)
+        ctx.set_many({"c": 3, "a": 0})
+        ctx.set_many({})
+
+        assert data == {"a": 1}
+        assert ctx.get_data() == {"a": 0, "b": 2, "c": 3}
+        assert ctx.get_data() is ctx.get_data()
+        assert ctx.peek_data() == ctx.get_data()
+        assert ctx.version() == 2
+        with pytest.raises(TypeError):
+            ctx.get_data()["a"] = 1  # type: ignore[index]
+
+    def test_adapters(self):
+        adapter = RecordingBulkAdapter()
+        ctx = ThreadSafeContext("id", adapters=[adapter])
+        ctx.set("a", 1)
+        ctx.set("lazy", Lazy(lambda: 0))
+        ctx.set_many({"b": 2, "other": Lazy(lambda: 0)})
+
+        assert adapter.calls == [("set", "a", 1), ("set_many", {"b": 2})]
+
+    def test_lazy(self):
+        calls = []
+
+        def make():
+            calls.append(1)
+            return "value"
+
+        ctx = ThreadSafeContext("id", data={"a": 1})
+        ctx.set("lazy", Lazy(make))
+        assert isinstance(ctx.peek_data()["lazy"], Lazy)
+        assert ctx.memoize("k", dict, lazy="skip") == {"a": 1}
+        assert calls == []
+
+        assert ctx.get_data() == {"a": 1, "lazy": "value"}
+        assert ctx.get("lazy") == "value"
+        assert ctx.memoize("k", dict, lazy="skip") == {"a": 1, "lazy": "value"}
+        assert calls == [1]
+
+    def test_memoize(self):
+        calls = []
+
+        def make(data):
+            calls.append(1)
+            return dict(data)
+
+        ctx = ThreadSafeContext("id")
+        assert ctx.memoize("k", make) == {}
+        assert ctx.memoize("k", make) == {}
+        ctx.set("a", 1)
+        assert ctx.memoize("k", make) == {"a": 1}
+        assert len(calls) == 2
+
+    def test_logging(self):
+        with ctx_bind(ThreadSafeContext("id", data={"a": 1})):
+            assert ktx_add_log({}, cache=True) == {"ktx_id": "id", "data_a": "1"}
+
+    def test_factory_inherits(self):
+        factory = ThreadSafeContextFactory(ktx_id_maker=lambda: "made")
+        assert factory.create().get_data() == {}
+
+        with ctx_bind(factory.create("parent")) as parent:
+            parent.set("a", 1)
+            child = factory.create()
+            assert isinstance(child, ThreadSafeContext)
+            assert child.ktx_id() == "made"
+            assert child.peek_data() is not parent.peek_data()
+            assert child.get_data() == {"a": 1}
+
+            child.set("b", 2)
+            assert parent.get_data() == {"a": 1}
+
+            # a plain context child copies the data
+            with ctx_bind(ContextFactory().create()) as plain:
+                plain.set("c", 3)
+                assert get_current_ctx().get_data() == {"a": 1, "c": 3}
+            assert parent.get_data() == {"a": 1}
+
+        with ctx_bind(Context("plain", data={"a": 1})):
+            assert factory.create().get_data() == {"a": 1}
+
+    def test_concurrent_readers_and_writers(self):
+        # writers keep a == b in every version, readers must never see
+        # data of two different versions
+        ctx = ThreadSafeContext("id", data={"a": 0, "b": 0})
+        writers = 4
+        writes = 2_000
+        barrier = Barrier(writers * 2)
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        def write(n):
+            barrier.wait()
+            for i in range(writes):
+                ctx.set_many({"a": (n, i), "b": (n, i)})
+                ctx.set(f"w{n}", i)
+
+        def read(_):
+            barrier.wait()
+            seen = 0
+            for _ in range(writes * 2):
+                data = ctx.get_data()
+                assert data["a"] == data["b"]
+                version = ctx.version()
+                assert version >= seen
+                seen = version
+
+        try:
+            with ThreadPoolExecutor(writers * 2) as executor:
+                results = [executor.submit(write, n) for n in range(writers)]
+                results += [executor.submit(read, n) for n in range(writers)]
+                for result in results:
+                    result.result()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert ctx.version() == writers * writes * 2
+        assert {ctx.get(f"w{n}") for n in range(writers)} == {writes - 1}
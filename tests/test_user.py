@@ -1,6 +1,9 @@
+from typing import Any
+
 import pytest
 from sentry_sdk import get_isolation_scope
 
+from ktx.adapters import sentry as sentry_adapters
 from ktx.adapters.sentry import SentryUserAdapter
 from ktx.bind import ctx_user_bind
 from ktx.user import ContextUser, ContextUserFactory
@@ -50,6 +53,94 @@ class TestContextUser:
             "ip_address": "100.200.30.40",
         }
 
+    def test_user_set_many(self):
+        user = ContextUser()
+        user.set_many(
+            {
+                "id": 1,
+                "username": "test",
+                "email": "test@example.com",
+                "ip_address": "100.200.30.40",
+            }
+        )
+        assert user.get_id() == 1
+        assert user.get_username() == "test"
+        assert user.get_email() == "test@example.com"
+        assert user.get_ip_address() == "100.200.30.40"
+
+    def test_user_set_many_unknown_field(self):
+        user = ContextUser()
+        with pytest.raises(ValueError) as e:
+            user.set_many({"id": 1, "name": "test"})
+
+        assert str(e.value) == "unknown user fields: ['name']"
+        assert user.get_id() is None
+
+    def test_user_set_many_with_sentry_adapter(self):
+        user = ContextUser(adapters=[SentryUserAdapter()])
+        user.set_id(1)
+        user.set_many({"username": "test", "email": "test@example.com"})
+
+        assert get_isolation_scope()._user == {
+            "id": 1,
+            "username": "test",
+            "email": "test@example.com",
+        }
+
+
+class _StubScope:
+    def __init__(self):
+        self._user: dict[str, Any] | None = None
+        self.user_writes = 0
+
+    def set_user(self, value: dict[str, Any] | None) -> None:
+        self.user_writes += 1
+        self._user = value
+
+
+class TestSentryUserAdapterWrites:
+    @pytest.fixture
+    def scope(self, monkeypatch: pytest.MonkeyPatch) -> _StubScope:
+        scope = _StubScope()
+        monkeypatch.setattr(sentry_adapters, "get_isolation_scope", lambda: scope)
+        return scope
+
+    def test_write_per_field(self, scope: _StubScope):
+        user = ContextUser(adapters=[SentryUserAdapter()])
+        user.set_id(1)
+        user.set_username("test")
+
+        assert scope.user_writes == 2
+        assert scope._user == {"id": 1, "username": "test"}
+
+    def test_set_many_single_write(self, scope: _StubScope):
+        user = ContextUser(adapters=[SentryUserAdapter()])
+        user.set_many(
+            {
+                "id": 1,
+                "username": "test",
+                "email": "test@example.com",
+                "ip_address": "100.200.30.40",
+            }
+        )
+
+        assert scope.user_writes == 1
+        assert scope._user == {
+            "id": 1,
+            "username": "test",
+            "email": "test@example.com",
+            "ip_address": "100.200.30.40",
+        }
+
+    def test_scope_user_not_mutated(self, scope: _StubScope):
+        previous = {"id": 1}
+        scope._user = previous
+
+        ContextUser(adapters=[SentryUserAdapter()]).set_many({"username": "test"})
+
+        assert previous == {"id": 1}
+        assert scope._user == {"id": 1, "username": "test"}
+
 
 class TestContextUserFactory:
     def test_user_factory_create(self):
@@ -143,3 +234,11 @@ class TestContextUserBind:
 
         b.unbind()
         assert get_current_ctx_user_or_none() is None
+
+    def test_on_unbind(self):
+        calls = []
+
+        with ctx_user_bind(ContextUser(), on_unbind=lambda: calls.append(1)):
+            assert calls == []
+
+        assert calls == [1]